@@ -1,7 +1,41 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
-from .models import UserProfile, UserRole, Bouquet
+from .catalog import get_catalog
+from .models import ProfileDecision, UserProfile, UserRole, Bouquet
+
+class CatalogFilter(admin.SimpleListFilter):
+    """List filter whose choices come from the cached catalog"""
+    field_path = None
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{f'{self.field_path}__id': self.value()})
+        return queryset
+
+class RoleFilter(CatalogFilter):
+    title = 'role'
+    parameter_name = 'role'
+    field_path = 'role'
+
+    def lookups(self, request, model_admin):
+        return [(role.pk, role.name) for role in get_catalog().roles]
+
+class BouquetFilter(CatalogFilter):
+    title = 'bouquet'
+    parameter_name = 'bouquet'
+    field_path = 'bouquet'
+
+    def lookups(self, request, model_admin):
+        return [(bouquet.pk, bouquet.display_name) for bouquet in get_catalog().bouquets]
+
+class UserRoleFilter(RoleFilter):
+    parameter_name = 'userprofile__role'
+    field_path = 'userprofile__role'
+
+class UserBouquetFilter(BouquetFilter):
+    parameter_name = 'userprofile__bouquet'
+    field_path = 'userprofile__bouquet'
 
 @admin.register(Bouquet)
 class BouquetAdmin(admin.ModelAdmin):
@@ -59,8 +93,10 @@ class UserRoleAdmin(admin.ModelAdmin):
 
 class UserProfileInline(admin.StackedInline):
     model = UserProfile
+    fk_name = 'user'
     can_delete = False
     verbose_name_plural = 'Profile'
+    readonly_fields = ('verified_by', 'verified_at')
     fieldsets = (
         ('Personal Information', {
             'fields': ('phone', 'nrc', 'date_of_birth', 'address', 'profile_picture')
@@ -69,21 +105,25 @@ class UserProfileInline(admin.StackedInline):
             'fields': ('role', 'bouquet', 'subscription_active', 'subscription_start_date', 'subscription_end_date')
         }),
         ('Verification', {
-            'fields': ('verification_status', 'is_email_verified')
+            'fields': ('verification_status', 'verified_by', 'verified_at', 'is_email_verified')
         })
     )
 
 class UserAdmin(BaseUserAdmin):
     inlines = (UserProfileInline,)
     list_display = ('username', 'email', 'first_name', 'last_name', 'is_staff', 'get_role', 'get_bouquet', 'get_verification_status')
-    list_filter = ('is_staff', 'is_superuser', 'is_active', 'date_joined', 'userprofile__role', 'userprofile__bouquet', 'userprofile__verification_status')
+    list_filter = ('is_staff', 'is_superuser', 'is_active', 'date_joined', UserRoleFilter, UserBouquetFilter, 'userprofile__verification_status')
+    
+    list_select_related = ('userprofile',)
     
     def get_role(self, obj):
-        return obj.userprofile.role.name if obj.userprofile.role else 'No Role'
+        role = get_catalog().role(pk=obj.userprofile.role_id, active=False)
+        return role.name if role else 'No Role'
     get_role.short_description = 'Role'
     
     def get_bouquet(self, obj):
-        return obj.userprofile.bouquet.display_name if obj.userprofile.bouquet else 'No Bouquet'
+        bouquet = get_catalog().bouquet(pk=obj.userprofile.bouquet_id, active=False)
+        return bouquet.display_name if bouquet else 'No Bouquet'
     get_bouquet.short_description = 'Bouquet'
     
     def get_verification_status(self, obj):
@@ -97,9 +137,9 @@ admin.site.register(User, UserAdmin)
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'role', 'bouquet', 'verification_status', 'is_email_verified', 'subscription_active', 'created_at')
-    list_filter = ('role', 'bouquet', 'verification_status', 'is_email_verified', 'subscription_active', 'created_at')
+    list_filter = (RoleFilter, BouquetFilter, 'verification_status', 'is_email_verified', 'subscription_active', 'created_at')
     search_fields = ('user__username', 'user__email', 'phone', 'nrc')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('verified_by', 'verified_at', 'created_at', 'updated_at')
     fieldsets = (
         ('User Information', {
             'fields': ('user', 'phone', 'nrc', 'date_of_birth', 'address', 'profile_picture')
@@ -108,10 +148,17 @@ class UserProfileAdmin(admin.ModelAdmin):
             'fields': ('role', 'bouquet', 'subscription_active', 'subscription_start_date', 'subscription_end_date')
         }),
         ('Verification', {
-            'fields': ('verification_status', 'is_email_verified')
+            'fields': ('verification_status', 'verified_by', 'verified_at', 'is_email_verified')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         })
     )
+
+@admin.register(ProfileDecision)
+class ProfileDecisionAdmin(admin.ModelAdmin):
+    list_display = ('profile', 'status', 'verifier', 'decided_at')
+    list_filter = ('status', 'decided_at')
+    search_fields = ('profile__user__username', 'verifier__username')
+    list_select_related = ('profile__user', 'verifier')
@@ -0,0 +1,24 @@
+"""
+Authentication backends for BeneSafe
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+class ProfileBackend(ModelBackend):
+    """
+    ModelBackend that loads the user's profile, role and bouquet in the same
+    query as the user. AuthenticationMiddleware memoises request.user, so
+    every permission check in a request reuses these objects instead of
+    following each foreign key lazily.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related(
+                'userprofile__role', 'userprofile__bouquet'
+            ).get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
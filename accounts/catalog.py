@@ -0,0 +1,139 @@
+"""
+In-process cache of the Bouquet and UserRole tables.
+
+Both tables are tiny and rarely edited but read on most pages, so each
+process loads them once and serves lookups from memory. Saving or deleting
+either model bumps CatalogVersion; a process compares its copy against the
+stamp at most every CATALOG_RECHECK_INTERVAL seconds, so edits reach every
+worker within that delay. Bulk QuerySet.update() calls bypass the signals;
+call bump_catalog_version() after them.
+
+Cached instances are shared between requests and must not be modified.
+"""
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+
+from .models import Bouquet, CatalogVersion, UserRole
+
+CATALOG_VERSION_ID = 1
+
+DEFAULT_BOUQUET = 'blue'
+DEFAULT_ROLE_TYPE = 'standard'
+
+_catalog = None
+_checked_at = 0.0
+
+
+def recheck_interval():
+    return getattr(settings, 'CATALOG_RECHECK_INTERVAL', 5)
+
+
+class Catalog:
+    """Snapshot of every Bouquet and UserRole at one catalog version"""
+
+    def __init__(self, version, bouquets, roles):
+        self.version = version
+        self.bouquets = bouquets
+        self.roles = roles
+        self.bouquets_by_id = {bouquet.pk: bouquet for bouquet in bouquets}
+        self.bouquets_by_name = {bouquet.name: bouquet for bouquet in bouquets}
+        self.roles_by_id = {role.pk: role for role in roles}
+        self.roles_by_name = {role.name: role for role in roles}
+
+    @classmethod
+    def load(cls):
+        # Read the stamp first: a concurrent edit then at worst makes the
+        # tables newer than the stamp, and they are loaded again next check
+        version = current_version()
+        return cls(version, list(Bouquet.objects.order_by('price', 'pk')), list(UserRole.objects.all()))
+
+    def active_bouquets(self):
+        return [bouquet for bouquet in self.bouquets if bouquet.is_active]
+
+    def active_roles(self):
+        return [role for role in self.roles if role.is_active]
+
+    def bouquet(self, pk=None, name=None, active=True):
+        """Bouquet by id or name, or None"""
+        bouquet = self.bouquets_by_id.get(pk) if pk is not None else self.bouquets_by_name.get(name)
+        if bouquet is None or (active and not bouquet.is_active):
+            return None
+        return bouquet
+
+    def role(self, pk=None, name=None, active=True):
+        """Role by id or name, or None"""
+        role = self.roles_by_id.get(pk) if pk is not None else self.roles_by_name.get(name)
+        if role is None or (active and not role.is_active):
+            return None
+        return role
+
+    def roles_of_type(self, role_type, sub_role=None):
+        """Active roles of a role_type, optionally narrowed to a sub_role"""
+        return [
+            role for role in self.active_roles()
+            if role.role_type == role_type and (sub_role is None or role.sub_role == sub_role)
+        ]
+
+    def role_of_type(self, role_type, sub_role=None):
+        roles = self.roles_of_type(role_type, sub_role)
+        return roles[0] if roles else None
+
+    def default_bouquet(self):
+        return self.bouquet(name=DEFAULT_BOUQUET)
+
+    def default_role(self):
+        return self.role_of_type(DEFAULT_ROLE_TYPE)
+
+
+def current_version():
+    return CatalogVersion.objects.filter(pk=CATALOG_VERSION_ID).values_list('version', flat=True).first() or 0
+
+
+def get_catalog():
+    """Return this process's catalog, reloading it if the stamp has moved"""
+    global _catalog, _checked_at
+
+    now = time.monotonic()
+    catalog = _catalog
+    if catalog is not None and now - _checked_at < recheck_interval():
+        return catalog
+
+    if catalog is None or catalog.version != current_version():
+        catalog = Catalog.load()
+        _catalog = catalog
+    _checked_at = now
+    return catalog
+
+
+def clear_catalog():
+    """Drop this process's catalog so the next lookup reloads it"""
+    global _catalog
+    _catalog = None
+
+
+def bump_catalog_version():
+    """Invalidate the catalog in every process"""
+    stamp = CatalogVersion.objects.filter(pk=CATALOG_VERSION_ID)
+    if not stamp.update(version=F('version') + 1):
+        try:
+            with transaction.atomic():
+                CatalogVersion.objects.create(pk=CATALOG_VERSION_ID, version=1)
+        except IntegrityError:
+            stamp.update(version=F('version') + 1)
+    clear_catalog()
+    # Readers in this process may reload before the edit commits
+    transaction.on_commit(clear_catalog)
+
+
+def catalog_changed(sender, **kwargs):
+    bump_catalog_version()
+
+
+def connect_signals():
+    for model in (Bouquet, UserRole):
+        post_save.connect(catalog_changed, sender=model, dispatch_uid=f'catalog_save_{model.__name__}')
+        post_delete.connect(catalog_changed, sender=model, dispatch_uid=f'catalog_delete_{model.__name__}')
@@ -1,7 +1,8 @@
 """
 Context processors for BeneSafe accounts app
 """
-from .models import Bouquet
+from .catalog import get_catalog
+from .permissions import get_profile
 
 def user_profile_context(request):
     """
@@ -9,8 +10,8 @@ def user_profile_context(request):
     """
     context = {}
     
-    if request.user.is_authenticated and hasattr(request.user, 'userprofile'):
-        profile = request.user.userprofile
+    profile = get_profile(request.user) if request.user.is_authenticated else None
+    if profile:
         context.update({
             'user_profile': profile,
             'user_role': profile.role,
@@ -42,8 +43,7 @@ def bouquet_options(request):
     context = {}
     
     # Get active bouquets for forms
-    active_bouquets = Bouquet.objects.filter(is_active=True).order_by('price')
-    context['available_bouquets'] = active_bouquets
+    context['available_bouquets'] = get_catalog().active_bouquets()
     
     return context
 
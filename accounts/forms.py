@@ -1,8 +1,18 @@
 from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
+from .catalog import get_catalog
 from .models import UserProfile, Bouquet, UserRole
 
+def bouquet_choices():
+    return [('', 'Select a bouquet')] + [(bouquet.pk, str(bouquet)) for bouquet in get_catalog().active_bouquets()]
+
+def coerce_bouquet(pk):
+    bouquet = get_catalog().bouquet(pk=int(pk))
+    if bouquet is None:
+        raise forms.ValidationError('Select a valid bouquet.')
+    return bouquet
+
 class LoginForm(forms.Form):
     username = forms.CharField(widget=forms.TextInput(attrs={
         'class': 'form-control',
@@ -53,9 +63,9 @@ class RegistrationForm(UserCreationForm):
             'rows': 3
         })
     )
-    bouquet = forms.ModelChoiceField(
-        queryset=Bouquet.objects.filter(is_active=True),
-        empty_label="Select a bouquet",
+    bouquet = forms.TypedChoiceField(
+        choices=bouquet_choices,
+        coerce=coerce_bouquet,
         required=True,
         help_text="Choose your subscription plan",
         widget=forms.Select(attrs={
@@ -93,11 +103,9 @@ class RegistrationForm(UserCreationForm):
         })
         
         # Set default bouquet to Blue if available
-        try:
-            blue_bouquet = Bouquet.objects.get(name='blue', is_active=True)
-            self.fields['bouquet'].initial = blue_bouquet
-        except Bouquet.DoesNotExist:
-            pass
+        blue_bouquet = get_catalog().default_bouquet()
+        if blue_bouquet:
+            self.fields['bouquet'].initial = blue_bouquet.pk
 
     def save(self, commit=True):
         user = super().save(commit=False)
@@ -106,10 +114,7 @@ class RegistrationForm(UserCreationForm):
             user.save()
 
             # Get the standard user role
-            try:
-                standard_role = UserRole.objects.get(role_type='standard', is_active=True)
-            except UserRole.DoesNotExist:
-                standard_role = None
+            standard_role = get_catalog().default_role()
 
             # Update or create profile (to avoid conflicts with signal)
             profile, created = UserProfile.objects.get_or_create(
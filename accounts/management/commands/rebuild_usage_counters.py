@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from accounts.usage import rebuild_counters
+
+class Command(BaseCommand):
+    help = 'Recount the bouquet usage counters from the asset and beneficiary tables'
+
+    def handle(self, *args, **options):
+        count = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} usage counter(s)'))
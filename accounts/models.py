@@ -1,9 +1,11 @@
 from django.db import models
 from django.contrib.auth.models import User, Permission
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.core.exceptions import ValidationError
 
+from .permissions import PERMISSIONS, clear_role_mask, role_mask
+
 class Bouquet(models.Model):
     """Subscription bouquet tiers with specific features and limits"""
     name = models.CharField(max_length=20, unique=True)
@@ -133,6 +135,8 @@ class UserProfile(models.Model):
         ],
         default='pending'
     )
+    verified_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='verified_profiles')
+    verified_at = models.DateTimeField(null=True, blank=True)
     
     # Tracking
     created_at = models.DateTimeField(auto_now_add=True)
@@ -164,8 +168,10 @@ class UserProfile(models.Model):
         if not self.role:
             return False
         
-        # Check if the permission attribute exists on the role
-        return getattr(self.role, permission_name, False)
+        flag = PERMISSIONS.get(permission_name)
+        if flag is None:
+            return getattr(self.role, permission_name, False)
+        return bool(role_mask(self.role) & flag)
 
     def get_asset_limit(self, category=None):
         """Get asset limit based on bouquet"""
@@ -185,21 +191,59 @@ class UserProfile(models.Model):
             return 0
         return self.bouquet.max_dependents
 
+class CatalogVersion(models.Model):
+    """Single-row stamp bumped whenever a Bouquet or UserRole changes"""
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Catalog v{self.version}"
+
+class UsageCounter(models.Model):
+    """Number of active rows a user has in one bouquet quota category"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='usage_counters')
+    category = models.CharField(max_length=30)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'category'], name='unique_usage_counter'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.category}: {self.count}"
+
+class ProfileDecision(models.Model):
+    """Audit record of one approve/reject decision on a user profile"""
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='decisions')
+    verifier = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='profile_decisions')
+    status = models.CharField(max_length=20)
+    decided_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-decided_at']
+
+    def __str__(self):
+        return f"{self.profile.user.username} - {self.status}"
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+def clear_cached_role_mask(sender, instance, **kwargs):
+    clear_role_mask(instance.pk)
+
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
         # Create profile with default role and bouquet
-        try:
-            standard_role = UserRole.objects.get(role_type='standard', is_active=True)
-            blue_bouquet = Bouquet.objects.get(name='blue', is_active=True)
-            UserProfile.objects.create(
-                user=instance,
-                role=standard_role,
-                bouquet=blue_bouquet
-            )
-        except (UserRole.DoesNotExist, Bouquet.DoesNotExist):
-            # Fallback: create profile without role/bouquet if defaults don't exist
-            UserProfile.objects.create(user=instance)
+        # Profile gets the default role and bouquet, if they exist
+        from .catalog import get_catalog
+
+        catalog = get_catalog()
+        UserProfile.objects.create(
+            user=instance,
+            role=catalog.default_role(),
+            bouquet=catalog.default_bouquet()
+        )
     else:
         # For existing users, save the profile if it exists
         if hasattr(instance, 'userprofile'):
@@ -4,12 +4,131 @@ Permission utilities for BeneSafe user roles and bouquets
 from functools import wraps
 from django.shortcuts import redirect
 from django.contrib import messages
-from django.core.exceptions import PermissionDenied
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 
-def require_permission(permission_name):
+# UserRole permission columns, compiled into one bit each
+PERMISSION_FIELDS = (
+    # Admin permissions
+    'can_manage_users',
+    'can_assign_bouquets',
+    'can_view_all_data',
+    'can_manage_payments',
+    'can_manage_verification',
+    'can_export_reports',
+    'can_approve_documents',
+    'can_send_notifications',
+    # Verifier permissions
+    'can_view_pending_verifications',
+    'can_review_approve',
+    'can_download_documents',
+    'can_upload_verification_report',
+    'can_maintain_audit_log',
+    'can_notify_users',
+    # Standard user permissions
+    'can_add_edit_personal_details',
+    'can_add_spouse_dependents',
+    'can_upload_documents',
+    'can_manage_assets',
+    'can_manage_liabilities',
+    'can_manage_businesses',
+    'can_manage_professional_contacts',
+    'can_add_beneficiaries',
+    'can_view_dashboard',
+    'can_receive_verification_updates',
+)
+
+PERMISSIONS = {name: 1 << bit for bit, name in enumerate(PERMISSION_FIELDS)}
+
+CAN_MANAGE_USERS = PERMISSIONS['can_manage_users']
+CAN_ASSIGN_BOUQUETS = PERMISSIONS['can_assign_bouquets']
+CAN_VIEW_ALL_DATA = PERMISSIONS['can_view_all_data']
+CAN_MANAGE_PAYMENTS = PERMISSIONS['can_manage_payments']
+CAN_MANAGE_VERIFICATION = PERMISSIONS['can_manage_verification']
+CAN_EXPORT_REPORTS = PERMISSIONS['can_export_reports']
+CAN_APPROVE_DOCUMENTS = PERMISSIONS['can_approve_documents']
+CAN_SEND_NOTIFICATIONS = PERMISSIONS['can_send_notifications']
+CAN_VIEW_PENDING_VERIFICATIONS = PERMISSIONS['can_view_pending_verifications']
+CAN_REVIEW_APPROVE = PERMISSIONS['can_review_approve']
+CAN_DOWNLOAD_DOCUMENTS = PERMISSIONS['can_download_documents']
+CAN_UPLOAD_VERIFICATION_REPORT = PERMISSIONS['can_upload_verification_report']
+CAN_MAINTAIN_AUDIT_LOG = PERMISSIONS['can_maintain_audit_log']
+CAN_NOTIFY_USERS = PERMISSIONS['can_notify_users']
+CAN_ADD_EDIT_PERSONAL_DETAILS = PERMISSIONS['can_add_edit_personal_details']
+CAN_ADD_SPOUSE_DEPENDENTS = PERMISSIONS['can_add_spouse_dependents']
+CAN_UPLOAD_DOCUMENTS = PERMISSIONS['can_upload_documents']
+CAN_MANAGE_ASSETS = PERMISSIONS['can_manage_assets']
+CAN_MANAGE_LIABILITIES = PERMISSIONS['can_manage_liabilities']
+CAN_MANAGE_BUSINESSES = PERMISSIONS['can_manage_businesses']
+CAN_MANAGE_PROFESSIONAL_CONTACTS = PERMISSIONS['can_manage_professional_contacts']
+CAN_ADD_BENEFICIARIES = PERMISSIONS['can_add_beneficiaries']
+CAN_VIEW_DASHBOARD = PERMISSIONS['can_view_dashboard']
+CAN_RECEIVE_VERIFICATION_UPDATES = PERMISSIONS['can_receive_verification_updates']
+
+# Verification queue access: verifiers review, admins manage
+VERIFICATION_ACCESS = CAN_VIEW_PENDING_VERIFICATIONS | CAN_MANAGE_VERIFICATION
+VERIFICATION_DECISION = CAN_REVIEW_APPROVE | CAN_APPROVE_DOCUMENTS
+
+# Compiled mask per role id, as (role.updated_at, mask). The role is loaded
+# with the user, so a role edited in another process is spotted by its
+# updated_at without a query; saves in this process also clear the entry.
+_role_masks = {}
+
+def compile_role(role):
+    """Return the permission bitmask for a UserRole"""
+    mask = 0
+    for name, bit in PERMISSIONS.items():
+        if getattr(role, name, False):
+            mask |= bit
+    return mask
+
+def role_mask(role):
+    """Return the cached permission bitmask for a UserRole"""
+    if role is None:
+        return 0
+    cached = _role_masks.get(role.pk)
+    if cached is None or cached[0] != role.updated_at:
+        cached = (role.updated_at, compile_role(role))
+        _role_masks[role.pk] = cached
+    return cached[1]
+
+def clear_role_mask(role_id=None):
+    """Drop cached masks for one role, or all roles"""
+    if role_id is None:
+        _role_masks.clear()
+    else:
+        _role_masks.pop(role_id, None)
+
+def get_profile(user):
+    """
+    Return the user's profile, or None if they have none. For request.user the
+    profile, role and bouquet were loaded with the user by ProfileBackend.
+    """
+    try:
+        return user.userprofile
+    except (AttributeError, ObjectDoesNotExist):
+        return None
+
+def get_permission_mask(user):
+    """Return the permission bitmask for a user's role"""
+    profile = get_profile(user) if user.is_authenticated else None
+    if profile is None or profile.role_id is None:
+        return 0
+    return role_mask(profile.role)
+
+def has_perm(user, flag):
+    """
+    Check a user's role for a permission flag. Flags may be OR-ed together,
+    in which case any one of them grants access.
     """
-    Decorator to check if a user has a specific permission
+    return bool(get_permission_mask(user) & flag)
+
+def require_permission(permission):
+    """
+    Decorator to check if a user has a specific permission, given as a
+    permission flag or a UserRole field name
     """
+    flag = PERMISSIONS[permission] if isinstance(permission, str) else permission
+
     def decorator(view_func):
         @wraps(view_func)
         def wrapper(request, *args, **kwargs):
@@ -17,8 +136,9 @@ def require_permission(permission_name):
                 return redirect('accounts:login')
             
             # Check if user has the required permission through their profile
-            if hasattr(request.user, 'userprofile'):
-                if not request.user.userprofile.has_permission(permission_name):
+            profile = get_profile(request.user)
+            if profile:
+                if not has_perm(request.user, flag):
                     messages.error(request, 'You do not have permission to access this page.')
                     raise PermissionDenied("Insufficient permissions")
             else:
@@ -39,8 +159,9 @@ def require_role(role_type):
             if not request.user.is_authenticated:
                 return redirect('accounts:login')
             
-            if hasattr(request.user, 'userprofile'):
-                user_role_type = getattr(request.user.userprofile, f'is_{role_type}', False)
+            profile = get_profile(request.user)
+            if profile:
+                user_role_type = getattr(profile, f'is_{role_type}', False)
                 if not user_role_type:
                     messages.error(request, f'This page is only accessible to {role_type.replace("_", " ").title()} users.')
                     raise PermissionDenied(f"Requires {role_type} role")
@@ -62,12 +183,13 @@ def require_bouquet_feature(feature_name):
             if not request.user.is_authenticated:
                 return redirect('accounts:login')
             
-            if hasattr(request.user, 'userprofile'):
-                if not request.user.userprofile.bouquet:
+            profile = get_profile(request.user)
+            if profile:
+                if not profile.bouquet:
                     messages.error(request, 'No subscription bouquet assigned.')
                     raise PermissionDenied("No bouquet assigned")
                 
-                if not getattr(request.user.userprofile.bouquet, feature_name, False):
+                if not getattr(profile.bouquet, feature_name, False):
                     messages.error(request, f'This feature requires a higher subscription tier.')
                     return redirect('accounts:upgrade_bouquet')
             else:
@@ -83,33 +205,30 @@ def check_bouquet_limit(model_class, user, category=None):
     Check if user has reached their bouquet limit for a specific model
     Returns True if within limit, False if limit reached
     """
-    if not user.userprofile or not user.userprofile.bouquet:
-        return False
-    
-    # Get the current count of items for this user
-    if category:
-        current_count = model_class.objects.filter(user=user, category=category).count()
-        limit = user.userprofile.get_asset_limit(category)
-    else:
-        current_count = model_class.objects.filter(user=user).count()
-        # For beneficiaries, use beneficiary limit
-        if 'beneficiar' in model_class.__name__.lower():
-            limit = user.userprofile.get_beneficiary_limit()
-        elif 'dependent' in model_class.__name__.lower():
-            limit = user.userprofile.get_dependent_limit()
+    from .usage import BENEFICIARY, DEPENDENT, category_limit, get_usage
+
+    if category is None:
+        name = model_class.__name__.lower()
+        if 'beneficiar' in name:
+            category = BENEFICIARY
+        elif 'dependent' in name:
+            category = DEPENDENT
         else:
-            limit = user.userprofile.get_asset_limit()
-    
-    return current_count < limit
+            return False
+
+    limit = category_limit(user, category)
+    # Users without a bouquet are not limited
+    return limit is None or get_usage(user, category) < limit
 
 def get_bouquet_limits(user):
     """
     Get all bouquet limits for a user
     """
-    if not user.userprofile or not user.userprofile.bouquet:
+    profile = get_profile(user)
+    if not profile or not profile.bouquet:
         return {}
     
-    bouquet = user.userprofile.bouquet
+    bouquet = profile.bouquet
     return {
         'assets_per_category': bouquet.max_assets_per_category,
         'beneficiaries': bouquet.max_beneficiaries,
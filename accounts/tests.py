@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from assets.models import Asset
+
+from .models import Bouquet, UserProfile
+from .permissions import check_bouquet_limit
+from .usage import QuotaExceeded, category_limit, quota
+
+
+class BouquetQuotaTests(TestCase):
+    def create_asset(self, user):
+        with quota(user, 'bank_account'):
+            Asset.objects.create(user=user, asset_type='bank_account', name='Savings', value=100)
+
+    def test_user_without_bouquet_is_not_limited(self):
+        user = User.objects.create_user('nobouquet')
+        UserProfile.objects.filter(user=user).update(bouquet=None)
+        user = User.objects.get(pk=user.pk)
+
+        self.assertIsNone(category_limit(user, 'bank_account'))
+        for _ in range(5):
+            self.assertTrue(check_bouquet_limit(Asset, user, 'bank_account'))
+            self.create_asset(user)
+        self.assertEqual(Asset.objects.filter(user=user).count(), 5)
+
+    def test_bouquet_limit_is_enforced(self):
+        bouquet = Bouquet.objects.create(name='single', display_name='Single', max_assets_per_category=1)
+        user = User.objects.create_user('single')
+        UserProfile.objects.filter(user=user).update(bouquet=bouquet)
+        user = User.objects.get(pk=user.pk)
+
+        self.create_asset(user)
+        self.assertFalse(check_bouquet_limit(Asset, user, 'bank_account'))
+        with self.assertRaises(QuotaExceeded):
+            self.create_asset(user)
+        self.assertEqual(Asset.objects.filter(user=user).count(), 1)
@@ -40,4 +40,5 @@ urlpatterns = [
     path('admin/bouquets/', views.admin_bouquet_management, name='admin_bouquet_management'),
     path('admin/verification-queue/', views.admin_verification_queue, name='admin_verification_queue'),
     path('admin/verify-user/<int:user_id>/', views.admin_verify_user, name='admin_verify_user'),
+    path('admin/verify-users/', views.admin_bulk_verify_users, name='admin_bulk_verify_users'),
 ]
@@ -0,0 +1,144 @@
+"""
+Per-user usage counters backing bouquet quotas.
+
+UsageCounter holds the number of active rows a user has in each quota
+category: one per asset type, plus beneficiaries and dependents. Signal
+handlers keep the counters in step with creates, soft deletes (is_active
+switched off), restores and hard deletes using F() expressions, so a quota
+check reads one row instead of counting.
+"""
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.signals import post_delete, post_init, post_save
+
+from .models import UsageCounter
+from .permissions import get_profile
+
+BENEFICIARY = 'beneficiary'
+DEPENDENT = 'dependent'
+
+# Counted models and how to find each row's category
+COUNTED_MODELS = {
+    'assets.Asset': lambda instance: instance.asset_type,
+    'beneficiaries.Beneficiary': lambda instance: BENEFICIARY,
+}
+
+
+class QuotaExceeded(Exception):
+    """Raised when a create would take a user over their bouquet limit"""
+
+
+def category_limit(user, category):
+    """Bouquet limit for a user in a category; None (no limit) without a bouquet"""
+    profile = get_profile(user)
+    if not profile or not profile.bouquet:
+        return None
+    if category == BENEFICIARY:
+        return profile.get_beneficiary_limit()
+    if category == DEPENDENT:
+        return profile.get_dependent_limit()
+    return profile.get_asset_limit(category)
+
+
+def get_usage(user, category):
+    """Number of active rows the user has in a category"""
+    count = UsageCounter.objects.filter(user=user, category=category).values_list('count', flat=True).first()
+    return count or 0
+
+
+def adjust_usage(user_id, category, delta):
+    """Atomically add delta to a user's counter, creating it if needed"""
+    if UsageCounter.objects.filter(user_id=user_id, category=category).update(count=F('count') + delta):
+        return
+    try:
+        with transaction.atomic():
+            UsageCounter.objects.create(user_id=user_id, category=category, count=max(delta, 0))
+    except IntegrityError:
+        UsageCounter.objects.filter(user_id=user_id, category=category).update(count=F('count') + delta)
+
+
+def enforce_quota(user, category):
+    """
+    Raise QuotaExceeded if the user is over their limit in category.
+
+    Call inside the transaction that created the row, after saving it: the
+    counter UPDATE made by the save holds the row lock until commit, so a
+    concurrent submission waits and then sees this row counted.
+    """
+    limit = category_limit(user, category)
+    if limit is not None and get_usage(user, category) > limit:
+        raise QuotaExceeded(category)
+
+
+@contextmanager
+def quota(user, category):
+    """Run a create in a transaction that is rolled back if it exceeds the quota"""
+    with transaction.atomic():
+        yield
+        enforce_quota(user, category)
+
+
+def rebuild_counters():
+    """Recount every counter from the counted tables"""
+    Asset = apps.get_model('assets.Asset')
+    Beneficiary = apps.get_model('beneficiaries.Beneficiary')
+
+    counters = [
+        UsageCounter(user_id=row['user'], category=row['asset_type'], count=row['total'])
+        for row in Asset.objects.filter(is_active=True).values('user', 'asset_type').annotate(total=Count('pk'))
+    ]
+    counters += [
+        UsageCounter(user_id=row['user'], category=BENEFICIARY, count=row['total'])
+        for row in Beneficiary.objects.filter(is_active=True).values('user').annotate(total=Count('pk'))
+    ]
+
+    with transaction.atomic():
+        UsageCounter.objects.all().delete()
+        UsageCounter.objects.bulk_create(counters, batch_size=1000)
+    return len(counters)
+
+
+def _usage_state(sender, instance):
+    # Read from __dict__ so deferred fields are not loaded just to track them
+    values = instance.__dict__
+    if 'user_id' not in values or 'is_active' not in values:
+        return None
+    try:
+        category = COUNTED_MODELS[sender._meta.label](instance)
+    except (KeyError, AttributeError):
+        return None
+    return values['user_id'], category, values['is_active']
+
+
+def remember_usage_state(sender, instance, **kwargs):
+    instance._usage_state = _usage_state(sender, instance) if instance.pk else None
+
+
+def update_usage_on_save(sender, instance, created, **kwargs):
+    old = None if created else getattr(instance, '_usage_state', None)
+    new = _usage_state(sender, instance)
+    instance._usage_state = new
+
+    if old == new:
+        return
+    if old and old[2]:
+        adjust_usage(old[0], old[1], -1)
+    if new and new[2]:
+        adjust_usage(new[0], new[1], 1)
+
+
+def update_usage_on_delete(sender, instance, **kwargs):
+    state = getattr(instance, '_usage_state', None)
+    if state and state[2]:
+        adjust_usage(state[0], state[1], -1)
+
+
+def connect_signals():
+    for label in COUNTED_MODELS:
+        model = apps.get_model(label)
+        post_init.connect(remember_usage_state, sender=model, dispatch_uid=f'usage_init_{label}')
+        post_save.connect(update_usage_on_save, sender=model, dispatch_uid=f'usage_save_{label}')
+        post_delete.connect(update_usage_on_delete, sender=model, dispatch_uid=f'usage_delete_{label}')
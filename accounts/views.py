@@ -13,7 +13,11 @@ from django.http import HttpResponse
 from django.contrib.auth.forms import AuthenticationForm
 from django.core.paginator import Paginator
 from django.db.models import Q
-from .models import UserProfile, UserRole, Bouquet
+from core import audit
+
+from .catalog import get_catalog
+from .decisions import DECISIONS, MAX_SELECTED, decide_profiles, selected_ids
+from .models import UserProfile
 from .forms import RegistrationForm, ProfileForm, AdminUserForm, LoginForm
 from .permissions import require_permission, require_role
 
@@ -176,8 +180,9 @@ def admin_user_list(request):
     page_obj = paginator.get_page(page_number)
     
     # Get filter options
-    roles = UserRole.objects.filter(is_active=True)
-    bouquets = Bouquet.objects.filter(is_active=True)
+    catalog = get_catalog()
+    roles = catalog.active_roles()
+    bouquets = catalog.active_bouquets()
     
     context = {
         'page_obj': page_obj,
@@ -201,6 +206,7 @@ def admin_user_edit(request, user_id):
         form = AdminUserForm(request.POST, instance=profile)
         if form.is_valid():
             form.save()
+            audit.record('user.updated', user, changed=form.changed_data)
             messages.success(request, f'User {user.username} updated successfully!')
             return redirect('accounts:admin_user_list')
     else:
@@ -225,6 +231,7 @@ def admin_user_toggle_status(request, user_id):
         user.save()
         
         status = 'activated' if user.is_active else 'deactivated'
+        audit.record(f'user.{status}', user)
         messages.success(request, f'User {user.username} has been {status}!')
     
     return redirect('accounts:admin_user_list')
@@ -233,7 +240,7 @@ def admin_user_toggle_status(request, user_id):
 @require_permission('can_assign_bouquets')
 def admin_bouquet_management(request):
     """Admin view to manage bouquets"""
-    bouquets = Bouquet.objects.filter(is_active=True)
+    bouquets = get_catalog().active_bouquets()
     
     context = {
         'bouquets': bouquets,
@@ -263,15 +270,30 @@ def admin_verify_user(request, user_id):
     profile = get_object_or_404(UserProfile, user=user)
     
     if request.method == 'POST':
-        action = request.POST.get('action')
-        
-        if action == 'approve':
-            profile.verification_status = 'approved'
-            profile.save()
-            messages.success(request, f'User {user.username} has been approved!')
-        elif action == 'reject':
-            profile.verification_status = 'rejected'
-            profile.save()
-            messages.success(request, f'User {user.username} has been rejected!')
+        status = DECISIONS.get(request.POST.get('action'))
+        if status:
+            if decide_profiles(request.user, [profile.pk], status):
+                messages.success(request, f'User {user.username} has been {status}!')
+            else:
+                messages.warning(request, f'User {user.username} was already {status}.')
+    
+    return redirect('accounts:admin_verification_queue')
+
+@login_required
+@require_permission('can_approve_documents')
+def admin_bulk_verify_users(request):
+    """Admin view to approve/reject the selected users in one step"""
+    if request.method == 'POST':
+        status = DECISIONS.get(request.POST.get('action'))
+        profile_ids = selected_ids(request.POST, 'profiles')
+        if len(profile_ids) > MAX_SELECTED:
+            messages.error(request, f'Select at most {MAX_SELECTED} users at a time.')
+        elif status and profile_ids:
+            changed = decide_profiles(request.user, profile_ids, status)
+            messages.success(request, f'{changed} user(s) {status}.')
+            if changed < len(profile_ids):
+                messages.warning(request, f'{len(profile_ids) - changed} user(s) were skipped: already {status}.')
+        else:
+            messages.error(request, 'Select at least one user and an action.')
     
     return redirect('accounts:admin_verification_queue')
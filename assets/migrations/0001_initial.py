@@ -0,0 +1,160 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:22
+
+import core.storage
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Asset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset_type', models.CharField(choices=[('bank_account', 'Bank Account'), ('insurance', 'Insurance & Social Security'), ('village_banking', 'Village Banking Group'), ('house_land', 'House/Land'), ('motor_vehicle', 'Motor Vehicle'), ('project', 'Project'), ('general_asset', 'General Asset'), ('treasury_bond', 'Treasury Bond'), ('ip_rights', 'IP Rights')], max_length=20)),
+                ('name', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('value', models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AssetDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('file', models.FileField(storage=core.storage.get_blob_storage, upload_to='asset_documents/')),
+                ('upload_date', models.DateTimeField(auto_now_add=True)),
+                ('file_type', models.CharField(blank=True, max_length=10)),
+                ('file_size', models.IntegerField(blank=True)),
+                ('asset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='documents', to='assets.asset')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BankAccount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bank_name', models.CharField(max_length=100)),
+                ('branch_name', models.CharField(max_length=100)),
+                ('account_name', models.CharField(max_length=100)),
+                ('account_number', models.CharField(max_length=50)),
+                ('account_type', models.CharField(blank=True, max_length=50)),
+                ('asset', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='assets.asset')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GeneralAsset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('serial_number', models.CharField(blank=True, max_length=100)),
+                ('manufacturer', models.CharField(blank=True, max_length=100)),
+                ('model_number', models.CharField(blank=True, max_length=100)),
+                ('purchase_date', models.DateField(blank=True, null=True)),
+                ('warranty_expiry', models.DateField(blank=True, null=True)),
+                ('asset', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='assets.asset')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='HouseLand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('physical_address', models.TextField()),
+                ('plot_number', models.CharField(blank=True, max_length=50)),
+                ('gps_coordinates', models.CharField(blank=True, max_length=100)),
+                ('size', models.CharField(blank=True, max_length=50)),
+                ('title_deed_number', models.CharField(blank=True, max_length=50)),
+                ('asset', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='assets.asset')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Insurance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('policy_number', models.CharField(max_length=100)),
+                ('provider_name', models.CharField(max_length=100)),
+                ('coverage_type', models.CharField(max_length=100)),
+                ('premium_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('maturity_date', models.DateField(blank=True, null=True)),
+                ('asset', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='assets.asset')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='IPRights',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('registration_number', models.CharField(max_length=50)),
+                ('registration_date', models.DateField()),
+                ('expiry_date', models.DateField(blank=True, null=True)),
+                ('rights_type', models.CharField(choices=[('patent', 'Patent'), ('trademark', 'Trademark'), ('copyright', 'Copyright'), ('design', 'Design')], max_length=50)),
+                ('asset', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='assets.asset')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MotorVehicle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('make', models.CharField(max_length=50)),
+                ('model', models.CharField(max_length=50)),
+                ('year', models.IntegerField()),
+                ('registration_number', models.CharField(max_length=20)),
+                ('chassis_number', models.CharField(max_length=50)),
+                ('engine_number', models.CharField(blank=True, max_length=50)),
+                ('color', models.CharField(max_length=30)),
+                ('asset', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='assets.asset')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Project',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contact_person', models.CharField(max_length=100)),
+                ('contact_phone', models.CharField(max_length=20)),
+                ('contact_email', models.EmailField(max_length=254)),
+                ('progress_status', models.CharField(choices=[('planning', 'Planning'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('on_hold', 'On Hold')], default='planning', max_length=50)),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('asset', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='assets.asset')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TreasuryBond',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('issuer', models.CharField(max_length=100)),
+                ('bond_number', models.CharField(max_length=50)),
+                ('issue_date', models.DateField()),
+                ('maturity_date', models.DateField()),
+                ('interest_rate', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('face_value', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('asset', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='assets.asset')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='VillageBankingGroup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chilimba_name', models.CharField(max_length=100)),
+                ('chairperson_name', models.CharField(max_length=100)),
+                ('chairperson_phone', models.CharField(max_length=20)),
+                ('treasurer_name', models.CharField(max_length=100)),
+                ('treasurer_phone', models.CharField(max_length=20)),
+                ('meeting_frequency', models.CharField(blank=True, max_length=50)),
+                ('asset', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='assets.asset')),
+            ],
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 from accounts.models import UserProfile
+from core.renditions import can_render
+from core.storage import get_blob_storage
 
 class Asset(models.Model):
     """Base asset model"""
@@ -27,10 +29,27 @@ class Asset(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Partial on is_active: deleted assets are never listed
+            models.Index(fields=['user', '-created_at', '-id'], name='asset_user_idx', condition=models.Q(is_active=True)),
+            models.Index(fields=['user', 'asset_type', '-created_at', '-id'], name='asset_user_type_idx', condition=models.Q(is_active=True)),
+            models.Index(fields=['-created_at'], name='asset_recent_idx', condition=models.Q(is_active=True)),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.name}"
 
+    @property
+    def detail(self):
+        """This asset's row in its type's detail table, or None"""
+        model = ASSET_DETAIL_MODELS.get(self.asset_type)
+        if model is None:
+            return None
+        try:
+            return getattr(self, detail_accessor(model))
+        except model.DoesNotExist:
+            return None
+
 class BankAccount(models.Model):
     asset = models.OneToOneField(Asset, on_delete=models.CASCADE)
     bank_name = models.CharField(max_length=100)
@@ -39,6 +58,9 @@ class BankAccount(models.Model):
     account_number = models.CharField(max_length=50)
     account_type = models.CharField(max_length=50, blank=True)
 
+    def __str__(self):
+        return f"{self.bank_name} {self.account_number}"
+
 class Insurance(models.Model):
     asset = models.OneToOneField(Asset, on_delete=models.CASCADE)
     policy_number = models.CharField(max_length=100)
@@ -47,6 +69,9 @@ class Insurance(models.Model):
     premium_amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     maturity_date = models.DateField(null=True, blank=True)
 
+    def __str__(self):
+        return f"{self.provider_name} {self.policy_number}"
+
 class VillageBankingGroup(models.Model):
     asset = models.OneToOneField(Asset, on_delete=models.CASCADE)
     chilimba_name = models.CharField(max_length=100)
@@ -56,6 +81,9 @@ class VillageBankingGroup(models.Model):
     treasurer_phone = models.CharField(max_length=20)
     meeting_frequency = models.CharField(max_length=50, blank=True)
 
+    def __str__(self):
+        return self.chilimba_name
+
 class HouseLand(models.Model):
     asset = models.OneToOneField(Asset, on_delete=models.CASCADE)
     physical_address = models.TextField()
@@ -64,6 +92,9 @@ class HouseLand(models.Model):
     size = models.CharField(max_length=50, blank=True)  # e.g., "1 hectare", "500 sqm"
     title_deed_number = models.CharField(max_length=50, blank=True)
 
+    def __str__(self):
+        return self.plot_number or self.physical_address
+
 class MotorVehicle(models.Model):
     asset = models.OneToOneField(Asset, on_delete=models.CASCADE)
     make = models.CharField(max_length=50)
@@ -74,6 +105,9 @@ class MotorVehicle(models.Model):
     engine_number = models.CharField(max_length=50, blank=True)
     color = models.CharField(max_length=30)
 
+    def __str__(self):
+        return f"{self.year} {self.make} {self.model} ({self.registration_number})"
+
 class Project(models.Model):
     asset = models.OneToOneField(Asset, on_delete=models.CASCADE)
     contact_person = models.CharField(max_length=100)
@@ -88,6 +122,9 @@ class Project(models.Model):
     start_date = models.DateField(null=True, blank=True)
     end_date = models.DateField(null=True, blank=True)
 
+    def __str__(self):
+        return f"{self.get_progress_status_display()} - {self.contact_person}"
+
 class GeneralAsset(models.Model):
     asset = models.OneToOneField(Asset, on_delete=models.CASCADE)
     serial_number = models.CharField(max_length=100, blank=True)
@@ -96,6 +133,9 @@ class GeneralAsset(models.Model):
     purchase_date = models.DateField(null=True, blank=True)
     warranty_expiry = models.DateField(null=True, blank=True)
 
+    def __str__(self):
+        return " ".join(filter(None, [self.manufacturer, self.model_number, self.serial_number]))
+
 class TreasuryBond(models.Model):
     asset = models.OneToOneField(Asset, on_delete=models.CASCADE)
     issuer = models.CharField(max_length=100)
@@ -105,6 +145,9 @@ class TreasuryBond(models.Model):
     interest_rate = models.DecimalField(max_digits=5, decimal_places=2)
     face_value = models.DecimalField(max_digits=15, decimal_places=2)
 
+    def __str__(self):
+        return f"{self.issuer} {self.bond_number}"
+
 class IPRights(models.Model):
     asset = models.OneToOneField(Asset, on_delete=models.CASCADE)
     registration_number = models.CharField(max_length=50)
@@ -117,11 +160,35 @@ class IPRights(models.Model):
         ('design', 'Design'),
     ])
 
+    def __str__(self):
+        return f"{self.get_rights_type_display()} {self.registration_number}"
+
 class AssetDocument(models.Model):
     asset = models.ForeignKey(Asset, on_delete=models.CASCADE, related_name='documents')
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
-    file = models.FileField(upload_to='asset_documents/')
+    file = models.FileField(upload_to='asset_documents/', storage=get_blob_storage)
     upload_date = models.DateTimeField(auto_now_add=True)
     file_type = models.CharField(max_length=10, blank=True)  # pdf, doc, jpg, etc.
     file_size = models.IntegerField(blank=True)  # in bytes
+
+    @property
+    def has_preview(self):
+        return can_render(self.file.name)
+
+# Asset type -> its one-to-one detail table
+ASSET_DETAIL_MODELS = {
+    'bank_account': BankAccount,
+    'insurance': Insurance,
+    'village_banking': VillageBankingGroup,
+    'house_land': HouseLand,
+    'motor_vehicle': MotorVehicle,
+    'project': Project,
+    'general_asset': GeneralAsset,
+    'treasury_bond': TreasuryBond,
+    'ip_rights': IPRights,
+}
+
+def detail_accessor(model):
+    """Name of the Asset attribute that reaches a detail model, e.g. bankaccount"""
+    return model._meta.get_field('asset').remote_field.get_accessor_name()
@@ -0,0 +1,147 @@
+"""
+Registry of asset types.
+
+Each Asset.ASSET_TYPES entry maps to an AssetType naming its detail model,
+its form and how it appears in URLs and lists. The generic views in
+assets.views serve list, detail, create, update and delete for every type
+from this table, and save_asset() writes an asset and its detail row in one
+transaction, so a failure part-way never leaves an Asset without its detail.
+"""
+from django.db import transaction
+from django.urls import reverse
+
+from accounts.usage import quota
+from core.signals import deferred_sync, sync_asset
+
+from .forms import (
+    BankAccountForm, InsuranceForm, VillageBankingForm,
+    HouseLandForm, MotorVehicleForm, ProjectForm,
+    GeneralAssetForm, TreasuryBondForm, IPRightsForm,
+)
+from .models import ASSET_DETAIL_MODELS, Asset, detail_accessor
+
+# Asset fields the type forms edit
+ASSET_FIELDS = ['name', 'description', 'value']
+
+
+class AssetType:
+    """How one asset type is stored, edited and listed"""
+
+    def __init__(self, key, slug, form_class, icon, list_fields):
+        self.key = key
+        self.slug = slug
+        self.model = ASSET_DETAIL_MODELS[key]
+        self.form_class = form_class
+        self.icon = icon
+        self.list_fields = list_fields
+
+    def __str__(self):
+        return self.label
+
+    @property
+    def label(self):
+        return dict(Asset.ASSET_TYPES)[self.key]
+
+    @property
+    def accessor(self):
+        """Asset attribute holding the detail row, e.g. bankaccount"""
+        return detail_accessor(self.model)
+
+    @property
+    def detail_fields(self):
+        return [field.name for field in self.model._meta.concrete_fields if field.name not in ('id', 'asset')]
+
+    @property
+    def list_url(self):
+        return reverse(f'assets:{self.key}_list')
+
+    @property
+    def create_url(self):
+        return reverse(f'assets:{self.key}_create')
+
+    def list_columns(self):
+        """(field name, label) pairs shown in the type's list"""
+        return [(name, self.model._meta.get_field(name).verbose_name.title()) for name in self.list_fields]
+
+    def initial(self, detail):
+        """Form initial data from an existing detail row"""
+        if detail is None:
+            return {}
+        return {name: getattr(detail, name) for name in self.detail_fields}
+
+
+ASSET_TYPES = [
+    AssetType('bank_account', 'bank-accounts', BankAccountForm, 'fa-university',
+              ['bank_name', 'account_number', 'account_type']),
+    AssetType('insurance', 'insurance', InsuranceForm, 'fa-shield-alt',
+              ['policy_number', 'provider_name', 'maturity_date']),
+    AssetType('village_banking', 'village-banking', VillageBankingForm, 'fa-users',
+              ['chilimba_name', 'chairperson_name', 'meeting_frequency']),
+    AssetType('house_land', 'properties', HouseLandForm, 'fa-home',
+              ['physical_address', 'plot_number', 'title_deed_number']),
+    AssetType('motor_vehicle', 'vehicles', MotorVehicleForm, 'fa-car',
+              ['make', 'model', 'registration_number']),
+    AssetType('project', 'projects', ProjectForm, 'fa-project-diagram',
+              ['contact_person', 'progress_status', 'end_date']),
+    AssetType('general_asset', 'general', GeneralAssetForm, 'fa-box',
+              ['manufacturer', 'model_number', 'serial_number']),
+    AssetType('treasury_bond', 'treasury-bonds', TreasuryBondForm, 'fa-landmark',
+              ['issuer', 'bond_number', 'maturity_date']),
+    AssetType('ip_rights', 'ip-rights', IPRightsForm, 'fa-lightbulb',
+              ['rights_type', 'registration_number', 'expiry_date']),
+]
+
+REGISTRY = {asset_type.key: asset_type for asset_type in ASSET_TYPES}
+
+
+def get_type(key):
+    return REGISTRY.get(key)
+
+
+def with_details(queryset):
+    """Assets with every type's detail row joined in the same query"""
+    return queryset.select_related(*(asset_type.accessor for asset_type in ASSET_TYPES))
+
+
+def save_asset(asset_type, form, user=None, asset=None):
+    """
+    Create (user given) or update (asset given) an asset and its detail row
+    from a valid type form in one transaction. Updates write only the
+    fields the form changed. The export revision and search entry are
+    updated once, when the transaction commits, rather than on each save.
+    Raises QuotaExceeded if a create goes over the user's bouquet limit.
+    """
+    data = form.cleaned_data
+    changed = set(form.changed_data)
+
+    if asset is None:
+        asset = form.save(commit=False)
+        asset.user = user
+        asset.asset_type = asset_type.key
+        with quota(user, asset_type.key), deferred_sync():
+            asset.save()
+            # Also caches the detail row on the asset for indexing
+            asset_type.model.objects.create(asset=asset, **{name: data[name] for name in asset_type.detail_fields})
+            transaction.on_commit(lambda: sync_asset(asset))
+        return asset
+
+    asset_fields = [name for name in ASSET_FIELDS if name in changed]
+    detail = asset.detail
+    detail_fields = [name for name in asset_type.detail_fields if name in changed]
+
+    if detail is not None and not (asset_fields or detail_fields):
+        return asset
+
+    with transaction.atomic(), deferred_sync():
+        if asset_fields or detail_fields:
+            # The form has already copied its Asset fields onto the instance
+            asset.save(update_fields=asset_fields + ['updated_at'])
+        if detail is None:
+            # Assets created before the detail row was written atomically
+            asset_type.model.objects.create(asset=asset, **{name: data[name] for name in asset_type.detail_fields})
+        elif detail_fields:
+            for name in detail_fields:
+                setattr(detail, name, data[name])
+            detail.save(update_fields=detail_fields)
+        transaction.on_commit(lambda: sync_asset(asset))
+    return asset
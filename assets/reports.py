@@ -0,0 +1,145 @@
+"""
+Report renderers for the assets app
+"""
+from core.exports import build_pdf_report, build_xlsx_report, export_rows, format_date, to_date
+
+from .models import (
+    Asset, BankAccount, Insurance, VillageBankingGroup,
+    HouseLand, MotorVehicle, Project, GeneralAsset,
+    TreasuryBond, IPRights
+)
+
+# Columns shared by every asset sheet
+ASSET_COLUMNS = [
+    ('Name', 'name'),
+    ('Description', 'description'),
+    ('Value', 'value'),
+    ('Created Date', 'created_at'),
+]
+
+# One workbook sheet per asset subtype: (title, detail model, detail columns)
+ASSET_DETAIL_SHEETS = [
+    ('Bank Accounts', BankAccount, [
+        ('Bank', 'bank_name'),
+        ('Branch', 'branch_name'),
+        ('Account Name', 'account_name'),
+        ('Account Number', 'account_number'),
+        ('Account Type', 'account_type'),
+    ]),
+    ('Insurance', Insurance, [
+        ('Policy Number', 'policy_number'),
+        ('Provider', 'provider_name'),
+        ('Coverage Type', 'coverage_type'),
+        ('Premium Amount', 'premium_amount'),
+        ('Maturity Date', 'maturity_date'),
+    ]),
+    ('Village Banking', VillageBankingGroup, [
+        ('Chilimba Name', 'chilimba_name'),
+        ('Chairperson', 'chairperson_name'),
+        ('Chairperson Phone', 'chairperson_phone'),
+        ('Treasurer', 'treasurer_name'),
+        ('Treasurer Phone', 'treasurer_phone'),
+        ('Meeting Frequency', 'meeting_frequency'),
+    ]),
+    ('Houses & Land', HouseLand, [
+        ('Physical Address', 'physical_address'),
+        ('Plot Number', 'plot_number'),
+        ('GPS Coordinates', 'gps_coordinates'),
+        ('Size', 'size'),
+        ('Title Deed Number', 'title_deed_number'),
+    ]),
+    ('Motor Vehicles', MotorVehicle, [
+        ('Make', 'make'),
+        ('Model', 'model'),
+        ('Year', 'year'),
+        ('Registration Number', 'registration_number'),
+        ('Chassis Number', 'chassis_number'),
+        ('Engine Number', 'engine_number'),
+        ('Color', 'color'),
+    ]),
+    ('Projects', Project, [
+        ('Contact Person', 'contact_person'),
+        ('Contact Phone', 'contact_phone'),
+        ('Contact Email', 'contact_email'),
+        ('Progress Status', 'progress_status'),
+        ('Start Date', 'start_date'),
+        ('End Date', 'end_date'),
+    ]),
+    ('General Assets', GeneralAsset, [
+        ('Serial Number', 'serial_number'),
+        ('Manufacturer', 'manufacturer'),
+        ('Model Number', 'model_number'),
+        ('Purchase Date', 'purchase_date'),
+        ('Warranty Expiry', 'warranty_expiry'),
+    ]),
+    ('Treasury Bonds', TreasuryBond, [
+        ('Issuer', 'issuer'),
+        ('Bond Number', 'bond_number'),
+        ('Issue Date', 'issue_date'),
+        ('Maturity Date', 'maturity_date'),
+        ('Interest Rate', 'interest_rate'),
+        ('Face Value', 'face_value'),
+    ]),
+    ('IP Rights', IPRights, [
+        ('Registration Number', 'registration_number'),
+        ('Registration Date', 'registration_date'),
+        ('Expiry Date', 'expiry_date'),
+        ('Rights Type', 'rights_type'),
+    ]),
+]
+
+
+def render_assets_pdf(user, stream):
+    """Render the asset report for a user as PDF"""
+    assets = Asset.objects.filter(user=user, is_active=True)
+    type_labels = dict(Asset.ASSET_TYPES)
+
+    rows = (
+        [name, type_labels.get(asset_type, asset_type), f"${value or 0:.2f}", format_date(created_at)]
+        for name, asset_type, value, created_at in export_rows(
+            assets, ['name', 'asset_type', 'value', 'created_at']
+        )
+    )
+
+    build_pdf_report(
+        stream,
+        "BeneSafe - Asset Report",
+        user,
+        ['Asset Name', 'Type', 'Value', 'Created Date'],
+        rows,
+        "No assets found.",
+    )
+
+
+def _summary_sheet(user):
+    assets = Asset.objects.filter(user=user, is_active=True)
+    type_labels = dict(Asset.ASSET_TYPES)
+
+    rows = (
+        [name, type_labels.get(asset_type, asset_type), description, value, to_date(created_at)]
+        for name, asset_type, description, value, created_at in export_rows(
+            assets, ['name', 'asset_type', 'description', 'value', 'created_at']
+        )
+    )
+    return 'All Assets', ['Name', 'Type', 'Description', 'Value', 'Created Date'], rows
+
+
+def _detail_sheet(user, title, model, columns):
+    details = model.objects.filter(
+        asset__user=user, asset__is_active=True
+    ).order_by('-asset__created_at')
+
+    fields = [f'asset__{field}' for _, field in ASSET_COLUMNS] + [field for _, field in columns]
+    header = [label for label, _ in ASSET_COLUMNS] + [label for label, _ in columns]
+    rows = ([to_date(value) for value in row] for row in export_rows(details, fields))
+    return title, header, rows
+
+
+def render_assets_xlsx(user, stream):
+    """Render the asset workbook for a user, one sheet per asset type"""
+    sheets = [_summary_sheet(user)]
+    sheets.extend(
+        _detail_sheet(user, title, model, columns)
+        for title, model, columns in ASSET_DETAIL_SHEETS
+    )
+    build_xlsx_report(stream, sheets)
@@ -1,43 +1,37 @@
 from django.urls import path
 from . import views
+from .registry import ASSET_TYPES
 
 app_name = 'assets'
 
 urlpatterns = [
     path('', views.asset_list, name='asset_list'),
-    
-    # Bank Account URLs
-    path('bank-accounts/', views.bank_account_list, name='bank_account_list'),
-    path('bank-accounts/add/', views.bank_account_create, name='bank_account_create'),
-    path('bank-accounts/<int:pk>/', views.bank_account_detail, name='bank_account_detail'),
-    path('bank-accounts/<int:pk>/edit/', views.bank_account_update, name='bank_account_update'),
-    path('bank-accounts/<int:pk>/delete/', views.bank_account_delete, name='bank_account_delete'),
-
-    # Insurance URLs
-    path('insurance/', views.insurance_list, name='insurance_list'),
-    path('insurance/add/', views.insurance_create, name='insurance_create'),
-    path('insurance/<int:pk>/', views.insurance_detail, name='insurance_detail'),
-    path('insurance/<int:pk>/edit/', views.insurance_update, name='insurance_update'),
-    path('insurance/<int:pk>/delete/', views.insurance_delete, name='insurance_delete'),
-
-    # Motor Vehicle URLs
-    path('vehicles/', views.motor_vehicle_list, name='motor_vehicle_list'),
-    path('vehicles/add/', views.motor_vehicle_create, name='motor_vehicle_create'),
-
-    # House and Land URLs
-    path('properties/', views.house_land_list, name='house_land_list'),
-    path('properties/add/', views.house_land_create, name='house_land_create'),
-
-    # Project URLs
-    path('projects/', views.project_list, name='project_list'),
-    path('projects/add/', views.project_create, name='project_create'),
+    path('add/', views.asset_create, name='asset_create'),
+    path('<int:pk>/', views.asset_detail, name='asset_detail'),
+    path('<int:pk>/edit/', views.asset_update, name='asset_update'),
+    path('<int:pk>/delete/', views.asset_delete, name='asset_delete'),
 
     # Document URLs
     path('<int:pk>/documents/', views.asset_documents, name='asset_documents'),
     path('<int:pk>/documents/add/', views.asset_document_upload, name='asset_document_upload'),
+    path('documents/<int:pk>/download/', views.asset_document_download, name='asset_document_download'),
+    path('documents/<int:pk>/preview/<str:kind>/', views.asset_document_preview, name='asset_document_preview'),
     path('documents/<int:pk>/delete/', views.asset_document_delete, name='asset_document_delete'),
 
     # Export URLs
     path('export/pdf/', views.export_assets_pdf, name='export_assets_pdf'),
     path('export/csv/', views.export_assets_csv, name='export_assets_csv'),
+    path('export/xlsx/', views.export_assets_xlsx, name='export_assets_xlsx'),
 ]
+
+# List, add, view, edit and delete URLs for each asset type, e.g.
+# bank-accounts/ (bank_account_list) and bank-accounts/<pk>/edit/ (bank_account_update)
+for asset_type in ASSET_TYPES:
+    kwargs = {'asset_type': asset_type.key}
+    urlpatterns += [
+        path(f'{asset_type.slug}/', views.asset_type_list, kwargs, name=f'{asset_type.key}_list'),
+        path(f'{asset_type.slug}/add/', views.asset_create, kwargs, name=f'{asset_type.key}_create'),
+        path(f'{asset_type.slug}/<int:pk>/', views.asset_detail, kwargs, name=f'{asset_type.key}_detail'),
+        path(f'{asset_type.slug}/<int:pk>/edit/', views.asset_update, kwargs, name=f'{asset_type.key}_update'),
+        path(f'{asset_type.slug}/<int:pk>/delete/', views.asset_delete, kwargs, name=f'{asset_type.key}_delete'),
+    ]
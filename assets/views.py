@@ -1,29 +1,26 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponse, JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.template.loader import render_to_string
-from django.db.models import Q
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
-import csv
+from django.urls import reverse
 import json
-import io
-
-from .models import (
-    Asset, BankAccount, Insurance, VillageBankingGroup,
-    HouseLand, MotorVehicle, Project, GeneralAsset,
-    TreasuryBond, IPRights, AssetDocument
-)
-from .forms import (
-    BankAccountForm, InsuranceForm, VillageBankingForm,
-    HouseLandForm, MotorVehicleForm, ProjectForm,
-    GeneralAssetForm, TreasuryBondForm, IPRightsForm,
-    AssetDocumentForm
-)
+from urllib.parse import urlencode
+
+from accounts.permissions import CAN_DOWNLOAD_DOCUMENTS, CAN_VIEW_ALL_DATA, check_bouquet_limit, has_perm
+from accounts.usage import QuotaExceeded
+from core import audit, uploads
+from core.downloads import download_name, serve_file
+from core.exports import csv_response, export_rows, format_date
+from core.jobs import queue_export
+from core.pagination import keyset_page
+from core.search import rank
+from core.renditions import serve_rendition
+
+from . import registry
+from .models import Asset, AssetDocument
+from .forms import AssetDocumentForm
+from .loaders import load_details
 
 @login_required
 def asset_list(request):
@@ -35,171 +32,151 @@ def asset_list(request):
     if asset_type:
         assets = assets.filter(asset_type=asset_type)
 
-    # Search functionality
+    # Search results come ranked from the full-text index, best match first
     search = request.GET.get('search')
     if search:
-        assets = assets.filter(
-            Q(name__icontains=search) |
-            Q(description__icontains=search)
-        )
+        page = None
+        results = rank(assets, request.user, search)
+    else:
+        page = keyset_page(assets, request.GET, per_page=24)
+        results = page
 
+    filters = {key: value for key, value in (('type', asset_type), ('search', search)) if value}
     context = {
-        'assets': assets,
+        'assets': load_details(results),
+        'page': page,
+        'query': urlencode(filters),
         'asset_types': Asset.ASSET_TYPES,
         'current_type': asset_type,
         'search': search,
     }
     return render(request, 'assets/asset_list.html', context)
 
-@login_required
-def bank_account_list(request):
-    """List all bank accounts"""
-    assets = Asset.objects.filter(user=request.user, asset_type='bank_account', is_active=True)
-    return render(request, 'assets/bank_account_list.html', {'assets': assets})
+def quota_reached(request, asset_type):
+    """Tell the user and return True if their bouquet allows no more assets of this type"""
+    if check_bouquet_limit(Asset, request.user, asset_type):
+        return False
+    label = dict(Asset.ASSET_TYPES).get(asset_type, asset_type)
+    messages.error(request, f'Your bouquet limit for {label} assets has been reached. Upgrade your bouquet to add more.')
+    return True
+
+def get_asset_type(key):
+    """Registry entry for an asset type, or 404"""
+    asset_type = registry.get_type(key)
+    if asset_type is None:
+        raise Http404("Asset type not found")
+    return asset_type
+
+def get_user_asset(request, pk, asset_type=None):
+    """The user's active asset with its detail row read in the same query"""
+    assets = Asset.objects.filter(user=request.user, is_active=True)
+    if asset_type is not None:
+        assets = assets.filter(asset_type=asset_type.key).select_related(asset_type.accessor)
+    else:
+        assets = registry.with_details(assets)
+    return get_object_or_404(assets, pk=pk)
 
 @login_required
-def bank_account_create(request):
-    """Create a new bank account"""
-    if request.method == 'POST':
-        form = BankAccountForm(request.POST)
-        if form.is_valid():
-            asset = form.save(commit=False)
-            asset.user = request.user
-            asset.asset_type = 'bank_account'
-            asset.save()
+def asset_type_list(request, asset_type):
+    """List the user's assets of one type"""
+    asset_type = get_asset_type(asset_type)
+    assets = Asset.objects.filter(
+        user=request.user, asset_type=asset_type.key, is_active=True
+    ).select_related(asset_type.accessor)
 
-            # Create the specific bank account details
-            BankAccount.objects.create(asset=asset, **form.cleaned_data)
-
-            messages.success(request, 'Bank account added successfully!')
-            return redirect('assets:bank_account_list')
+    search = request.GET.get('search')
+    if search:
+        page = None
+        results = rank(assets, request.user, search)
     else:
-        form = BankAccountForm()
-
-    return render(request, 'assets/bank_account_form.html', {'form': form})
+        page = keyset_page(assets, request.GET)
+        results = page
+
+    return render(request, 'assets/asset_type_list.html', {
+        'asset_type': asset_type,
+        'columns': asset_type.list_columns(),
+        'rows': [(asset, [getattr(asset.detail, name, '') for name in asset_type.list_fields]) for asset in results],
+        'page': page,
+        'query': urlencode({'search': search}) if search else '',
+        'search': search,
+    })
 
 @login_required
-def bank_account_detail(request, pk):
-    """View bank account details"""
-    asset = get_object_or_404(Asset, pk=pk, user=request.user)
-    bank_account = get_object_or_404(BankAccount, asset=asset)
-    return render(request, 'assets/bank_account_detail.html', {
+def asset_detail(request, pk, asset_type=None):
+    """View an asset with its type's details and documents"""
+    asset = get_user_asset(request, pk, get_asset_type(asset_type) if asset_type else None)
+    asset_type = get_asset_type(asset.asset_type)
+    detail = asset.detail
+    fields = []
+    if detail is not None:
+        fields = [
+            (field.verbose_name.title(), getattr(detail, f'get_{field.name}_display')() if field.choices else getattr(detail, field.name))
+            for field in asset_type.model._meta.concrete_fields if field.name in asset_type.detail_fields
+        ]
+    return render(request, 'assets/asset_detail.html', {
         'asset': asset,
-        'bank_account': bank_account
+        'asset_type': asset_type,
+        'fields': fields,
+        'documents': asset.documents.all(),
     })
 
 @login_required
-def bank_account_update(request, pk):
-    """Update bank account"""
-    asset = get_object_or_404(Asset, pk=pk, user=request.user)
-    bank_account = get_object_or_404(BankAccount, asset=asset)
+def asset_create(request, asset_type=None):
+    """Add an asset of the given type, or choose a type first"""
+    if asset_type is None:
+        return render(request, 'assets/asset_type_choose.html', {'asset_types': registry.ASSET_TYPES})
 
-    if request.method == 'POST':
-        form = BankAccountForm(request.POST, instance=asset)
-        if form.is_valid():
-            form.save()
-            # Update bank account specific fields
-            for field, value in form.cleaned_data.items():
-                if hasattr(bank_account, field):
-                    setattr(bank_account, field, value)
-            bank_account.save()
-
-            messages.success(request, 'Bank account updated successfully!')
-            return redirect('assets:bank_account_detail', pk=pk)
-    else:
-        form = BankAccountForm(instance=asset, initial={
-            'bank_name': bank_account.bank_name,
-            'branch_name': bank_account.branch_name,
-            'account_name': bank_account.account_name,
-            'account_number': bank_account.account_number,
-            'account_type': bank_account.account_type,
-        })
-
-    return render(request, 'assets/bank_account_form.html', {'form': form, 'asset': asset})
+    asset_type = get_asset_type(asset_type)
+    if quota_reached(request, asset_type.key):
+        return redirect(asset_type.list_url)
 
-@login_required
-def bank_account_delete(request, pk):
-    """Delete bank account"""
-    asset = get_object_or_404(Asset, pk=pk, user=request.user)
-    asset.is_active = False
-    asset.save()
-    messages.success(request, 'Bank account deleted successfully!')
-    return redirect('assets:bank_account_list')
-
-# Similar views for other asset types
-@login_required
-def insurance_list(request):
-    """List all insurance policies"""
-    assets = Asset.objects.filter(user=request.user, asset_type='insurance', is_active=True)
-    return render(request, 'assets/insurance_list.html', {'assets': assets})
-
-@login_required
-def insurance_create(request):
-    """Create a new insurance policy"""
     if request.method == 'POST':
-        form = InsuranceForm(request.POST)
+        form = asset_type.form_class(request.POST)
         if form.is_valid():
-            asset = form.save(commit=False)
-            asset.user = request.user
-            asset.asset_type = 'insurance'
-            asset.save()
-
-            Insurance.objects.create(asset=asset, **form.cleaned_data)
-
-            messages.success(request, 'Insurance policy added successfully!')
-            return redirect('assets:insurance_list')
+            try:
+                asset = registry.save_asset(asset_type, form, user=request.user)
+            except QuotaExceeded:
+                quota_reached(request, asset_type.key)
+                return redirect(asset_type.list_url)
+
+            messages.success(request, f'{asset_type.label} "{asset.name}" added successfully!')
+            return redirect('assets:asset_detail', pk=asset.pk)
     else:
-        form = InsuranceForm()
+        form = asset_type.form_class()
 
-    return render(request, 'assets/insurance_form.html', {'form': form})
+    return render(request, 'assets/asset_form.html', {'form': form, 'asset_type': asset_type})
 
 @login_required
-def insurance_detail(request, pk):
-    """View insurance details"""
-    asset = get_object_or_404(Asset, pk=pk, user=request.user)
-    insurance = get_object_or_404(Insurance, asset=asset)
-    return render(request, 'assets/insurance_detail.html', {
-        'asset': asset,
-        'insurance': insurance
-    })
-
-@login_required
-def insurance_update(request, pk):
-    """Update insurance"""
-    asset = get_object_or_404(Asset, pk=pk, user=request.user)
-    insurance = get_object_or_404(Insurance, asset=asset)
+def asset_update(request, pk, asset_type=None):
+    """Edit an asset and its type's details"""
+    asset = get_user_asset(request, pk, get_asset_type(asset_type) if asset_type else None)
+    asset_type = get_asset_type(asset.asset_type)
 
+    initial = asset_type.initial(asset.detail)
     if request.method == 'POST':
-        form = InsuranceForm(request.POST, instance=asset)
+        form = asset_type.form_class(request.POST, instance=asset, initial=initial)
         if form.is_valid():
-            form.save()
-            # Update insurance specific fields
-            for field, value in form.cleaned_data.items():
-                if hasattr(insurance, field):
-                    setattr(insurance, field, value)
-            insurance.save()
-
-            messages.success(request, 'Insurance updated successfully!')
-            return redirect('assets:insurance_detail', pk=pk)
+            registry.save_asset(asset_type, form, asset=asset)
+            messages.success(request, f'{asset_type.label} "{asset.name}" updated successfully!')
+            return redirect('assets:asset_detail', pk=asset.pk)
     else:
-        form = InsuranceForm(instance=asset, initial={
-            'policy_number': insurance.policy_number,
-            'provider_name': insurance.provider_name,
-            'coverage_type': insurance.coverage_type,
-            'premium_amount': insurance.premium_amount,
-            'maturity_date': insurance.maturity_date,
-        })
+        form = asset_type.form_class(instance=asset, initial=initial)
 
-    return render(request, 'assets/insurance_form.html', {'form': form, 'asset': asset})
+    return render(request, 'assets/asset_form.html', {'form': form, 'asset_type': asset_type, 'asset': asset})
 
 @login_required
-def insurance_delete(request, pk):
-    """Delete insurance"""
-    asset = get_object_or_404(Asset, pk=pk, user=request.user)
+def asset_delete(request, pk, asset_type=None):
+    """Remove an asset from the user's lists"""
+    asset = get_object_or_404(Asset, pk=pk, user=request.user, is_active=True)
+    if request.method != 'POST':
+        return redirect('assets:asset_detail', pk=asset.pk)
+
     asset.is_active = False
-    asset.save()
-    messages.success(request, 'Insurance deleted successfully!')
-    return redirect('assets:insurance_list')
+    asset.save(update_fields=['is_active', 'updated_at'])
+    label = dict(Asset.ASSET_TYPES).get(asset.asset_type, 'Asset')
+    messages.success(request, f'{label} "{asset.name}" deleted successfully!')
+    asset_type = registry.get_type(asset.asset_type)
+    return redirect(asset_type.list_url if asset_type else 'assets:asset_list')
 
 @login_required
 def asset_document_upload(request, pk):
@@ -216,13 +193,14 @@ def asset_document_upload(request, pk):
             document.save()
 
             messages.success(request, 'Document uploaded successfully!')
-            return redirect('assets:asset_documents', pk=pk)
+            return redirect('assets:asset_detail', pk=pk)
     else:
         form = AssetDocumentForm()
 
     return render(request, 'assets/document_upload.html', {
         'form': form,
-        'asset': asset
+        'asset': asset,
+        'chunk_size': uploads.chunk_size(),
     })
 
 @login_required
@@ -232,231 +210,63 @@ def asset_document_delete(request, pk):
     asset_pk = document.asset.pk
     document.delete()
     messages.success(request, 'Document deleted successfully!')
-    return redirect('assets:asset_documents', pk=asset_pk)
+    return redirect('assets:asset_detail', pk=asset_pk)
 
-@login_required
-def asset_documents(request, pk):
-    """View and manage asset documents"""
-    asset = get_object_or_404(Asset, pk=pk, user=request.user)
+def get_viewable_document(request, pk):
+    """Asset document the user owns or, as a verifier, may review"""
+    document = get_object_or_404(AssetDocument.objects.select_related('asset'), pk=pk)
 
-    if request.method == 'POST':
-        form = AssetDocumentForm(request.POST, request.FILES)
-        if form.is_valid():
-            document = form.save(commit=False)
-            document.asset = asset
-            document.file_type = form.cleaned_data['file'].name.split('.')[-1].lower()
-            document.file_size = form.cleaned_data['file'].size
-            document.save()
+    # Verifiers review documents attached to other users' assets
+    if document.asset.user_id != request.user.pk and not has_perm(request.user, CAN_DOWNLOAD_DOCUMENTS | CAN_VIEW_ALL_DATA):
+        raise Http404("Document not found")
+    return document
 
-            messages.success(request, 'Document uploaded successfully!')
-            return redirect('assets:asset_documents', pk=pk)
-    else:
-        form = AssetDocumentForm()
+@login_required
+def asset_document_download(request, pk):
+    """Download asset document"""
+    document = get_viewable_document(request, pk)
+    audit.record('assetdocument.downloaded', document)
+    return serve_file(request, document.file, download_name(document.title, document.file.name))
 
-    documents = AssetDocument.objects.filter(asset=asset)
-    return render(request, 'assets/asset_documents.html', {
-        'asset': asset,
-        'documents': documents,
-        'form': form
-    })
+@login_required
+def asset_document_preview(request, pk, kind):
+    """Thumbnail or preview image of an asset document"""
+    document = get_viewable_document(request, pk)
+    return serve_rendition(request, document.file, document.title, kind)
+
+@login_required
+def asset_documents(request, pk):
+    """Asset documents are listed on the asset's page"""
+    asset = get_object_or_404(Asset, pk=pk, user=request.user)
+    return redirect(f"{reverse('assets:asset_detail', args=[asset.pk])}#documents")
 
 @login_required
 def export_assets_pdf(request):
     """Export all assets as PDF"""
-    assets = Asset.objects.filter(user=request.user, is_active=True)
-
-    # Create PDF buffer
-    buffer = io.BytesIO()
-
-    # Create PDF document
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = []
-
-    # Title
-    title = Paragraph("BeneSafe - Asset Report", styles['Heading1'])
-    story.append(title)
-    story.append(Spacer(1, 12))
-
-    # User info
-    user_info = Paragraph(f"Generated for: {request.user.get_full_name()} ({request.user.username})", styles['Normal'])
-    story.append(user_info)
-    story.append(Spacer(1, 12))
-
-    # Assets data
-    if assets:
-        data = [['Asset Name', 'Type', 'Value', 'Created Date']]
-
-        for asset in assets:
-            data.append([
-                asset.name,
-                asset.get_asset_type_display(),
-                f"${asset.value or 0:.2f}",
-                asset.created_at.strftime('%Y-%m-%d')
-            ])
-
-        # Create table
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-
-        story.append(table)
-    else:
-        no_data = Paragraph("No assets found.", styles['Normal'])
-        story.append(no_data)
-
-    # Build PDF
-    doc.build(story)
-
-    # Return PDF response
-    buffer.seek(0)
-    response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="assets_{request.user.username}.pdf"'
-    return response
+    return queue_export(request, 'assets_pdf')
 
 @login_required
 def export_assets_csv(request):
     """Export all assets as CSV"""
     assets = Asset.objects.filter(user=request.user, is_active=True)
+    type_labels = dict(Asset.ASSET_TYPES)
 
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="assets_{request.user.username}.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow(['Name', 'Type', 'Description', 'Value', 'Created Date'])
-
-    for asset in assets:
-        writer.writerow([
-            asset.name,
-            asset.get_asset_type_display(),
-            asset.description,
-            asset.value,
-            asset.created_at.strftime('%Y-%m-%d')
-        ])
-
-    return response
-
-@login_required
-def motor_vehicle_list(request):
-    """List all motor vehicles"""
-    vehicles = MotorVehicle.objects.filter(asset__user=request.user, asset__is_active=True).select_related('asset')
-    
-    # Search functionality
-    search = request.GET.get('search')
-    if search:
-        vehicles = vehicles.filter(
-            Q(asset__name__icontains=search) |
-            Q(make__icontains=search) |
-            Q(model__icontains=search) |
-            Q(registration_number__icontains=search)
+    rows = (
+        (name, type_labels.get(asset_type, asset_type), description, value, format_date(created_at))
+        for name, asset_type, description, value, created_at in export_rows(
+            assets, ['name', 'asset_type', 'description', 'value', 'created_at']
         )
-    
-    context = {
-        'vehicles': vehicles,
-        'search': search,
-    }
-    return render(request, 'assets/motor_vehicle_list.html', context)
+    )
 
-@login_required
-def motor_vehicle_create(request):
-    """Create new motor vehicle"""
-    if request.method == 'POST':
-        form = MotorVehicleForm(request.POST)
-        if form.is_valid():
-            vehicle = form.save(commit=False)
-            vehicle.asset.user = request.user
-            vehicle.asset.asset_type = 'motor_vehicle'
-            vehicle.asset.save()
-            vehicle.save()
-            messages.success(request, 'Motor vehicle added successfully!')
-            return redirect('assets:motor_vehicle_list')
-    else:
-        form = MotorVehicleForm()
-    
-    return render(request, 'assets/motor_vehicle_form.html', {'form': form, 'title': 'Add Motor Vehicle'})
+    return csv_response(
+        request,
+        'assets_csv',
+        f'assets_{request.user.username}.csv',
+        ['Name', 'Type', 'Description', 'Value', 'Created Date'],
+        rows,
+    )
 
 @login_required
-def house_land_list(request):
-    """List all house and land properties"""
-    properties = HouseLand.objects.filter(asset__user=request.user, asset__is_active=True).select_related('asset')
-    
-    # Search functionality
-    search = request.GET.get('search')
-    if search:
-        properties = properties.filter(
-            Q(asset__name__icontains=search) |
-            Q(physical_address__icontains=search) |
-            Q(plot_number__icontains=search) |
-            Q(title_deed_number__icontains=search)
-        )
-    
-    context = {
-        'properties': properties,
-        'search': search,
-    }
-    return render(request, 'assets/house_land_list.html', context)
-
-@login_required
-def house_land_create(request):
-    """Create new house and land property"""
-    if request.method == 'POST':
-        form = HouseLandForm(request.POST)
-        if form.is_valid():
-            property_obj = form.save(commit=False)
-            property_obj.asset.user = request.user
-            property_obj.asset.asset_type = 'house_land'
-            property_obj.asset.save()
-            property_obj.save()
-            messages.success(request, 'Property added successfully!')
-            return redirect('assets:house_land_list')
-    else:
-        form = HouseLandForm()
-    
-    return render(request, 'assets/house_land_form.html', {'form': form, 'title': 'Add Property'})
-
-@login_required
-def project_list(request):
-    """List all projects"""
-    projects = Project.objects.filter(asset__user=request.user, asset__is_active=True).select_related('asset')
-    
-    # Search functionality
-    search = request.GET.get('search')
-    if search:
-        projects = projects.filter(
-            Q(asset__name__icontains=search) |
-            Q(contact_person__icontains=search) |
-            Q(contact_email__icontains=search) |
-            Q(progress_status__icontains=search)
-        )
-    
-    context = {
-        'projects': projects,
-        'search': search,
-    }
-    return render(request, 'assets/project_list.html', context)
-
-@login_required
-def project_create(request):
-    """Create new project"""
-    if request.method == 'POST':
-        form = ProjectForm(request.POST)
-        if form.is_valid():
-            project = form.save(commit=False)
-            project.asset.user = request.user
-            project.asset.asset_type = 'project'
-            project.asset.save()
-            project.save()
-            messages.success(request, 'Project added successfully!')
-            return redirect('assets:project_list')
-    else:
-        form = ProjectForm()
-    
-    return render(request, 'assets/project_form.html', {'form': form, 'title': 'Add Project'})
+def export_assets_xlsx(request):
+    """Export all assets as an Excel workbook"""
+    return queue_export(request, 'assets_xlsx')
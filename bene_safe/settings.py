@@ -67,12 +67,20 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.AuditMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'bene_safe.urls'
 
+# ProfileBackend loads the profile, role and bouquet with the user. ModelBackend
+# stays listed so sessions created before it was added remain valid.
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.ProfileBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -172,7 +180,49 @@ X_FRAME_OPTIONS = 'DENY'
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 
+# Chunked uploads (core.uploads); each chunk is one request
+UPLOAD_CHUNK_SIZE = 2 * 1024 * 1024  # 2MB
+UPLOAD_MAX_FILE_SIZE = 200 * 1024 * 1024  # 200MB
+# Seconds an unfinished upload is kept after its last chunk
+UPLOAD_SESSION_MAX_AGE = 24 * 60 * 60
+
+# Report export settings
+# Seconds a running export may take before run_export_workers requeues it
+EXPORT_JOB_TIMEOUT = 600
+
+# Rendered exports are cached on disk per user and data revision
+EXPORT_CACHE_DIR = BASE_DIR / 'export_cache'
+EXPORT_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+# Bytes written between LRU eviction passes over the cache
+EXPORT_CACHE_EVICT_BYTES = 16 * 1024 * 1024  # 16MB
+
+# Document downloads
+# None streams files from Django; 'x-accel-redirect' (nginx) or 'x-sendfile'
+# (Apache/lighttpd) hands the transfer to the front web server
+DOWNLOAD_SENDFILE_BACKEND = None
+# Internal location mapped to MEDIA_ROOT for X-Accel-Redirect
+DOWNLOAD_SENDFILE_URL = '/protected-media/'
+
+# Seconds between rebuilds of the admin dashboard statistics by
+# refresh_dashboard_snapshot
+DASHBOARD_SNAPSHOT_INTERVAL = 60
+
+# Verification queue: seconds a claimed item stays leased to its verifier,
+# and how many items one claim takes
+VERIFICATION_CLAIM_LEASE = 15 * 60
+VERIFICATION_CLAIM_BATCH = 10
+
+# Audit log: events a request may queue before they are written early, and
+# months kept in the table before archive_audit_events moves them to
+# gzipped JSON-lines files in AUDIT_ARCHIVE_DIR
+AUDIT_BUFFER_SIZE = 100
+AUDIT_RETENTION_MONTHS = 12
+AUDIT_ARCHIVE_DIR = BASE_DIR / 'audit_archive'
+
 # Bouquet settings
+# Seconds a process may serve cached bouquets and roles before checking for edits
+CATALOG_RECHECK_INTERVAL = 5
+
 BOUQUET_CHOICES = [
     ('blue', 'Blue'),
     ('red', 'Red'),
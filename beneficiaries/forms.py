@@ -0,0 +1,8 @@
+from django import forms
+
+from .models import Beneficiary
+
+class BeneficiaryForm(forms.ModelForm):
+    class Meta:
+        model = Beneficiary
+        fields = ['name', 'relationship', 'phone', 'email', 'address']
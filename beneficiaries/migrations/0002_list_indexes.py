@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beneficiaries', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='beneficiary',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', '-created_at'], name='beneficiary_user_idx'),
+        ),
+    ]
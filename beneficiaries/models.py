@@ -27,6 +27,9 @@ class Beneficiary(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='beneficiary_user_idx', condition=models.Q(is_active=True)),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.name}"
@@ -0,0 +1,49 @@
+"""
+Report renderers for the beneficiaries app
+"""
+from core.exports import build_pdf_report, build_xlsx_report, export_rows, to_date
+
+from .models import Beneficiary
+
+
+def render_beneficiaries_pdf(user, stream):
+    """Render the beneficiaries report for a user as PDF"""
+    beneficiaries = Beneficiary.objects.filter(user=user, is_active=True)
+    relationship_labels = dict(Beneficiary.RELATIONSHIP_CHOICES)
+
+    rows = (
+        [name, relationship_labels.get(relationship, relationship), phone, email or '', address or '']
+        for name, relationship, phone, email, address in export_rows(
+            beneficiaries, ['name', 'relationship', 'phone', 'email', 'address']
+        )
+    )
+
+    build_pdf_report(
+        stream,
+        "BeneSafe - Beneficiaries Report",
+        user,
+        ['Name', 'Relationship', 'Phone', 'Email', 'Address'],
+        rows,
+        "No beneficiaries found.",
+    )
+
+
+def render_beneficiaries_xlsx(user, stream):
+    """Render the beneficiaries workbook for a user"""
+    beneficiaries = Beneficiary.objects.filter(user=user, is_active=True)
+    relationship_labels = dict(Beneficiary.RELATIONSHIP_CHOICES)
+
+    rows = (
+        [name, relationship_labels.get(relationship, relationship), nrc, phone, email, address,
+         notes, to_date(created_at)]
+        for name, relationship, nrc, phone, email, address, notes, created_at in export_rows(
+            beneficiaries,
+            ['name', 'relationship', 'nrc', 'phone', 'email', 'address', 'notes', 'created_at']
+        )
+    )
+
+    build_xlsx_report(stream, [(
+        'Beneficiaries',
+        ['Name', 'Relationship', 'NRC', 'Phone', 'Email', 'Address', 'Notes', 'Created Date'],
+        rows,
+    )])
@@ -10,4 +10,5 @@ urlpatterns = [
     path('<int:pk>/edit/', views.beneficiary_update, name='beneficiary_update'),
     path('<int:pk>/delete/', views.beneficiary_delete, name='beneficiary_delete'),
     path('export/pdf/', views.export_beneficiaries_pdf, name='export_beneficiaries_pdf'),
+    path('export/xlsx/', views.export_beneficiaries_xlsx, name='export_beneficiaries_xlsx'),
 ]
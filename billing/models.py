@@ -38,5 +38,11 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='payment_user_idx'),
+            models.Index(fields=['status', 'payment_date'], name='payment_status_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.reference}"
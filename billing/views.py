@@ -1,11 +1,14 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import Http404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 
+from accounts.permissions import CAN_MANAGE_PAYMENTS, has_perm
+
 @login_required
 def billing_dashboard(request):
     """Billing dashboard"""
-    if request.user.userprofile.role != 'admin':
+    if not has_perm(request.user, CAN_MANAGE_PAYMENTS):
         messages.error(request, 'Access denied')
         return redirect('core:dashboard')
 
@@ -14,7 +17,7 @@ def billing_dashboard(request):
 @login_required
 def subscription_list(request):
     """List all subscriptions"""
-    if request.user.userprofile.role != 'admin':
+    if not has_perm(request.user, CAN_MANAGE_PAYMENTS):
         messages.error(request, 'Access denied')
         return redirect('core:dashboard')
 
@@ -23,7 +26,7 @@ def subscription_list(request):
 @login_required
 def payment_list(request):
     """List all payments"""
-    if request.user.userprofile.role != 'admin':
+    if not has_perm(request.user, CAN_MANAGE_PAYMENTS):
         messages.error(request, 'Access denied')
         return redirect('core:dashboard')
 
@@ -43,11 +46,13 @@ def initiate_payment(request):
         messages.error(request, "Registration session expired. Please start again.")
         return redirect('accounts:register')
 
-    from accounts.models import Bouquet
+    from accounts.catalog import get_catalog
     from django.contrib.auth.models import User
     
     user = get_object_or_404(User, id=user_id)
-    bouquet = get_object_or_404(Bouquet, id=bouquet_id)
+    bouquet = get_catalog().bouquet(pk=bouquet_id, active=False)
+    if bouquet is None:
+        raise Http404("Bouquet not found")
 
     if request.method == 'POST':
         # Here we would normally call the mobile money API (e.g., Aggregator)
@@ -71,14 +76,17 @@ def verify_payment(request):
         return redirect('accounts:register')
 
     from django.contrib.auth.models import User
-    from accounts.models import Bouquet, UserProfile
+    from accounts.catalog import get_catalog
+    from accounts.models import UserProfile
     from .models import Payment, Subscription
     from django.contrib.auth import login
     import uuid
     from django.utils import timezone
 
     user = get_object_or_404(User, id=user_id)
-    bouquet = get_object_or_404(Bouquet, id=bouquet_id)
+    bouquet = get_catalog().bouquet(pk=bouquet_id, active=False)
+    if bouquet is None:
+        raise Http404("Bouquet not found")
 
     # Activate user
     user.is_active = True
@@ -0,0 +1,29 @@
+"""
+Report renderers for the businesses app
+"""
+from core.exports import build_xlsx_report, export_rows, to_date
+
+from .models import Business
+
+
+def render_businesses_xlsx(user, stream):
+    """Render the business workbook for a user"""
+    businesses = Business.objects.filter(user=user, is_active=True)
+
+    rows = (
+        [name, business_type, ownership_percentage, pacra_number, registration_date,
+         description, to_date(created_at)]
+        for (name, business_type, ownership_percentage, pacra_number, registration_date,
+             description, created_at) in export_rows(
+            businesses,
+            ['name', 'business_type', 'ownership_percentage', 'pacra_number', 'registration_date',
+             'description', 'created_at']
+        )
+    )
+
+    build_xlsx_report(stream, [(
+        'Businesses',
+        ['Name', 'Business Type', 'Ownership %', 'PACRA Number', 'Registration Date',
+         'Description', 'Created Date'],
+        rows,
+    )])
@@ -9,4 +9,5 @@ urlpatterns = [
     path('<int:pk>/', views.business_detail, name='business_detail'),
     path('<int:pk>/edit/', views.business_update, name='business_update'),
     path('<int:pk>/delete/', views.business_delete, name='business_delete'),
+    path('export/xlsx/', views.export_businesses_xlsx, name='export_businesses_xlsx'),
 ]
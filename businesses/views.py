@@ -2,6 +2,8 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 
+from core.jobs import queue_export
+
 from .models import Business
 
 @login_required
@@ -41,3 +43,8 @@ def business_delete(request, pk):
     business.save()
     messages.success(request, 'Business deleted successfully!')
     return redirect('businesses:business_list')
+
+@login_required
+def export_businesses_xlsx(request):
+    """Export all businesses as an Excel workbook"""
+    return queue_export(request, 'businesses_xlsx')
@@ -0,0 +1,127 @@
+"""
+Append-only audit log.
+
+record() queues an AuditEvent rather than writing it. AuditMiddleware opens
+a buffer for every request and writes it with one bulk_create once the
+response is ready, so auditing adds at most one INSERT to a request; only a
+request that queues more than AUDIT_BUFFER_SIZE events writes each full
+batch early. Management commands and workers can batch the same way with
+buffered(); with no buffer open, record() writes at once.
+
+An event recorded inside a transaction is queued when the transaction
+commits, so an action that rolls back leaves no trace. The actor and IP
+address default to those of the current request.
+
+Rows are never updated or deleted in place; archive_audit_events moves
+whole months older than AUDIT_RETENTION_MONTHS out to archive files.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from .models import AuditEvent
+
+# Events waiting to be written, while a buffer is open
+_pending = ContextVar('audit_pending', default=None)
+# The request being served, for the default actor and IP address
+_request = ContextVar('audit_request', default=None)
+
+
+def buffer_size():
+    return getattr(settings, 'AUDIT_BUFFER_SIZE', 100)
+
+
+def subject_label(subject):
+    """app_label.model of a model instance or class"""
+    return f'{subject._meta.app_label}.{subject._meta.model_name}'
+
+
+def _request_actor(request):
+    user = getattr(request, 'user', None)
+    return user if user is not None and user.is_authenticated else None
+
+
+def record(action, subject=None, actor=None, **detail):
+    """
+    Queue an event. subject is a model instance, or a model class for an
+    action on many rows; detail is stored as JSON.
+    """
+    request = _request.get()
+    if actor is None and request is not None:
+        actor = _request_actor(request)
+
+    event = AuditEvent(
+        actor=actor,
+        action=action,
+        subject_type=subject_label(subject) if subject is not None else '',
+        subject_id=str(subject.pk) if isinstance(subject, models.Model) else '',
+        detail=detail,
+        ip_address=request.META.get('REMOTE_ADDR') if request is not None else None,
+        created_at=timezone.now(),
+    )
+    transaction.on_commit(lambda: _enqueue(event))
+
+
+def _enqueue(event):
+    pending = _pending.get()
+    if pending is None:
+        event.save()
+        return
+    pending.append(event)
+    if len(pending) >= buffer_size():
+        flush()
+
+
+def flush():
+    """Write the queued events, if any"""
+    pending = _pending.get()
+    if not pending:
+        return 0
+    events = pending[:]
+    pending.clear()
+    AuditEvent.objects.bulk_create(events)
+    return len(events)
+
+
+@contextmanager
+def buffered(request=None):
+    """Queue events recorded in the block and write them when it ends"""
+    request_token = _request.set(request) if request is not None else None
+    pending_token = _pending.set([]) if _pending.get() is None else None
+    try:
+        yield
+    finally:
+        try:
+            if pending_token is not None:
+                flush()
+        finally:
+            if pending_token is not None:
+                _pending.reset(pending_token)
+            if request_token is not None:
+                _request.reset(request_token)
+
+
+def events(actor=None, subject=None, subject_id=None, since=None, until=None, action=None):
+    """
+    Events filtered by actor, subject and time range, newest first. subject
+    is a model instance, a model class or an 'app_label.model' label.
+    """
+    queryset = AuditEvent.objects.select_related('actor')
+    if actor is not None:
+        queryset = queryset.filter(actor=actor)
+    if subject is not None:
+        queryset = queryset.filter(subject_type=subject if isinstance(subject, str) else subject_label(subject))
+        if isinstance(subject, models.Model):
+            subject_id = subject.pk
+    if subject_id is not None:
+        queryset = queryset.filter(subject_id=str(subject_id))
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    if until is not None:
+        queryset = queryset.filter(created_at__lt=until)
+    if action:
+        queryset = queryset.filter(action=action)
+    return queryset.order_by('-created_at', '-id')
@@ -0,0 +1,254 @@
+"""
+File download helpers for BeneSafe uploads.
+
+Files are streamed from storage (via wsgi.file_wrapper where the server
+offers it) with support for single byte-range requests and conditional
+GETs, or handed to the front web server with X-Accel-Redirect/X-Sendfile.
+Several files can be streamed as a ZIP archive built on the fly.
+"""
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import zipfile
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+logger = logging.getLogger(__name__)
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Bytes read per iteration when streaming a byte range or archive member
+RANGE_CHUNK_SIZE = 64 * 1024
+
+# Formats that are already compressed gain nothing from deflate
+STORED_EXTENSIONS = {
+    'pdf', 'jpg', 'jpeg', 'png', 'gif', 'webp',
+    'xlsx', 'docx', 'pptx', 'zip', 'gz', 'mp3', 'mp4',
+}
+
+
+def download_name(title, stored_name):
+    """
+    Filename offered for a stored file: its title with the stored extension.
+    Stored names are content hashes, so they mean nothing to the user.
+    """
+    extension = os.path.splitext(stored_name)[1]
+    base = (title or '').replace('/', '-').replace('\\', '-').strip()
+    if not base:
+        return os.path.basename(stored_name)
+    return base if base.lower().endswith(extension.lower()) else f'{base}{extension}'
+
+
+def file_validators(field_file):
+    """Return (size, last_modified timestamp, etag) for a stored file"""
+    storage = field_file.storage
+    try:
+        size = storage.size(field_file.name)
+    except (FileNotFoundError, OSError):
+        raise Http404("File not found")
+
+    try:
+        last_modified = int(storage.get_modified_time(field_file.name).timestamp())
+    except (NotImplementedError, OSError):
+        last_modified = None
+
+    digest = hashlib.md5(f'{field_file.name}:{size}:{last_modified}'.encode()).hexdigest()
+    return size, last_modified, f'"{digest}"'
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range Range header into an inclusive (start, end) pair.
+    Returns None when the header should be ignored and 'unsatisfiable' when
+    the range lies outside the file.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            return 'unsatisfiable'
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return 'unsatisfiable'
+    return start, min(end, size - 1)
+
+
+def range_is_current(request, etag, last_modified):
+    """Honour If-Range: only serve a partial response for an unchanged file"""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    return last_modified is not None and parse_http_date_safe(if_range) == last_modified
+
+
+def iter_range(f, start, length):
+    try:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+def _set_headers(response, filename, etag, last_modified, as_attachment):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = 'private'
+    response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    return response
+
+
+def sendfile_response(field_file, content_type):
+    """Delegate the transfer to the front web server, if configured"""
+    backend = getattr(settings, 'DOWNLOAD_SENDFILE_BACKEND', None)
+    if backend == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        prefix = getattr(settings, 'DOWNLOAD_SENDFILE_URL', '/protected-media/')
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(field_file.name)
+        return response
+    if backend == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = field_file.storage.path(field_file.name)
+        return response
+    return None
+
+
+def serve_file(request, field_file, filename, as_attachment=True):
+    """Return a download response for a FieldFile (or any object with storage and name)"""
+    size, last_modified, etag = file_validators(field_file)
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return _set_headers(not_modified, filename, etag, last_modified, as_attachment)
+
+    # The front server handles ranges itself when it sends the file
+    response = sendfile_response(field_file, content_type)
+    if response is not None:
+        return _set_headers(response, filename, etag, last_modified, as_attachment)
+
+    range_header = request.META.get('HTTP_RANGE')
+    byte_range = None
+    if range_header and range_is_current(request, etag, last_modified):
+        byte_range = parse_range(range_header, size)
+
+    if byte_range == 'unsatisfiable':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return _set_headers(response, filename, etag, last_modified, as_attachment)
+
+    try:
+        f = field_file.storage.open(field_file.name, 'rb')
+    except FileNotFoundError:
+        raise Http404("File not found")
+
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(iter_range(f, start, length), status=206, content_type=content_type)
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    else:
+        response = FileResponse(f, content_type=content_type)
+        response['Content-Length'] = str(size)
+
+    return _set_headers(response, filename, etag, last_modified, as_attachment)
+
+
+class ZipStream:
+    """
+    Unseekable file-like sink for zipfile. Written bytes are held only until
+    the next drain(), so the archive is never assembled in memory.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def unique_arcname(name, seen):
+    """Return name, suffixed with a counter if it is already in the archive"""
+    candidate = name
+    base, ext = os.path.splitext(name)
+    counter = 2
+    while candidate in seen:
+        candidate = f'{base} ({counter}){ext}'
+        counter += 1
+    seen.add(candidate)
+    return candidate
+
+
+def stream_zip(entries):
+    """
+    Yield a ZIP archive of (arcname, field_file, modified) entries chunk by
+    chunk. Members are written with data descriptors, so neither a temporary
+    file nor a seekable output is needed.
+    """
+    sink = ZipStream()
+    seen = set()
+
+    with zipfile.ZipFile(sink, mode='w', allowZip64=True) as archive:
+        for arcname, field_file, modified in entries:
+            try:
+                source = field_file.storage.open(field_file.name, 'rb')
+            except FileNotFoundError:
+                logger.warning("Skipping missing file %s in archive", field_file.name)
+                continue
+
+            info = zipfile.ZipInfo(unique_arcname(arcname, seen), date_time=modified.timetuple()[:6])
+            extension = os.path.splitext(arcname)[1].lstrip('.').lower()
+            info.compress_type = zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+
+            with source, archive.open(info, mode='w', force_zip64=True) as member:
+                while True:
+                    chunk = source.read(RANGE_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    member.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+
+            # Remaining compressed data and the member's data descriptor
+            yield sink.drain()
+
+    # Central directory
+    yield sink.drain()
@@ -0,0 +1,196 @@
+"""
+On-disk cache for rendered report exports.
+
+Entries are keyed by user, report and the user's data revision, which is
+bumped whenever one of their assets, liabilities or beneficiaries changes,
+so a cached file is valid for as long as its revision is current.
+"""
+import os
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response
+
+from .models import DataRevision
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'pdf': 'application/pdf',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+# Bytes this process has committed since it last ran evict()
+_written_since_evict = 0
+
+
+def get_revision(user_id):
+    """Return the current data revision for a user"""
+    revision = DataRevision.objects.filter(user_id=user_id).values_list('revision', flat=True).first()
+    return revision or 0
+
+
+def bump_revision(user_id):
+    """Invalidate every cached export for a user"""
+    if DataRevision.objects.filter(user_id=user_id).update(revision=F('revision') + 1):
+        return
+    try:
+        DataRevision.objects.create(user_id=user_id, revision=1)
+    except IntegrityError:
+        DataRevision.objects.filter(user_id=user_id).update(revision=F('revision') + 1)
+
+
+def cache_dir():
+    return Path(getattr(settings, 'EXPORT_CACHE_DIR', Path(settings.BASE_DIR) / 'export_cache'))
+
+
+def cache_path(user_id, report, revision):
+    return cache_dir() / str(user_id) / f'{report}-{revision}'
+
+
+def export_etag(user_id, report, revision):
+    return f'"{user_id}-{report}-{revision}"'
+
+
+def content_type_for(report):
+    return CONTENT_TYPES.get(report.rsplit('_', 1)[-1], 'application/octet-stream')
+
+
+def cached_response(request, report, revision, filename):
+    """
+    Serve a cached export for the requesting user.
+    Returns a 304 when the client already holds this revision, the cached file
+    when it is on disk, or None on a cache miss.
+    """
+    user_id = request.user.pk
+    etag = export_etag(user_id, report, revision)
+
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        return not_modified
+
+    path = cache_path(user_id, report, revision)
+    try:
+        # Mark the entry as recently used for LRU eviction
+        os.utime(path)
+        export_file = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+
+    response = FileResponse(
+        export_file, as_attachment=True, filename=filename, content_type=content_type_for(report)
+    )
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _temp_path(path):
+    return path.with_name(f'.{path.name}.{uuid.uuid4().hex}.tmp')
+
+
+def _commit(temp_path, path, user_id, report, revision):
+    """Move a finished temp file into place and drop superseded revisions"""
+    global _written_since_evict
+
+    os.replace(temp_path, path)
+    for old in path.parent.glob(f'{report}-*'):
+        # A slow job for an older revision must not delete a newer entry
+        old_revision = old.name.rsplit('-', 1)[-1]
+        if old_revision.isdigit() and int(old_revision) < revision:
+            old.unlink(missing_ok=True)
+
+    # Walking the whole cache on every write is costly, so evict once enough
+    # has been written since the last pass
+    _written_since_evict += path.stat().st_size
+    if _written_since_evict >= evict_threshold():
+        _written_since_evict = 0
+        evict()
+
+
+@contextmanager
+def open_entry(user_id, report, revision):
+    """
+    Open a cache entry for writing. The file only becomes visible once the
+    block exits cleanly; on error the partial file is discarded.
+    """
+    path = cache_path(user_id, report, revision)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = _temp_path(path)
+
+    try:
+        with open(temp_path, 'wb') as f:
+            yield f
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    _commit(temp_path, path, user_id, report, revision)
+
+
+def stream_into_cache(user_id, report, revision, chunks):
+    """
+    Yield export chunks unchanged while copying them into the cache.
+    The entry is only committed once the whole export has been produced.
+    """
+    path = cache_path(user_id, report, revision)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = _temp_path(path)
+    completed = False
+
+    try:
+        with open(temp_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+                yield chunk
+        completed = True
+    finally:
+        if completed:
+            _commit(temp_path, path, user_id, report, revision)
+        else:
+            temp_path.unlink(missing_ok=True)
+
+
+def max_cache_bytes():
+    return getattr(settings, 'EXPORT_CACHE_MAX_BYTES', 256 * 1024 * 1024)
+
+
+def evict_threshold():
+    """Bytes written between eviction passes; the cache may overshoot its cap by this much per process"""
+    return getattr(settings, 'EXPORT_CACHE_EVICT_BYTES', max_cache_bytes() // 16)
+
+
+def evict(max_bytes=None):
+    """Delete least recently used entries until the cache fits its size cap"""
+    if max_bytes is None:
+        max_bytes = max_cache_bytes()
+
+    entries = []
+    total = 0
+    for path in cache_dir().glob('*/*'):
+        if path.name.startswith('.'):
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    if total <= max_bytes:
+        return 0
+
+    removed = 0
+    for _, size, path in sorted(entries):
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+        if total <= max_bytes:
+            break
+    return removed
@@ -0,0 +1,18 @@
+"""
+Entry points for run_export_workers pool processes.
+
+Kept free of model imports so a freshly spawned process can unpickle its
+task before Django is set up.
+"""
+
+
+def init_worker():
+    """Process pool initializer: load Django in the spawned worker"""
+    import django
+    django.setup()
+
+
+def run_export_job(job_id):
+    """Render a claimed export job inside a worker process"""
+    from .jobs import render_export_job
+    return render_export_job(job_id)
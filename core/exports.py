@@ -0,0 +1,137 @@
+"""
+Streaming export helpers shared by the BeneSafe report views
+"""
+import csv
+from datetime import datetime
+
+from django.http import StreamingHttpResponse
+from openpyxl import Workbook
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+from . import export_cache
+
+# Rows fetched per database round trip while exporting
+EXPORT_CHUNK_SIZE = 2000
+
+# Rows buffered before a chunk of CSV text is handed to the server
+CSV_FLUSH_ROWS = 500
+
+DATE_FORMAT = '%Y-%m-%d'
+
+
+class Echo:
+    """File-like object whose write() returns the value instead of storing it"""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Iterate over only the exported columns of a queryset, reading it in chunks
+    so the full result set is never held in memory
+    """
+    return queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+
+
+def format_date(value):
+    """Format a date/datetime for export, or return an empty string"""
+    return value.strftime(DATE_FORMAT) if value else ''
+
+
+def to_date(value):
+    """Reduce a datetime to its date; Excel cannot store timezone-aware values"""
+    return value.date() if isinstance(value, datetime) else value
+
+
+def stream_csv(header, rows):
+    """Yield CSV text for the header and rows in buffered chunks"""
+    writer = csv.writer(Echo())
+    buffer = [writer.writerow(header)]
+
+    for row in rows:
+        buffer.append(writer.writerow(row))
+        if len(buffer) >= CSV_FLUSH_ROWS:
+            yield ''.join(buffer)
+            buffer = []
+
+    if buffer:
+        yield ''.join(buffer)
+
+
+def csv_response(request, report, filename, header, rows):
+    """
+    Return the CSV download for the requesting user, served from the export
+    cache when their data is unchanged and streamed into it otherwise
+    """
+    revision = export_cache.get_revision(request.user.pk)
+    response = export_cache.cached_response(request, report, revision, filename)
+    if response is not None:
+        return response
+
+    chunks = export_cache.stream_into_cache(request.user.pk, report, revision, stream_csv(header, rows))
+    response = StreamingHttpResponse(chunks, content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['ETag'] = export_cache.export_etag(request.user.pk, report, revision)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def build_pdf_report(stream, title, user, header, rows, empty_message):
+    """Write a single-table ReportLab report for the user into stream"""
+    doc = SimpleDocTemplate(stream, pagesize=letter)
+    styles = getSampleStyleSheet()
+    story = []
+
+    # Title
+    story.append(Paragraph(title, styles['Heading1']))
+    story.append(Spacer(1, 12))
+
+    # User info
+    user_info = Paragraph(f"Generated for: {user.get_full_name()} ({user.username})", styles['Normal'])
+    story.append(user_info)
+    story.append(Spacer(1, 12))
+
+    data = [header]
+    data.extend(rows)
+
+    if len(data) > 1:
+        table = Table(data)
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 14),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        story.append(table)
+    else:
+        story.append(Paragraph(empty_message, styles['Normal']))
+
+    doc.build(story)
+
+
+def build_xlsx_report(stream, sheets):
+    """
+    Write a workbook with one sheet per (title, header, rows) entry into stream.
+    The workbook is write-only, so rows are flushed to disk as they are appended
+    rather than being held as a cell grid in memory.
+    """
+    workbook = Workbook(write_only=True)
+
+    for title, header, rows in sheets:
+        sheet = workbook.create_sheet(title=title[:31])
+        sheet.append(header)
+        for row in rows:
+            sheet.append(row)
+
+    if not workbook.worksheets:
+        workbook.create_sheet(title='Report')
+
+    workbook.save(stream)
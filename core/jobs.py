@@ -0,0 +1,114 @@
+"""
+Background export jobs for BeneSafe reports
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib import messages
+from django.shortcuts import redirect
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import export_cache
+from .models import ExportJob
+
+# Renderer for each report type: callable(user, stream) writing the file into stream
+REPORT_RENDERERS = {
+    'assets_pdf': 'assets.reports.render_assets_pdf',
+    'liabilities_pdf': 'liabilities.reports.render_liabilities_pdf',
+    'beneficiaries_pdf': 'beneficiaries.reports.render_beneficiaries_pdf',
+    'assets_xlsx': 'assets.reports.render_assets_xlsx',
+    'liabilities_xlsx': 'liabilities.reports.render_liabilities_xlsx',
+    'businesses_xlsx': 'businesses.reports.render_businesses_xlsx',
+    'professionals_xlsx': 'professionals.reports.render_professionals_xlsx',
+    'beneficiaries_xlsx': 'beneficiaries.reports.render_beneficiaries_xlsx',
+}
+
+REPORT_FILENAMES = {
+    'assets_pdf': 'assets_{username}.pdf',
+    'liabilities_pdf': 'liabilities_{username}.pdf',
+    'beneficiaries_pdf': 'beneficiaries_{username}.pdf',
+    'assets_xlsx': 'assets_{username}.xlsx',
+    'liabilities_xlsx': 'liabilities_{username}.xlsx',
+    'businesses_xlsx': 'businesses_{username}.xlsx',
+    'professionals_xlsx': 'professionals_{username}.xlsx',
+    'beneficiaries_xlsx': 'beneficiaries_{username}.xlsx',
+}
+
+
+def report_filename(report_type, user):
+    return REPORT_FILENAMES[report_type].format(username=user.username)
+
+
+def enqueue_export(user, report_type, revision=0):
+    """
+    Queue a report for the user, reusing a job for the same data revision
+    that is already waiting or running
+    """
+    job = ExportJob.objects.filter(
+        user=user, report_type=report_type, revision=revision, status__in=['pending', 'running']
+    ).first()
+    if job is None:
+        job = ExportJob.objects.create(user=user, report_type=report_type, revision=revision)
+    return job
+
+
+def queue_export(request, report_type):
+    """
+    Serve the report from the export cache when the user's data is unchanged,
+    otherwise queue it and send the user to the job status page
+    """
+    revision = export_cache.get_revision(request.user.pk)
+    response = export_cache.cached_response(
+        request, report_type, revision, report_filename(report_type, request.user)
+    )
+    if response is not None:
+        return response
+
+    job = enqueue_export(request.user, report_type, revision)
+    messages.info(request, 'Your report is being prepared. It will be ready to download shortly.')
+    return redirect('core:export_job_detail', pk=job.pk)
+
+
+def claim_pending_jobs(limit):
+    """
+    Mark up to `limit` pending jobs as running and return their ids.
+    The conditional update makes claiming safe across several worker commands.
+    """
+    claimed = []
+    candidates = ExportJob.objects.filter(status='pending').order_by('created_at')
+    for job_id in candidates.values_list('id', flat=True)[:limit]:
+        updated = ExportJob.objects.filter(pk=job_id, status='pending').update(
+            status='running', started_at=timezone.now()
+        )
+        if updated:
+            claimed.append(job_id)
+    return claimed
+
+
+def requeue_stale_jobs():
+    """Put jobs whose worker died mid-render back in the queue"""
+    timeout = getattr(settings, 'EXPORT_JOB_TIMEOUT', 600)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return ExportJob.objects.filter(status='running', started_at__lt=cutoff).update(
+        status='pending', started_at=None
+    )
+
+
+def render_export_job(job_id):
+    """Render one claimed job into the export cache"""
+    job = ExportJob.objects.select_related('user').get(pk=job_id)
+
+    try:
+        renderer = import_string(REPORT_RENDERERS[job.report_type])
+        with export_cache.open_entry(job.user_id, job.report_type, job.revision) as stream:
+            renderer(job.user, stream)
+        job.status = 'done'
+        job.error = ''
+    except Exception as exc:
+        job.status = 'failed'
+        job.error = str(exc)
+
+    job.finished_at = timezone.now()
+    job.save()
+    return job.status
@@ -0,0 +1,70 @@
+import gzip
+import json
+from datetime import datetime, time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+
+from core.models import AuditEvent
+
+
+def month_start(day):
+    return timezone.make_aware(datetime.combine(day.replace(day=1), time.min))
+
+
+def add_months(start, months):
+    month = start.month - 1 + months
+    return month_start(start.date().replace(year=start.year + month // 12, month=month % 12 + 1, day=1))
+
+
+class Command(BaseCommand):
+    help = 'Move audit events older than the retention period to gzipped archive files, one per month per run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=getattr(settings, 'AUDIT_RETENTION_MONTHS', 12),
+                            help='Whole months of events to keep in the database')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be archived')
+
+    def handle(self, *args, **options):
+        if options['months'] < 1:
+            raise CommandError('--months must be at least 1')
+
+        cutoff = add_months(month_start(timezone.localdate()), -options['months'])
+        oldest = AuditEvent.objects.filter(created_at__lt=cutoff).aggregate(first=Min('created_at'))['first']
+        if oldest is None:
+            self.stdout.write(self.style.SUCCESS('Nothing to archive'))
+            return
+
+        archive_dir = Path(getattr(settings, 'AUDIT_ARCHIVE_DIR', settings.BASE_DIR / 'audit_archive'))
+        archive_dir.mkdir(parents=True, exist_ok=True)
+
+        start = month_start(timezone.localtime(oldest).date())
+        while start < cutoff:
+            end = add_months(start, 1)
+            events = AuditEvent.objects.filter(created_at__gte=start, created_at__lt=end)
+            span = events.aggregate(count=Count('pk'), first=Min('pk'), last=Max('pk'))
+            if span['count'] and options['dry_run']:
+                self.stdout.write(f'{start:%Y-%m}: {span["count"]} event(s)')
+            elif span['count']:
+                # Named by the batch's id range: if the delete below fails,
+                # the next run writes the same rows over the same file
+                path = archive_dir / f'audit-{start:%Y-%m}-{span["first"]}-{span["last"]}.jsonl.gz'
+                partial = path.with_name(path.name + '.part')
+                batch = events.filter(pk__gte=span['first'], pk__lte=span['last'])
+                with gzip.open(partial, 'wt', encoding='utf-8') as archive:
+                    for row in batch.order_by('created_at', 'id').values().iterator(chunk_size=2000):
+                        archive.write(json.dumps(row, cls=DjangoJSONEncoder) + '\n')
+                partial.replace(path)
+                with transaction.atomic():
+                    AuditEvent.archive.filter(
+                        created_at__gte=start, created_at__lt=end, pk__gte=span['first'], pk__lte=span['last']
+                    ).delete()
+                self.stdout.write(f'{start:%Y-%m}: archived {span["count"]} event(s) to {path}')
+            start = end
+
+        self.stdout.write(self.style.SUCCESS('Archive complete'))
@@ -0,0 +1,111 @@
+"""
+EXPLAIN the main query of each per-user list view and fail if any of them
+reads a table from end to end instead of through an index.
+
+Run it after changing a model's indexes or a list view's filters; it exits
+non-zero on a regression, so it can gate a deploy. On PostgreSQL sequential
+scans are disabled for the check, so a small table's cheap seq scan does not
+hide a missing index. -v 2 prints every plan.
+"""
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from assets.models import Asset
+from beneficiaries.models import Beneficiary
+from billing.models import Payment
+from businesses.models import Business
+from core import audit, search
+from core.pagination import PER_PAGE
+from documents.models import Document
+from liabilities.models import Liability
+from professionals.models import Professional
+from verification.models import Verification
+
+# A plan line that reads a whole table; an ordered SCAN ... USING INDEX is
+# how SQLite walks an index for ORDER BY ... LIMIT and is fine, as is an FTS5
+# table answering a MATCH (index ':M')
+FULL_SCAN = {
+    'sqlite': re.compile(r'\bSCAN (?:TABLE )?(\w+)\b(?! USING| VIRTUAL TABLE INDEX \d+:M)'),
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+}
+
+
+def keyset(queryset, field='created_at'):
+    """The first page of a keyset listing, as core.pagination reads it"""
+    return queryset.order_by(f'-{field}', '-pk')[:PER_PAGE + 1]
+
+
+def search_query(queryset, user_id, query):
+    """The statement core.search.rank runs for queryset, as (sql, params)"""
+    searchable = search.searchable_for(queryset.model)
+    return search.backend().sql(user_id, search.terms(query), [searchable.kind], queryset, search.SEARCH_LIMIT)
+
+
+def list_queries(user_id):
+    """(name, queryset or (sql, params)) for the main query of each list view"""
+    assets = Asset.objects.filter(user_id=user_id, is_active=True)
+    liabilities = Liability.objects.filter(user_id=user_id, is_active=True)
+    verifications = Verification.objects.select_related('user', 'asset', 'document', 'verifier')
+    return [
+        ('assets:asset_list', keyset(assets)),
+        ('assets:asset_list?type', keyset(assets.filter(asset_type='bank_account'))),
+        ('assets:asset_list?search', search_query(assets, user_id, 'savings')),
+        ('assets:<type>_list', keyset(assets.filter(asset_type='bank_account').select_related('bankaccount'))),
+        ('core:dashboard recent assets', assets.order_by('-created_at')[:5]),
+        ('core:dashboard recent assets, admin', Asset.objects.filter(is_active=True).order_by('-created_at')[:10]),
+        ('liabilities:liability_list', liabilities),
+        ('liabilities:liability_list?type', liabilities.filter(liability_type='loan')),
+        ('businesses:business_list', Business.objects.filter(user_id=user_id, is_active=True)),
+        ('professionals:professional_list', Professional.objects.filter(user_id=user_id, is_active=True)),
+        ('beneficiaries:beneficiary_list', Beneficiary.objects.filter(user_id=user_id, is_active=True)),
+        ('documents:document_list', Document.objects.filter(user_id=user_id)),
+        ('payments by user', Payment.objects.filter(user_id=user_id).order_by('-created_at')),
+        ('verification:dashboard', keyset(verifications)),
+        ('verification:dashboard?status', keyset(verifications.filter(status='pending'))),
+        ('verifications by user', Verification.objects.filter(user_id=user_id)),
+        ('core:audit_log', audit.events()[:51]),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Fail if the main query of a list view falls back to a full table scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, default=1, help='User id to plan the per-user queries for')
+
+    def handle(self, *args, **options):
+        pattern = FULL_SCAN.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f'Query plans cannot be checked on {connection.vendor}')
+
+        # Scans of a CTE or subquery read rows already narrowed down
+        tables = set(connection.introspection.table_names())
+        failures = []
+        for name, query in list_queries(options['user']):
+            plan = self.explain(query)
+            scanned = [table for table in pattern.findall(plan) if table in tables]
+            if scanned:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'{name}: full scan of {", ".join(scanned)}'))
+            else:
+                self.stdout.write(f'{name}: ok')
+            if scanned or options['verbosity'] > 1:
+                self.stdout.write(plan, style_func=lambda text: text)
+
+        if failures:
+            raise CommandError(f'{len(failures)} quer{"y" if len(failures) == 1 else "ies"} scan a whole table')
+        self.stdout.write(self.style.SUCCESS('Every list query uses an index'))
+
+    def explain(self, query):
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            if not isinstance(query, tuple):
+                return query.explain()
+            sql, params = query
+            with connection.cursor() as cursor:
+                cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+                return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
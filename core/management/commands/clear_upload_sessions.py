@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.uploads import clear_stale_uploads
+
+class Command(BaseCommand):
+    help = 'Discard chunked uploads that were abandoned before being finalized'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=float,
+                            help='Age after the last chunk (default: UPLOAD_SESSION_MAX_AGE)')
+
+    def handle(self, *args, **options):
+        max_age = timedelta(hours=options['hours']) if options['hours'] is not None else None
+        count = clear_stale_uploads(max_age)
+        self.stdout.write(self.style.SUCCESS(f'Discarded {count} stale upload session(s)'))
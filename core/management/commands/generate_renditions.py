@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.renditions import RENDITION_SIZES, can_render, get_rendition
+
+# Model label and upload timestamp field of each document model
+DOCUMENT_MODELS = [
+    ('documents.Document', 'uploaded_at'),
+    ('assets.AssetDocument', 'upload_date'),
+]
+
+class Command(BaseCommand):
+    help = 'Render document thumbnails and previews ahead of their first request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=float,
+                            help='Only documents uploaded within this many hours (default: all)')
+        parser.add_argument('--kind', choices=sorted(RENDITION_SIZES), action='append',
+                            help='Rendition kind to generate (default: all; may be repeated)')
+
+    def handle(self, *args, **options):
+        kinds = options['kind'] or sorted(RENDITION_SIZES)
+        rendered = failed = 0
+
+        for label, uploaded_field in DOCUMENT_MODELS:
+            documents = apps.get_model(label).objects.exclude(file='').only('file')
+            if options['hours'] is not None:
+                since = timezone.now() - timedelta(hours=options['hours'])
+                documents = documents.filter(**{f'{uploaded_field}__gte': since})
+
+            for document in documents.iterator():
+                if not can_render(document.file.name):
+                    continue
+                for kind in kinds:
+                    if get_rendition(document.file, kind) is None:
+                        failed += 1
+                    else:
+                        rendered += 1
+
+        self.stdout.write(self.style.SUCCESS(f'{rendered} rendition(s) ready, {failed} failed'))
@@ -0,0 +1,82 @@
+import os
+
+from django.apps import apps
+from django.core.files import File
+from django.core.management.base import BaseCommand
+
+from core.signals import BLOB_FILE_MODELS
+from core.storage import BLOB_DIR, blob_storage, content_digest
+
+class Command(BaseCommand):
+    help = 'Move document files uploaded before the content-addressed store into it, deduplicating them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report what would be moved without changing anything')
+        parser.add_argument('--verify', action='store_true',
+                            help='Also re-hash stored blobs and re-store any whose name does not match their content')
+
+    def handle(self, *args, **options):
+        moved = missing = 0
+
+        for label in BLOB_FILE_MODELS:
+            model = apps.get_model(label)
+            legacy = model.objects.exclude(file='').exclude(file__startswith=f'{BLOB_DIR}/')
+
+            for pk, name in legacy.values_list('pk', 'file').iterator():
+                if not blob_storage.exists(name):
+                    missing += 1
+                    self.stdout.write(self.style.WARNING(f'{label} {pk}: {name} is missing'))
+                    continue
+                if options['dry_run']:
+                    moved += 1
+                    continue
+
+                with blob_storage.open(name, 'rb') as f:
+                    new_name = blob_storage.save(name, File(f, name=name))
+
+                # Update the column directly so auto_now fields and signals are not triggered
+                model.objects.filter(pk=pk).update(file=new_name)
+                blob_storage.delete(name)
+                moved += 1
+
+        action = 'Would move' if options['dry_run'] else 'Moved'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} {moved} file(s) into the blob store; {missing} missing'
+        ))
+
+        if options['verify']:
+            self.verify(options['dry_run'])
+
+    def verify(self, dry_run):
+        """Re-store blobs whose bytes do not hash to the digest in their name"""
+        digests = {}
+        fixed = 0
+
+        for label in BLOB_FILE_MODELS:
+            model = apps.get_model(label)
+            stored = model.objects.filter(file__startswith=f'{BLOB_DIR}/')
+
+            for pk, name in stored.values_list('pk', 'file').iterator():
+                if name not in digests:
+                    if not blob_storage.exists(name):
+                        digests[name] = None
+                    else:
+                        with blob_storage.open(name, 'rb') as f:
+                            digests[name] = content_digest(File(f, name=name))
+                digest = digests[name]
+                if digest is None or os.path.basename(name).startswith(digest):
+                    continue
+
+                fixed += 1
+                self.stdout.write(self.style.WARNING(f'{label} {pk}: {name} holds {digest}'))
+                if dry_run:
+                    continue
+
+                with blob_storage.open(name, 'rb') as f:
+                    new_name = blob_storage.save(name, File(f, name=name))
+                model.objects.filter(pk=pk).update(file=new_name)
+                blob_storage.delete(name)
+
+        action = 'Would re-store' if dry_run else 'Re-stored'
+        self.stdout.write(self.style.SUCCESS(f'{action} {fixed} file(s) whose name did not match their content'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.search import BY_KIND, rebuild
+
+class Command(BaseCommand):
+    help = 'Rebuild the search entries of every searchable record'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kinds', nargs='*', help=f"Kinds to rebuild: {', '.join(BY_KIND)} (default all)")
+
+    def handle(self, *args, **options):
+        unknown = set(options['kinds']) - set(BY_KIND)
+        if unknown:
+            raise CommandError(f"Unknown kind(s): {', '.join(sorted(unknown))}")
+        written = rebuild(options['kinds'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Indexed {written} record(s)'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from core.networth import compact, record_all
+
+class Command(BaseCommand):
+    help = "Record today's net-worth point for every user and downsample old points"
+
+    def handle(self, *args, **options):
+        recorded = record_all()
+        compacted = compact()
+        self.stdout.write(self.style.SUCCESS(
+            f'Recorded {recorded} point(s); wrote {compacted} downsampled point(s)'
+        ))
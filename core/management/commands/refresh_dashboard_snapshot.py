@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.stats import refresh_admin_snapshot, snapshot_interval
+
+class Command(BaseCommand):
+    help = 'Rebuild the admin dashboard statistics snapshot, repeatedly or once'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float,
+                            help='Seconds between refreshes (default: DASHBOARD_SNAPSHOT_INTERVAL)')
+        parser.add_argument('--once', action='store_true',
+                            help='Refresh once and exit, e.g. when run from cron')
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or snapshot_interval()
+
+        try:
+            while True:
+                started = time.monotonic()
+                close_old_connections()
+                snapshot = refresh_admin_snapshot()
+                elapsed = time.monotonic() - started
+                self.stdout.write(f'Dashboard snapshot refreshed in {elapsed:.2f}s at {snapshot.computed_at:%H:%M:%S}')
+
+                if options['once']:
+                    break
+                time.sleep(max(0, interval - elapsed))
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping dashboard refresher...')
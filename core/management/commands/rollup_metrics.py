@@ -0,0 +1,32 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.metrics import rollup
+from core.models import DailyMetric
+
+class Command(BaseCommand):
+    help = 'Roll up daily platform metrics for the days since the last run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='First day to roll up (YYYY-MM-DD) when there is no watermark')
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Discard stored metrics and roll up all days again')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('--since must be a date in YYYY-MM-DD format')
+
+        if options['rebuild']:
+            deleted, _ = DailyMetric.objects.all().delete()
+            self.stdout.write(f'Discarded {deleted} stored day(s)')
+
+        days = rollup(since=since)
+        if days:
+            self.stdout.write(self.style.SUCCESS(f'Rolled up {len(days)} day(s), {days[0]} to {days[-1]}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Metrics are up to date'))
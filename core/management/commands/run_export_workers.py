@@ -0,0 +1,73 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.export_worker import init_worker, run_export_job
+from core.jobs import claim_pending_jobs, requeue_stale_jobs
+
+class Command(BaseCommand):
+    help = 'Render queued report exports in a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Number of rendering processes (default: CPU count)')
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds to wait between queue checks when idle')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once the queue is empty instead of polling')
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        poll_interval = options['poll_interval']
+
+        self.requeue_stale()
+        self.stdout.write(f'Starting {workers} export worker(s)...')
+
+        # Spawned workers open their own database connections
+        connections.close_all()
+        context = multiprocessing.get_context('spawn')
+        in_flight = {}
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_worker) as pool:
+            try:
+                next_requeue = time.monotonic() + poll_interval
+                while True:
+                    # Checked whether or not the pool is busy, so a crashed
+                    # worker's job is picked up again while others render
+                    if time.monotonic() >= next_requeue:
+                        self.requeue_stale()
+                        next_requeue = time.monotonic() + poll_interval
+
+                    free_slots = workers - len(in_flight)
+                    if free_slots > 0:
+                        for job_id in claim_pending_jobs(free_slots):
+                            in_flight[pool.submit(run_export_job, job_id)] = job_id
+
+                    if not in_flight:
+                        if options['once']:
+                            break
+                        time.sleep(poll_interval)
+                        continue
+
+                    done, _ = wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job_id = in_flight.pop(future)
+                        try:
+                            status = future.result()
+                        except Exception as e:
+                            self.stdout.write(self.style.ERROR(f'Export job {job_id} crashed: {e}'))
+                        else:
+                            self.stdout.write(f'Export job {job_id} {status}')
+            except KeyboardInterrupt:
+                self.stdout.write('Stopping export workers...')
+
+        self.stdout.write(self.style.SUCCESS('Export workers stopped'))
+
+    def requeue_stale(self):
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f'Requeued {requeued} stale export job(s)')
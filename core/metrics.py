@@ -0,0 +1,203 @@
+"""
+Daily rollup of platform metrics.
+
+rollup_metrics writes one DailyMetric row per completed day, starting after
+the latest day already stored (the watermark), so each run only reads the
+transactional tables for the days it adds. Charts then read a few hundred
+DailyMetric rows instead of scanning users, assets and payments.
+
+Flow figures (new users, revenue) are exact for their day. Stock figures
+(active subscriptions, assets, liabilities) carry forward from the day
+before: rows created during the day are added and rows deactivated during
+it taken away. Nothing records when a row was deactivated, so that is the
+day it was last updated (for a subscription, its end date when it has one);
+a row edited after it was deactivated moves to the later day, and
+hard-deleted rows are never taken away.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from accounts.catalog import get_catalog
+from accounts.models import UserProfile
+from assets.models import Asset
+from billing.models import Payment
+from liabilities.models import Liability
+
+from .models import DailyMetric
+
+# Days shown on the admin growth chart
+CHART_DAYS = 180
+
+
+def day_bounds(day):
+    """Aware datetimes for the start of day and the start of the next day"""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def watermark():
+    """Latest day already rolled up, or None"""
+    return DailyMetric.objects.order_by('-date').values_list('date', flat=True).first()
+
+
+def first_day():
+    """Earliest day with any data to roll up"""
+    joined = User.objects.aggregate(first=Min('date_joined'))['first']
+    return timezone.localtime(joined).date() if joined else None
+
+
+def pending_days(since=None, until=None):
+    """Completed days after the watermark, oldest first"""
+    until = until or timezone.localdate() - timedelta(days=1)
+    last = watermark()
+    start = last + timedelta(days=1) if last else (since or first_day())
+    if since and since > start:
+        start = since
+    if start is None:
+        return []
+    return [start + timedelta(days=n) for n in range((until - start).days + 1)]
+
+
+def local_day(field):
+    """Local calendar day of a datetime field"""
+    return TruncDate(field, tzinfo=timezone.get_current_timezone())
+
+
+def per_day(queryset, day, since, until, group=None, value=None):
+    """
+    Count and summed value of queryset's rows per day before until, grouped
+    by day (and group). With no since, every earlier row is included too.
+    """
+    rows = queryset.annotate(day=day).filter(day__lt=until)
+    if since:
+        rows = rows.filter(day__gte=since)
+    aggregates = {'total': Count('pk')}
+    if value:
+        aggregates['value'] = Sum(value)
+    fields = ['day', group] if group else ['day']
+    return rows.order_by().values(*fields).annotate(**aggregates)
+
+
+def stock_changes():
+    """Rows entering (+1) and leaving (-1) each stock figure, and their day"""
+    return [
+        ('assets', Asset.objects.all(), local_day('created_at'), 1),
+        ('assets', Asset.objects.filter(is_active=False), local_day('updated_at'), -1),
+        ('liabilities', Liability.objects.all(), local_day('created_at'), 1),
+        ('liabilities', Liability.objects.filter(is_active=False), local_day('updated_at'), -1),
+        ('subscriptions', UserProfile.objects.all(), local_day('user__date_joined'), 1),
+        ('subscriptions', UserProfile.objects.filter(subscription_active=False),
+         Coalesce('subscription_end_date', local_day('updated_at')), -1),
+    ]
+
+
+def compute_days(days, previous=None):
+    """
+    Aggregate the metrics for consecutive days into unsaved DailyMetric rows.
+
+    Stock figures start from previous, the stored row for the day before,
+    and each day adds the rows created that day and takes away the rows
+    deactivated that day, so a backfill reads each table once rather than
+    once per day. Without previous, rows from before the first day are
+    folded into it.
+    """
+    first = days[0]
+    since = first if previous else None
+    until = days[-1] + timedelta(days=1)
+    catalog = get_catalog()
+
+    def day_of(row):
+        return max(row['day'], first)
+
+    new_users = defaultdict(dict)
+    rows = per_day(User.objects.all(), local_day('date_joined'), first, until, group='userprofile__bouquet')
+    for row in rows:
+        bouquet = catalog.bouquet(pk=row['userprofile__bouquet'], active=False)
+        name = bouquet.name if bouquet else 'none'
+        counts = new_users[row['day']]
+        counts[name] = counts.get(name, 0) + row['total']
+
+    revenue = {
+        row['day']: row['value']
+        for row in per_day(Payment.objects.filter(status='completed'), local_day('payment_date'),
+                           first, until, value='amount')
+    }
+
+    changes = defaultdict(list)
+    for stock, queryset, day, sign in stock_changes():
+        group = 'asset_type' if stock == 'assets' else None
+        value = {'assets': 'value', 'liabilities': 'amount'}.get(stock)
+        for row in per_day(queryset, day, since, until, group=group, value=value):
+            changes[day_of(row)].append((stock, sign, row))
+
+    assets_by_type = dict(previous.assets_by_type) if previous else {}
+    asset_value = previous.asset_value if previous else Decimal('0')
+    liabilities = previous.liabilities if previous else 0
+    liability_amount = previous.liability_amount if previous else Decimal('0')
+    subscriptions = previous.active_subscriptions if previous else 0
+
+    metrics = []
+    for day in days:
+        for stock, sign, row in changes[day]:
+            if stock == 'assets':
+                assets_by_type[row['asset_type']] = assets_by_type.get(row['asset_type'], 0) + sign * row['total']
+                asset_value += sign * (row['value'] or 0)
+            elif stock == 'liabilities':
+                liabilities += sign * row['total']
+                liability_amount += sign * (row['value'] or 0)
+            else:
+                subscriptions += sign * row['total']
+        assets_by_type = {name: total for name, total in assets_by_type.items() if total}
+        metrics.append(DailyMetric(
+            date=day,
+            new_users=sum(new_users[day].values()),
+            new_users_by_bouquet=new_users[day],
+            active_subscriptions=subscriptions,
+            assets=sum(assets_by_type.values()),
+            assets_by_type=dict(assets_by_type),
+            asset_value=asset_value,
+            liabilities=liabilities,
+            liability_amount=liability_amount,
+            revenue=revenue.get(day) or 0,
+        ))
+    return metrics
+
+
+def rollup(since=None, until=None):
+    """Roll up every pending day, returning the days written"""
+    days = pending_days(since, until)
+    if not days:
+        return days
+    previous = DailyMetric.objects.filter(date=days[0] - timedelta(days=1)).first()
+    metrics = compute_days(days, previous)
+    with transaction.atomic():
+        DailyMetric.objects.filter(date__in=days).delete()
+        DailyMetric.objects.bulk_create(metrics)
+    return days
+
+
+def growth_chart(days=CHART_DAYS):
+    """Series for the admin growth chart, from the rollup table"""
+    since = timezone.localdate() - timedelta(days=days)
+    metrics = DailyMetric.objects.filter(date__gte=since).order_by('date')
+    series = {
+        'labels': [],
+        'new_users': [],
+        'active_subscriptions': [],
+        'assets': [],
+        'revenue': [],
+    }
+    for metric in metrics:
+        series['labels'].append(metric.date.isoformat())
+        series['new_users'].append(metric.new_users)
+        series['active_subscriptions'].append(metric.active_subscriptions)
+        series['assets'].append(metric.assets)
+        series['revenue'].append(float(metric.revenue))
+    return series
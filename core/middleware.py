@@ -0,0 +1,15 @@
+"""
+Middleware for the core app
+"""
+from .audit import buffered
+
+
+class AuditMiddleware:
+    """Collect the audit events of a request and write them in one insert"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with buffered(request):
+            return self.get_response(request)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_export_cache'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='report_type',
+            field=models.CharField(choices=[('assets_pdf', 'Asset Report (PDF)'), ('liabilities_pdf', 'Liability Report (PDF)'), ('beneficiaries_pdf', 'Beneficiaries Report (PDF)'), ('assets_xlsx', 'Asset Report (Excel)'), ('liabilities_xlsx', 'Liability Report (Excel)'), ('businesses_xlsx', 'Business Report (Excel)'), ('professionals_xlsx', 'Professional Contacts Report (Excel)'), ('beneficiaries_xlsx', 'Beneficiaries Report (Excel)')], max_length=30),
+        ),
+    ]
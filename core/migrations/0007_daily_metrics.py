@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_dashboard_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMetric',
+            fields=[
+                ('date', models.DateField(primary_key=True, serialize=False)),
+                ('new_users', models.PositiveIntegerField(default=0)),
+                ('new_users_by_bouquet', models.JSONField(default=dict)),
+                ('active_subscriptions', models.PositiveIntegerField(default=0)),
+                ('assets', models.PositiveIntegerField(default=0)),
+                ('assets_by_type', models.JSONField(default=dict)),
+                ('asset_value', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('liabilities', models.PositiveIntegerField(default=0)),
+                ('liability_amount', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_daily_metrics'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NetWorthPoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('d', 'Day'), ('w', 'Week'), ('m', 'Month'), ('y', 'Year')], default='d', max_length=1)),
+                ('date', models.DateField()),
+                ('source_date', models.DateField(blank=True, null=True)),
+                ('assets', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('liabilities', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='net_worth_points', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['user', 'date'], name='core_networ_user_id_9f053e_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'resolution', 'date'), name='unique_net_worth_point')],
+            },
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# The full-text index over core_searchentry. SQLite gets an FTS5 table that
+# triggers keep in step with the entries; PostgreSQL a generated tsvector
+# column with a GIN index. Other backends search the entries without one.
+FULL_TEXT_INDEX = {
+    'sqlite': [
+        """CREATE VIRTUAL TABLE core_searchentry_fts USING fts5(
+            title, body, content='core_searchentry', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""",
+        """CREATE TRIGGER core_searchentry_fts_insert AFTER INSERT ON core_searchentry BEGIN
+            INSERT INTO core_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+        END""",
+        """CREATE TRIGGER core_searchentry_fts_delete AFTER DELETE ON core_searchentry BEGIN
+            INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        END""",
+        """CREATE TRIGGER core_searchentry_fts_update AFTER UPDATE ON core_searchentry BEGIN
+            INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+            INSERT INTO core_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+        END""",
+    ],
+    'postgresql': [
+        """ALTER TABLE core_searchentry ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')
+        ) STORED""",
+        'CREATE INDEX core_searchentry_vector_idx ON core_searchentry USING gin (search_vector)',
+    ],
+}
+
+DROP_FULL_TEXT_INDEX = {
+    'sqlite': [
+        'DROP TRIGGER core_searchentry_fts_update',
+        'DROP TRIGGER core_searchentry_fts_delete',
+        'DROP TRIGGER core_searchentry_fts_insert',
+        'DROP TABLE core_searchentry_fts',
+    ],
+    'postgresql': [
+        'ALTER TABLE core_searchentry DROP COLUMN search_vector',
+    ],
+}
+
+
+def create_full_text_index(apps, schema_editor):
+    for statement in FULL_TEXT_INDEX.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def drop_full_text_index(apps, schema_editor):
+    for statement in DROP_FULL_TEXT_INDEX.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_audit_events'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'kind'], name='search_entry_user_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='search_entry_object_unique')],
+            },
+        ),
+        migrations.RunPython(create_full_text_index, drop_full_text_index),
+    ]
@@ -0,0 +1,61 @@
+from importlib import import_module
+
+from django.db import migrations
+
+search_entries = import_module('core.migrations.0010_search_entries')
+
+# Puts each entry's user in its full-text index, so a search matches only
+# that user's entries instead of every user's before filtering. SQLite's
+# FTS5 table gains a user_id column to match on; PostgreSQL's tsvector an
+# '@<user id>' lexeme, which no word of a title or body becomes.
+FULL_TEXT_INDEX = {
+    'sqlite': [
+        """CREATE VIRTUAL TABLE core_searchentry_fts USING fts5(
+            title, body, user_id, content='core_searchentry', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""",
+        """CREATE TRIGGER core_searchentry_fts_insert AFTER INSERT ON core_searchentry BEGIN
+            INSERT INTO core_searchentry_fts(rowid, title, body, user_id) VALUES (new.id, new.title, new.body, new.user_id);
+        END""",
+        """CREATE TRIGGER core_searchentry_fts_delete AFTER DELETE ON core_searchentry BEGIN
+            INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, title, body, user_id) VALUES ('delete', old.id, old.title, old.body, old.user_id);
+        END""",
+        """CREATE TRIGGER core_searchentry_fts_update AFTER UPDATE ON core_searchentry BEGIN
+            INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, title, body, user_id) VALUES ('delete', old.id, old.title, old.body, old.user_id);
+            INSERT INTO core_searchentry_fts(rowid, title, body, user_id) VALUES (new.id, new.title, new.body, new.user_id);
+        END""",
+        "INSERT INTO core_searchentry_fts(core_searchentry_fts) VALUES ('rebuild')",
+    ],
+    'postgresql': [
+        """ALTER TABLE core_searchentry ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')
+            || array_to_tsvector(ARRAY['@' || user_id::text])
+        ) STORED""",
+        'CREATE INDEX core_searchentry_vector_idx ON core_searchentry USING gin (search_vector)',
+    ],
+}
+
+
+def run(statements):
+    def apply(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return apply
+
+
+def rebuild_previous(apps, schema_editor):
+    run(search_entries.FULL_TEXT_INDEX)(apps, schema_editor)
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute("INSERT INTO core_searchentry_fts(core_searchentry_fts) VALUES ('rebuild')")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_search_entries'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(search_entries.DROP_FULL_TEXT_INDEX), rebuild_previous),
+        migrations.RunPython(run(FULL_TEXT_INDEX), run(search_entries.DROP_FULL_TEXT_INDEX)),
+    ]
@@ -1,2 +1,216 @@
-from django.db import models
+import uuid
+
+from django.db import NotSupportedError, models
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 # UserProfile model moved to accounts app to avoid conflicts
+
+class DataRevision(models.Model):
+    """Per-user counter bumped whenever exported data changes"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='data_revision')
+    revision = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id} - r{self.revision}"
+
+class ExportJob(models.Model):
+    """Report export rendered in the background by run_export_workers"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    REPORT_TYPES = [
+        ('assets_pdf', 'Asset Report (PDF)'),
+        ('liabilities_pdf', 'Liability Report (PDF)'),
+        ('beneficiaries_pdf', 'Beneficiaries Report (PDF)'),
+        ('assets_xlsx', 'Asset Report (Excel)'),
+        ('liabilities_xlsx', 'Liability Report (Excel)'),
+        ('businesses_xlsx', 'Business Report (Excel)'),
+        ('professionals_xlsx', 'Professional Contacts Report (Excel)'),
+        ('beneficiaries_xlsx', 'Beneficiaries Report (Excel)'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='export_jobs')
+    report_type = models.CharField(max_length=30, choices=REPORT_TYPES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    revision = models.PositiveBigIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.user.username} - {self.report_type} - {self.status}"
+
+    @property
+    def is_finished(self):
+        return self.status in ('done', 'failed')
+
+class DashboardSnapshot(models.Model):
+    """Precomputed dashboard figures, rebuilt by refresh_dashboard_snapshot"""
+    key = models.CharField(max_length=30, primary_key=True)
+    data = models.JSONField(default=dict)
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.key} @ {self.computed_at}"
+
+class DailyMetric(models.Model):
+    """Platform totals for one day, written by rollup_metrics; see core.metrics"""
+    date = models.DateField(primary_key=True)
+    new_users = models.PositiveIntegerField(default=0)
+    new_users_by_bouquet = models.JSONField(default=dict)  # bouquet name -> count
+    active_subscriptions = models.PositiveIntegerField(default=0)
+    assets = models.PositiveIntegerField(default=0)
+    assets_by_type = models.JSONField(default=dict)  # asset_type -> count
+    asset_value = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    liabilities = models.PositiveIntegerField(default=0)
+    liability_amount = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    revenue = models.DecimalField(max_digits=18, decimal_places=2, default=0)  # completed payments
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['date']
+
+    def __str__(self):
+        return f"Metrics {self.date}"
+
+class NetWorthPoint(models.Model):
+    """A user's asset and liability totals at one point; see core.networth"""
+    DAY = 'd'
+    WEEK = 'w'
+    MONTH = 'm'
+    YEAR = 'y'
+    RESOLUTIONS = [
+        (DAY, 'Day'),
+        (WEEK, 'Week'),
+        (MONTH, 'Month'),
+        (YEAR, 'Year'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='net_worth_points')
+    resolution = models.CharField(max_length=1, choices=RESOLUTIONS, default=DAY)
+    date = models.DateField()  # the day, or the first day of the week/month/year
+    source_date = models.DateField(null=True, blank=True)  # day a downsampled value was recorded
+    assets = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    liabilities = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'resolution', 'date'], name='unique_net_worth_point'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.date} ({self.resolution})"
+
+    @property
+    def net_worth(self):
+        return self.assets - self.liabilities
+
+class StoredBlob(models.Model):
+    """Reference-counted file in the content-addressed store; see core.storage"""
+    name = models.CharField(max_length=255, primary_key=True)  # blobs/ab/cd/<sha256><ext>
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount} refs)"
+
+class UploadSession(models.Model):
+    """Chunked, resumable file upload; see core.uploads"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    # Document is created on finalize; attached to this asset when set
+    asset = models.ForeignKey('assets.Asset', on_delete=models.CASCADE, null=True, blank=True)
+    filename = models.CharField(max_length=255)
+    title = models.CharField(max_length=255, blank=True)
+    description = models.TextField(blank=True)
+    size = models.PositiveBigIntegerField()  # declared total, in bytes
+    offset = models.PositiveBigIntegerField(default=0)  # bytes acknowledged so far
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.user.username} - {self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def is_complete(self):
+        return self.offset == self.size
+
+class AuditEventQuerySet(models.QuerySet):
+    """Audit events are written once and never changed"""
+
+    def update(self, **kwargs):
+        raise NotSupportedError("Audit events are append-only")
+
+    def delete(self):
+        raise NotSupportedError("Audit events are append-only; archive them with archive_audit_events")
+
+class AuditEvent(models.Model):
+    """Who did what to which record; written through core.audit"""
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='audit_events')
+    action = models.CharField(max_length=50)  # e.g. verification.approved, document.downloaded
+    subject_type = models.CharField(max_length=100, blank=True)  # app_label.model
+    subject_id = models.CharField(max_length=64, blank=True)
+    detail = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    objects = AuditEventQuerySet.as_manager()
+    # Plain manager for archive_audit_events, the one writer allowed to remove rows
+    archive = models.Manager()
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='audit_time_idx'),
+            models.Index(fields=['actor', 'created_at'], name='audit_actor_idx'),
+            models.Index(fields=['subject_type', 'subject_id', 'created_at'], name='audit_subject_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.created_at:%Y-%m-%d %H:%M} {self.actor_id} {self.action} {self.subject_type}:{self.subject_id}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise NotSupportedError("Audit events are append-only")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise NotSupportedError("Audit events are append-only; archive them with archive_audit_events")
+
+class SearchEntry(models.Model):
+    """Searchable text of one user record; core.search keeps it and its full-text index current"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='search_entries')
+    kind = models.CharField(max_length=20)  # asset, liability, document
+    object_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_entry_object_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'kind'], name='search_entry_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} {self.title}"
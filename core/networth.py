@@ -0,0 +1,172 @@
+"""
+Per-user net-worth history.
+
+Every Asset or Liability write records the owner's totals as today's point,
+so a day holds one point however often the data changes, and
+record_net_worth adds a point for every user once a day. The same command
+compacts old points to a coarser resolution, keeping the last value of each
+period:
+
+    day    points for the last DAILY_DAYS days
+    week   points up to WEEKLY_DAYS old
+    month  points up to MONTHLY_DAYS old
+    year   points up to YEARLY_DAYS old
+
+Year points older than that are dropped, so a user's series holds at most a
+fixed number of points however long their history.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import NetWorthPoint
+
+DAILY_DAYS = 90
+WEEKLY_DAYS = 2 * 365
+MONTHLY_DAYS = 10 * 365
+YEARLY_DAYS = 50 * 365
+
+# Range options for the dashboard chart, in days; None is all history
+RANGES = {
+    '1m': 30,
+    '3m': 90,
+    '1y': 365,
+    '5y': 5 * 365,
+    'all': None,
+}
+RANGE_CHOICES = [('1m', '1M'), ('3m', '3M'), ('1y', '1Y'), ('5y', '5Y'), ('all', 'All')]
+
+
+def user_totals(user_id):
+    """Active asset value and liability amount of one user"""
+    from assets.models import Asset
+    from liabilities.models import Liability
+
+    assets = Asset.objects.filter(user_id=user_id, is_active=True).aggregate(total=Sum('value'))['total']
+    liabilities = Liability.objects.filter(user_id=user_id, is_active=True).aggregate(total=Sum('amount'))['total']
+    return assets or Decimal('0'), liabilities or Decimal('0')
+
+
+def record_point(user_id, day=None):
+    """Store the user's current totals as their point for day (default today)"""
+    assets, liabilities = user_totals(user_id)
+    try:
+        with transaction.atomic():
+            NetWorthPoint.objects.update_or_create(
+                user_id=user_id,
+                resolution=NetWorthPoint.DAY,
+                date=day or timezone.localdate(),
+                defaults={'assets': assets, 'liabilities': liabilities},
+            )
+    except IntegrityError:
+        # The user was deleted along with their assets
+        pass
+
+
+def record_all(day=None):
+    """Record today's point for every user with assets or liabilities"""
+    from assets.models import Asset
+    from liabilities.models import Liability
+
+    day = day or timezone.localdate()
+    totals = {}
+    rows = Asset.objects.filter(is_active=True).order_by().values('user').annotate(total=Sum('value'))
+    for row in rows:
+        totals[row['user']] = [row['total'] or Decimal('0'), Decimal('0')]
+    rows = Liability.objects.filter(is_active=True).order_by().values('user').annotate(total=Sum('amount'))
+    for row in rows:
+        totals.setdefault(row['user'], [Decimal('0'), Decimal('0')])[1] = row['total'] or Decimal('0')
+
+    # Users whose last rows were removed drop to zero rather than keep a stale value
+    for user_id in NetWorthPoint.objects.filter(resolution=NetWorthPoint.DAY).values_list('user', flat=True).distinct():
+        totals.setdefault(user_id, [Decimal('0'), Decimal('0')])
+
+    points = [
+        NetWorthPoint(user_id=user_id, resolution=NetWorthPoint.DAY, date=day, assets=assets, liabilities=liabilities)
+        for user_id, (assets, liabilities) in totals.items()
+    ]
+    with transaction.atomic():
+        NetWorthPoint.objects.filter(resolution=NetWorthPoint.DAY, date=day).delete()
+        NetWorthPoint.objects.bulk_create(points, batch_size=1000)
+    return len(points)
+
+
+def period_start(day, resolution):
+    if resolution == NetWorthPoint.WEEK:
+        return day - timedelta(days=day.weekday())
+    if resolution == NetWorthPoint.MONTH:
+        return day.replace(day=1)
+    return day.replace(month=1, day=1)
+
+
+def _downsample(source, target, cutoff):
+    """Fold source points dated before cutoff into target periods, last value wins"""
+    old = NetWorthPoint.objects.filter(resolution=source, date__lt=cutoff).order_by('user', 'date')
+    merged = {}
+    for point in old.iterator():
+        merged[(point.user_id, period_start(point.date, target))] = point
+
+    if not merged:
+        return 0
+
+    # A later point of the same period may already be stored at target resolution
+    starts = [start for _, start in merged]
+    stored = NetWorthPoint.objects.filter(
+        resolution=target, date__gte=min(starts), date__lte=max(starts), source_date__isnull=False,
+    ).values_list('user', 'date', 'source_date')
+    later = {(user_id, start) for user_id, start, source_date in stored
+             if (user_id, start) in merged and source_date > merged[(user_id, start)].date}
+
+    points = [
+        NetWorthPoint(
+            user_id=user_id,
+            resolution=target,
+            date=start,
+            assets=point.assets,
+            liabilities=point.liabilities,
+            source_date=point.source_date or point.date,
+        )
+        for (user_id, start), point in merged.items()
+        if (user_id, start) not in later
+    ]
+    with transaction.atomic():
+        NetWorthPoint.objects.bulk_create(
+            points,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['user', 'resolution', 'date'],
+            update_fields=['assets', 'liabilities', 'source_date'],
+        )
+        NetWorthPoint.objects.filter(resolution=source, date__lt=cutoff).delete()
+    return len(points)
+
+
+def compact(today=None):
+    """Downsample old points and drop expired ones; returns the number of coarse points written"""
+    today = today or timezone.localdate()
+    written = _downsample(NetWorthPoint.DAY, NetWorthPoint.WEEK, today - timedelta(days=DAILY_DAYS))
+    written += _downsample(NetWorthPoint.WEEK, NetWorthPoint.MONTH, today - timedelta(days=WEEKLY_DAYS))
+    written += _downsample(NetWorthPoint.MONTH, NetWorthPoint.YEAR, today - timedelta(days=MONTHLY_DAYS))
+    NetWorthPoint.objects.filter(resolution=NetWorthPoint.YEAR, date__lt=today - timedelta(days=YEARLY_DAYS)).delete()
+    return written
+
+
+def series(user, range_key='1y'):
+    """Points of the user's net-worth history within a range, oldest first"""
+    days = RANGES.get(range_key, RANGES['1y'])
+    points = NetWorthPoint.objects.filter(user=user)
+    if days is not None:
+        points = points.filter(date__gte=timezone.localdate() - timedelta(days=days))
+    return [
+        {
+            'date': point.date.isoformat(),
+            'resolution': point.resolution,
+            'assets': float(point.assets),
+            'liabilities': float(point.liabilities),
+            'net_worth': float(point.assets - point.liabilities),
+        }
+        for point in points.order_by('date', 'resolution')
+    ]
@@ -0,0 +1,102 @@
+"""
+Keyset pagination.
+
+Pages are cut by the last row seen rather than by OFFSET, so a page is read
+straight from an index on (field, id) however deep into the listing it is.
+The cursor is the (field, id) pair of a page's last or first row, encoded
+for the query string: ?after=<cursor> moves forward, ?before=<cursor> back.
+A cursor that does not decode is treated as the first page.
+"""
+import base64
+import binascii
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+PER_PAGE = 25
+
+
+class KeysetPage:
+    """One page of rows plus the cursors of its neighbours"""
+
+    def __init__(self, items, next_cursor=None, previous_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+def encode_cursor(value, pk):
+    raw = f"{value.isoformat() if hasattr(value, 'isoformat') else value}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(model, field, cursor):
+    """(value, pk) from a cursor, or None if it does not decode"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        value, pk = raw.rsplit('|', 1)
+        return model._meta.get_field(field).to_python(value), int(pk)
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError, ValidationError):
+        return None
+
+
+def _beyond(field, value, pk, descending):
+    """Rows strictly past (value, pk) in the listing's direction"""
+    op = 'lt' if descending else 'gt'
+    return Q(**{f'{field}__{op}': value}) | Q(**{field: value, f'pk__{op}': pk})
+
+
+def keyset_page(queryset, params, field='created_at', descending=True, per_page=PER_PAGE):
+    """
+    The page of queryset selected by the after/before cursor in params,
+    ordered by (field, id), newest first when descending.
+    """
+    model = queryset.model
+    after = params.get('after')
+    before = params.get('before')
+    order = [f'-{field}', '-pk'] if descending else [field, 'pk']
+    reverse = [f'{field}', 'pk'] if descending else [f'-{field}', '-pk']
+
+    position = decode_cursor(model, field, before) if before else None
+    if position:
+        # Walk back from the cursor, then put the rows in listing order
+        rows = list(queryset.filter(_beyond(field, *position, not descending)).order_by(*reverse)[:per_page + 1])
+        has_more = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        return _page(rows, field, previous=has_more, following=True)
+
+    position = decode_cursor(model, field, after) if after else None
+    if position:
+        queryset = queryset.filter(_beyond(field, *position, descending))
+    rows = list(queryset.order_by(*order)[:per_page + 1])
+    has_more = len(rows) > per_page
+    return _page(rows[:per_page], field, previous=bool(position), following=has_more)
+
+
+def _page(rows, field, previous, following):
+    if not rows:
+        return KeysetPage(rows)
+    first, last = rows[0], rows[-1]
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor(getattr(last, field), last.pk) if following else None,
+        previous_cursor=encode_cursor(getattr(first, field), first.pk) if previous else None,
+    )
@@ -0,0 +1,195 @@
+"""
+Thumbnails and previews of uploaded documents.
+
+Renditions are JPEGs rendered on first request and cached in the default
+storage under renditions/. Blob names are content hashes, so every record
+sharing a file also shares its renditions. Images are scaled with Pillow;
+the first page of a PDF is rasterised with pdftoppm (poppler-utils) or,
+if installed, PyMuPDF.
+"""
+import hashlib
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.http import Http404
+from PIL import Image, ImageOps
+
+from .downloads import serve_file
+from .storage import is_blob
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+logger = logging.getLogger(__name__)
+
+RENDITION_DIR = 'renditions'
+
+# Bounding box of each rendition kind, in pixels
+RENDITION_SIZES = {
+    'thumb': (240, 240),
+    'preview': (1200, 1200),
+}
+
+IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'tif', 'tiff'}
+PDF_EXTENSIONS = {'pdf'}
+
+JPEG_QUALITY = 80
+
+# Seconds allowed for rasterising one PDF page
+PDF_TIMEOUT = 30
+
+# Renditions of a record never change, as its file is never replaced
+RENDITION_MAX_AGE = 24 * 60 * 60
+
+
+class StoredFile:
+    """A file in a storage backend, for core.downloads.serve_file"""
+
+    def __init__(self, storage, name):
+        self.storage = storage
+        self.name = name
+
+
+def extension_of(name):
+    return os.path.splitext(name)[1].lstrip('.').lower()
+
+
+def can_render(name):
+    """Whether renditions can be produced for a stored file name"""
+    extension = extension_of(name or '')
+    if extension in IMAGE_EXTENSIONS:
+        return True
+    return extension in PDF_EXTENSIONS and pdf_rasteriser() is not None
+
+
+def pdf_rasteriser():
+    if shutil.which('pdftoppm'):
+        return 'pdftoppm'
+    if fitz is not None:
+        return 'pymupdf'
+    return None
+
+
+def rendition_name(name, kind):
+    """Cache name for a rendition of the stored file name"""
+    if is_blob(name):
+        key = os.path.splitext(os.path.basename(name))[0]
+    else:
+        key = hashlib.sha256(name.encode()).hexdigest()
+    return f'{RENDITION_DIR}/{key[:2]}/{key}-{kind}.jpg'
+
+
+def _local_copy(field_file):
+    """Path to the file on local disk, copying it for remote storages"""
+    try:
+        return field_file.storage.path(field_file.name), False
+    except NotImplementedError:
+        with field_file.storage.open(field_file.name, 'rb') as source:
+            fd, path = tempfile.mkstemp(suffix='.' + extension_of(field_file.name))
+            with os.fdopen(fd, 'wb') as target:
+                shutil.copyfileobj(source, target)
+        return path, True
+
+
+def _rasterise_pdf(path, size):
+    """Render the first page of a PDF as a PIL image no larger than size"""
+    longest = max(size)
+
+    if pdf_rasteriser() == 'pdftoppm':
+        with tempfile.TemporaryDirectory() as directory:
+            root = os.path.join(directory, 'page')
+            subprocess.run(
+                ['pdftoppm', '-f', '1', '-l', '1', '-singlefile', '-jpeg',
+                 '-scale-to', str(longest), path, root],
+                check=True, capture_output=True, timeout=PDF_TIMEOUT,
+            )
+            with Image.open(root + '.jpg') as page:
+                page.load()
+                return page.copy()
+
+    with fitz.open(path) as pdf:
+        page = pdf[0]
+        zoom = longest / max(page.rect.width, page.rect.height)
+        pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        return Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples)
+
+
+def _open_image(path, size):
+    image = Image.open(path)
+    # JPEGs can be decoded directly at a reduced scale
+    image.draft('RGB', size)
+    return ImageOps.exif_transpose(image)
+
+
+def render(field_file, kind):
+    """Render a rendition of field_file as JPEG bytes"""
+    size = RENDITION_SIZES[kind]
+    path, temporary = _local_copy(field_file)
+    try:
+        if extension_of(field_file.name) in PDF_EXTENSIONS:
+            image = _rasterise_pdf(path, size)
+        else:
+            image = _open_image(path, size)
+
+        with image:
+            if image.mode not in ('RGB', 'L'):
+                background = Image.new('RGB', image.size, 'white')
+                rgba = image.convert('RGBA')
+                background.paste(rgba, mask=rgba.getchannel('A'))
+                image = background
+            image.thumbnail(size)
+            output = io.BytesIO()
+            image.convert('RGB').save(output, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+            return output.getvalue()
+    finally:
+        if temporary:
+            os.remove(path)
+
+
+def get_rendition(field_file, kind):
+    """
+    Return the cached rendition of field_file as a StoredFile, rendering it
+    on first use. Returns None if the file cannot be rendered.
+    """
+    if kind not in RENDITION_SIZES or not field_file or not can_render(field_file.name):
+        return None
+
+    name = rendition_name(field_file.name, kind)
+    if default_storage.exists(name):
+        return StoredFile(default_storage, name)
+
+    try:
+        data = render(field_file, kind)
+    except (OSError, ValueError, Image.DecompressionBombError, subprocess.SubprocessError) as e:
+        logger.warning("Could not render %s of %s: %s", kind, field_file.name, e)
+        return None
+
+    # Two requests may render the same file at once; either result will do
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(data))
+    return StoredFile(default_storage, name)
+
+
+def delete_renditions(name):
+    """Remove cached renditions of a stored file that no longer exists"""
+    for kind in RENDITION_SIZES:
+        default_storage.delete(rendition_name(name, kind))
+
+
+def serve_rendition(request, field_file, title, kind):
+    """Inline response with a rendition of field_file, or 404"""
+    rendition = get_rendition(field_file, kind)
+    if rendition is None:
+        raise Http404("No preview available")
+
+    response = serve_file(request, rendition, f'{title or "document"}-{kind}.jpg', as_attachment=False)
+    response['Cache-Control'] = f'private, max-age={RENDITION_MAX_AGE}'
+    return response
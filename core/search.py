@@ -0,0 +1,374 @@
+"""
+Full-text search over users' records.
+
+Every searchable record has one SearchEntry: a title and the rest of its
+text, including an asset's type-specific details. Signals keep the entries
+current (see core.signals), and the database keeps a full-text index over
+them: an FTS5 table on SQLite, a tsvector column with a GIN index on
+PostgreSQL. A search reads that index rather than scanning records with
+LIKE '%term%', so its cost follows the number of matches, not how much text
+users have stored.
+
+search() returns a user's best matches across kinds; grouped() the best
+few of each kind, for the global search and the header's quick search;
+rank() narrows a model queryset, such as a list view's filtered records, to
+its matches in rank order. All attach a SearchHit with the title and a snippet of the
+body, search terms wrapped in <mark>. Each word of the query must match,
+as a prefix, so "zana" finds "Zanaco" and "977 55" finds "+260 977 555111".
+"""
+import re
+
+from django.apps import apps
+from django.db import IntegrityError, connection, models, transaction
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+from django.utils.safestring import mark_safe
+
+from .models import SearchEntry
+
+# Most hits a search returns
+SEARCH_LIMIT = 50
+# Most hits per kind in grouped results
+GROUP_LIMIT = 5
+# Most query words used; more only slow the match down
+MAX_TERMS = 8
+
+# Markers the database puts around matched words, swapped for <mark> after escaping
+START, STOP = '\x02', '\x03'
+
+
+class Searchable:
+    """A model whose records are indexed, and how to read their text"""
+
+    def __init__(self, kind, label, model, url_name, title_field, related=(), loader=None):
+        self.kind = kind
+        self.label = label
+        self.model_label = model
+        self.url_name = url_name
+        self.title_field = title_field
+        # Attributes holding related rows whose text is indexed with the record,
+        # and a function that reads them for a batch of records at once
+        self.related = related
+        self.loader = loader
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def entry(self, instance):
+        """(title, body) to index for instance, or None if it should not be found"""
+        if not getattr(instance, 'is_active', True):
+            return None
+        title = str(getattr(instance, self.title_field) or '')[:255]
+        parts = record_text(instance, skip={self.title_field})
+        for name in self.related:
+            related = getattr(instance, name, None)
+            if related is not None:
+                parts += record_text(related)
+        return title, '\n'.join(parts)
+
+
+SEARCHABLE = [
+    Searchable('asset', 'Assets', 'assets.Asset', 'assets:asset_detail', 'name',
+               related=['detail'], loader='assets.loaders.load_details'),
+    Searchable('liability', 'Liabilities', 'liabilities.Liability', 'liabilities:liability_detail', 'name'),
+    Searchable('document', 'Documents', 'documents.Document', 'documents:document_detail', 'title'),
+    Searchable('business', 'Businesses', 'businesses.Business', 'businesses:business_detail', 'name'),
+    Searchable('professional', 'Professionals', 'professionals.Professional', 'professionals:professional_detail', 'name'),
+    Searchable('beneficiary', 'Beneficiaries', 'beneficiaries.Beneficiary', 'beneficiaries:beneficiary_detail', 'name'),
+]
+
+BY_KIND = {searchable.kind: searchable for searchable in SEARCHABLE}
+
+
+def searchable_for(model):
+    for searchable in SEARCHABLE:
+        if searchable.model_label == model._meta.label:
+            return searchable
+    return None
+
+
+def record_text(instance, skip=()):
+    """The non-empty text fields of a record, choices by their labels"""
+    parts = []
+    for field in instance._meta.concrete_fields:
+        if field.name in skip or not isinstance(field, (models.CharField, models.TextField)):
+            continue
+        value = getattr(instance, f'get_{field.name}_display')() if field.choices else getattr(instance, field.name)
+        if value:
+            parts.append(str(value))
+    return parts
+
+
+def index(instance):
+    """Create, update or drop the search entry for a saved record"""
+    searchable = searchable_for(type(instance))
+    entry = searchable.entry(instance)
+    if entry is None:
+        unindex(instance)
+        return
+    title, body = entry
+    fields = {'user_id': instance.user_id, 'title': title, 'body': body, 'updated_at': timezone.now()}
+    entries = SearchEntry.objects.filter(kind=searchable.kind, object_id=instance.pk)
+    # One UPDATE for the usual case of an entry that already exists
+    if entries.update(**fields):
+        return
+    try:
+        with transaction.atomic():
+            SearchEntry.objects.create(kind=searchable.kind, object_id=instance.pk, **fields)
+    except IntegrityError:
+        entries.update(**fields)
+
+
+def unindex(instance):
+    searchable = searchable_for(type(instance))
+    SearchEntry.objects.filter(kind=searchable.kind, object_id=instance.pk).delete()
+
+
+def rebuild(kinds=None, batch_size=500):
+    """Recreate the entries of the given kinds (all by default); returns how many were written"""
+    written = 0
+    for searchable in SEARCHABLE:
+        if kinds and searchable.kind not in kinds:
+            continue
+        with transaction.atomic():
+            SearchEntry.objects.filter(kind=searchable.kind).delete()
+            last = 0
+            while True:
+                chunk = list(searchable.model.objects.filter(pk__gt=last).order_by('pk')[:batch_size])
+                if not chunk:
+                    break
+                last = chunk[-1].pk
+                if searchable.loader:
+                    chunk = import_string(searchable.loader)(chunk)
+                entries = []
+                for instance in chunk:
+                    entry = searchable.entry(instance)
+                    if entry is not None:
+                        entries.append(SearchEntry(
+                            user_id=instance.user_id, kind=searchable.kind, object_id=instance.pk,
+                            title=entry[0], body=entry[1],
+                        ))
+                written += len(SearchEntry.objects.bulk_create(entries))
+    return written
+
+
+class SearchHit:
+    """One matching record"""
+
+    def __init__(self, kind, object_id, title, snippet, rank):
+        self.kind = kind
+        self.object_id = object_id
+        self.title = highlight(title)
+        self.snippet = highlight(snippet)
+        self.rank = rank
+
+    @property
+    def label(self):
+        return BY_KIND[self.kind].label
+
+    @property
+    def url(self):
+        return reverse(BY_KIND[self.kind].url_name, args=[self.object_id])
+
+
+def highlight(text):
+    return mark_safe(escape(text or '').replace(START, '<mark>').replace(STOP, '</mark>'))
+
+
+def terms(query):
+    """The words of a query, lower-cased, at most MAX_TERMS"""
+    return re.findall(r'\w+', (query or '').lower())[:MAX_TERMS]
+
+
+class FullTextBackend:
+    """
+    A search through the database's full-text index. Subclasses supply the
+    user's matching entry ids with their scores, and the highlighted columns
+    for the rows kept; ranking and capping happen in one statement around
+    them. The user is part of the index query, so other users' entries are
+    never matched or scored.
+    """
+
+    # Join from the matches to their entries; the matches must drive it
+    join = 'JOIN'
+
+    def matches(self, user_id, words):
+        """SELECT of (id, score) for each of the user's matching entries, and its parameters"""
+        raise NotImplementedError
+
+    def highlighted(self, user_id, words):
+        """Columns and FROM clause over the rows kept, as r, and their parameters"""
+        raise NotImplementedError
+
+    def sql(self, user_id, words, kinds, within, limit, per_group=None):
+        """The search statement and its parameters"""
+        matches, params = self.matches(user_id, words)
+        where = ['e.user_id = %s']
+        params.append(user_id)
+        if kinds:
+            where.append(f"e.kind IN ({', '.join(['%s'] * len(kinds))})")
+            params.extend(kinds)
+        if within is not None:
+            subquery, subparams = within.order_by().values('pk').query.sql_with_params()
+            where.append(f'e.object_id IN ({subquery})')
+            params.extend(subparams)
+
+        # Number the matches within each kind, or overall, best first
+        partition = 'PARTITION BY e.kind ' if per_group else ''
+        columns, source, highlight_params = self.highlighted(user_id, words)
+        sql = (
+            f'WITH matches AS ({matches}), ranked AS ('
+            ' SELECT e.id, e.kind, e.object_id, m.score,'
+            f' ROW_NUMBER() OVER ({partition}ORDER BY m.score DESC, e.id DESC) AS position,'
+            ' MAX(m.score) OVER (PARTITION BY e.kind) AS best'
+            f' FROM matches m {self.join} core_searchentry e ON e.id = m.id'
+            f" WHERE {' AND '.join(where)}"
+            '), kept AS (SELECT * FROM ranked WHERE position <= %s)'
+            f' SELECT r.kind, r.object_id, {columns}, r.score {source}'
+            f" ORDER BY {'r.best DESC, r.kind, ' if per_group else ''}r.position"
+        )
+        params += [per_group or limit] + highlight_params
+        return sql, params
+
+    def hits(self, user_id, words, kinds, within, limit, per_group=None):
+        sql, params = self.sql(user_id, words, kinds, within, limit, per_group)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+
+class SqliteBackend(FullTextBackend):
+    """FTS5 MATCH, ranked by bm25 with title matches weighted up"""
+
+    # SQLite keeps the left table of a CROSS JOIN outermost; otherwise it may
+    # walk the user's entries and run the MATCH once for each
+    join = 'CROSS JOIN'
+
+    def match(self, user_id, words):
+        terms = ' AND '.join(f'"{word}"*' for word in words)
+        return f'user_id : "{int(user_id)}" AND {{title body}} : ({terms})'
+
+    def matches(self, user_id, words):
+        sql = (
+            'SELECT rowid AS id, -bm25(core_searchentry_fts, 5.0, 1.0, 0.0) AS score'
+            ' FROM core_searchentry_fts WHERE core_searchentry_fts MATCH %s'
+        )
+        return sql, [self.match(user_id, words)]
+
+    def highlighted(self, user_id, words):
+        # highlight() and snippet() only work in the query doing the MATCH
+        columns = (
+            'highlight(core_searchentry_fts, 0, %s, %s),'
+            ' snippet(core_searchentry_fts, 1, %s, %s, %s, 16)'
+        )
+        source = (
+            'FROM core_searchentry_fts CROSS JOIN kept r ON r.id = core_searchentry_fts.rowid'
+            ' WHERE core_searchentry_fts MATCH %s'
+        )
+        return columns, source, [START, STOP, START, STOP, '…', self.match(user_id, words)]
+
+
+class PostgresBackend(FullTextBackend):
+    """tsvector @@ prefix tsquery, ranked by ts_rank_cd over the weighted vector"""
+
+    def query(self, words):
+        return ' & '.join(f'{word}:*' for word in words)
+
+    def matches(self, user_id, words):
+        # The vector holds an '@<user id>' lexeme, so the GIN index narrows
+        # the match to the user's entries
+        sql = (
+            "SELECT e.id, ts_rank_cd(e.search_vector, to_tsquery('simple', %s)) AS score"
+            " FROM core_searchentry e WHERE e.search_vector @@ (to_tsquery('simple', %s) && %s::tsquery)"
+        )
+        query = self.query(words)
+        return sql, [query, query, f"'@{int(user_id)}'"]
+
+    def highlighted(self, user_id, words):
+        # ts_headline is slow, so it runs only on the rows kept
+        markers = f'StartSel={START}, StopSel={STOP}'
+        columns = (
+            "ts_headline('simple', e.title, to_tsquery('simple', %s), %s),"
+            " ts_headline('simple', e.body, to_tsquery('simple', %s), %s)"
+        )
+        source = 'FROM kept r JOIN core_searchentry e ON e.id = r.id'
+        query = self.query(words)
+        return columns, source, [query, f'{markers}, HighlightAll=true', query, f'{markers}, MaxWords=20, MinWords=8']
+
+
+class ScanBackend:
+    """Other databases: every word in the title or body, newest first, without an index"""
+
+    def hits(self, user_id, words, kinds, within, limit, per_group=None):
+        entries = SearchEntry.objects.filter(user_id=user_id)
+        for word in words:
+            entries = entries.filter(models.Q(title__icontains=word) | models.Q(body__icontains=word))
+        if kinds:
+            entries = entries.filter(kind__in=kinds)
+        if within is not None:
+            entries = entries.filter(object_id__in=within.order_by().values('pk'))
+        if per_group:
+            # Without a score to rank kinds by, groups come in SEARCHABLE order
+            return [
+                (entry.kind, entry.object_id, entry.title, entry.body[:200], 0)
+                for searchable in SEARCHABLE if not kinds or searchable.kind in kinds
+                for entry in entries.filter(kind=searchable.kind).order_by('-updated_at')[:per_group]
+            ]
+        return [
+            (entry.kind, entry.object_id, entry.title, entry.body[:200], 0)
+            for entry in entries.order_by('-updated_at')[:limit]
+        ]
+
+
+BACKENDS = {
+    'sqlite': SqliteBackend,
+    'postgresql': PostgresBackend,
+}
+
+
+def backend():
+    return BACKENDS.get(connection.vendor, ScanBackend)()
+
+
+def _hits(user, query, kinds=None, within=None, limit=SEARCH_LIMIT, per_group=None):
+    words = terms(query)
+    if not words:
+        return []
+    return backend().hits(user.pk, words, kinds, within, limit, per_group)
+
+
+def search(user, query, kinds=None, limit=SEARCH_LIMIT):
+    """The user's best-matching records as SearchHits, best first"""
+    return [SearchHit(*row) for row in _hits(user, query, kinds=kinds, limit=limit)]
+
+
+def grouped(user, query, per_group=GROUP_LIMIT, kinds=None):
+    """
+    The user's best matches of every kind in one query, as (Searchable,
+    [SearchHit]) pairs: at most per_group hits each, best first, and the
+    kind with the best hit first.
+    """
+    groups = {}
+    for row in _hits(user, query, kinds=kinds, per_group=per_group):
+        groups.setdefault(row[0], []).append(SearchHit(*row))
+    return [(BY_KIND[kind], hits) for kind, hits in groups.items()]
+
+
+def rank(queryset, user, query, limit=SEARCH_LIMIT):
+    """
+    The records of queryset that match query, best first, each with a
+    search_hit; queryset's own filters apply inside the search query.
+    """
+    searchable = searchable_for(queryset.model)
+    hits = [SearchHit(*row) for row in _hits(user, query, kinds=[searchable.kind], within=queryset, limit=limit)]
+    records = queryset.in_bulk([hit.object_id for hit in hits])
+    ranked = []
+    for hit in hits:
+        record = records.get(hit.object_id)
+        if record is not None:
+            record.search_hit = hit
+            ranked.append(record)
+    return ranked
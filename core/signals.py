@@ -0,0 +1,158 @@
+"""
+Signal handlers for the core app
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from . import audit, search
+from .export_cache import bump_revision
+from .networth import record_point
+
+# Models whose changes invalidate a user's cached exports
+EXPORTED_MODELS = [
+    'assets.Asset',
+    'liabilities.Liability',
+    'beneficiaries.Beneficiary',
+    'businesses.Business',
+    'professionals.Professional',
+]
+
+# Asset detail tables exported as workbook sheets; they reach the user through the asset
+EXPORTED_ASSET_DETAILS = [
+    'assets.BankAccount',
+    'assets.Insurance',
+    'assets.VillageBankingGroup',
+    'assets.HouseLand',
+    'assets.MotorVehicle',
+    'assets.Project',
+    'assets.GeneralAsset',
+    'assets.TreasuryBond',
+    'assets.IPRights',
+]
+
+# Models whose totals make up a user's net worth
+NET_WORTH_MODELS = [
+    'assets.Asset',
+    'liabilities.Liability',
+]
+
+# Models whose file is held in the content-addressed store
+BLOB_FILE_MODELS = [
+    'documents.Document',
+    'assets.AssetDocument',
+]
+
+# User records whose creation, edits and removal are audited
+AUDITED_MODELS = [
+    'assets.Asset',
+    'assets.AssetDocument',
+    'liabilities.Liability',
+    'beneficiaries.Beneficiary',
+    'businesses.Business',
+    'professionals.Professional',
+    'documents.Document',
+]
+
+# Set while assets.registry.save_asset() writes an asset and its detail row;
+# it bumps the revision and indexes the asset once, after the transaction
+_sync_deferred = ContextVar('sync_deferred', default=False)
+
+
+@contextmanager
+def deferred_sync():
+    """Skip revision bumps and search indexing for the saves in the block"""
+    token = _sync_deferred.set(True)
+    try:
+        yield
+    finally:
+        _sync_deferred.reset(token)
+
+
+def sync_asset(asset):
+    """Bump the owner's export revision and index an asset with its detail row"""
+    with transaction.atomic():
+        bump_revision(asset.user_id)
+        search.index(asset)
+
+
+def bump_export_revision(sender, instance, **kwargs):
+    if not _sync_deferred.get():
+        bump_revision(instance.user_id)
+
+
+def record_net_worth(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: record_point(user_id))
+
+
+def release_blob(sender, instance, **kwargs):
+    """Drop the deleted record's reference to its stored file"""
+    if instance.file:
+        instance.file.delete(save=False)
+
+
+def audit_save(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        audit.record(f"{sender._meta.model_name}.{'created' if created else 'updated'}", instance)
+
+
+def audit_delete(sender, instance, **kwargs):
+    audit.record(f'{sender._meta.model_name}.deleted', instance)
+
+
+def update_search_entry(sender, instance, raw=False, **kwargs):
+    if not raw and not _sync_deferred.get():
+        search.index(instance)
+
+
+def remove_search_entry(sender, instance, **kwargs):
+    search.unindex(instance)
+
+
+def sync_asset_detail(sender, instance, raw=False, **kwargs):
+    """
+    A detail row edited on its own, as in the admin, is exported and indexed
+    with its asset
+    """
+    if raw or _sync_deferred.get():
+        return
+    Asset = apps.get_model('assets.Asset')
+    asset = Asset.objects.filter(pk=instance.asset_id).first()
+    if asset is not None:
+        sync_asset(asset)
+
+
+def connect_signals():
+    for label in EXPORTED_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(bump_export_revision, sender=model, dispatch_uid=f'export_revision_save_{label}')
+        post_delete.connect(bump_export_revision, sender=model, dispatch_uid=f'export_revision_delete_{label}')
+
+    for label in NET_WORTH_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(record_net_worth, sender=model, dispatch_uid=f'net_worth_save_{label}')
+        post_delete.connect(record_net_worth, sender=model, dispatch_uid=f'net_worth_delete_{label}')
+
+    for label in BLOB_FILE_MODELS:
+        model = apps.get_model(label)
+        post_delete.connect(release_blob, sender=model, dispatch_uid=f'release_blob_{label}')
+
+    for label in AUDITED_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(audit_save, sender=model, dispatch_uid=f'audit_save_{label}')
+        post_delete.connect(audit_delete, sender=model, dispatch_uid=f'audit_delete_{label}')
+
+    for searchable in search.SEARCHABLE:
+        model = searchable.model
+        label = searchable.model_label
+        post_save.connect(update_search_entry, sender=model, dispatch_uid=f'search_save_{label}')
+        post_delete.connect(remove_search_entry, sender=model, dispatch_uid=f'search_delete_{label}')
+
+    for label in EXPORTED_ASSET_DETAILS:
+        model = apps.get_model(label)
+        post_save.connect(sync_asset_detail, sender=model, dispatch_uid=f'asset_detail_save_{label}')
+        post_delete.connect(sync_asset_detail, sender=model, dispatch_uid=f'asset_detail_delete_{label}')
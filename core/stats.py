@@ -0,0 +1,119 @@
+"""
+System-wide statistics for the admin dashboard.
+
+The figures are computed with one grouped aggregation over UserProfile plus
+a count each of users and assets, and stored in a DashboardSnapshot row.
+refresh_dashboard_snapshot rebuilds the row every DASHBOARD_SNAPSHOT_INTERVAL
+seconds, so rendering the dashboard reads one row however many profiles and
+assets there are.
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from accounts.catalog import get_catalog
+from accounts.models import UserProfile
+from assets.models import Asset
+
+from .models import DashboardSnapshot
+
+ADMIN_SNAPSHOT = 'admin'
+
+CENTS = Decimal('0.01')
+
+
+def snapshot_interval():
+    return getattr(settings, 'DASHBOARD_SNAPSHOT_INTERVAL', 60)
+
+
+def compute_admin_stats():
+    """Aggregate the admin dashboard figures into a JSON-serialisable dict"""
+    active = Q(subscription_active=True)
+    rows = (
+        UserProfile.objects.order_by()
+        .values('bouquet')
+        .annotate(
+            active_count=Count('pk', filter=active),
+            pending_count=Count('pk', filter=Q(verification_status='pending')),
+            revenue=Coalesce(
+                Sum('bouquet__price', filter=active),
+                Value(Decimal('0')),
+                output_field=DecimalField(max_digits=15, decimal_places=2),
+            ),
+        )
+    )
+
+    bouquets = []
+    active_subscriptions = pending_verifications = 0
+    for row in rows:
+        active_subscriptions += row['active_count']
+        pending_verifications += row['pending_count']
+        if row['bouquet'] is not None:
+            bouquets.append({
+                'bouquet': row['bouquet'],
+                'count': row['active_count'],
+                'revenue': str(row['revenue'].quantize(CENTS)),
+            })
+
+    return {
+        'total_users': User.objects.filter(is_active=True).count(),
+        'total_assets': Asset.objects.filter(is_active=True).count(),
+        'pending_verifications': pending_verifications,
+        'active_subscriptions': active_subscriptions,
+        'bouquets': bouquets,
+    }
+
+
+def refresh_admin_snapshot():
+    """Recompute the admin statistics and store them"""
+    data = compute_admin_stats()
+    snapshot, _ = DashboardSnapshot.objects.update_or_create(
+        key=ADMIN_SNAPSHOT,
+        defaults={'data': data, 'computed_at': timezone.now()},
+    )
+    return snapshot
+
+
+def get_admin_snapshot():
+    """
+    Return the stored admin snapshot, computing it in the request only when
+    there is none yet
+    """
+    snapshot = DashboardSnapshot.objects.filter(key=ADMIN_SNAPSHOT).first()
+    if snapshot is None:
+        snapshot = refresh_admin_snapshot()
+    return snapshot
+
+
+def admin_dashboard_stats():
+    """Template context for the admin dashboard figures"""
+    snapshot = get_admin_snapshot()
+    data = snapshot.data
+    catalog = get_catalog()
+
+    revenue_data = []
+    users_by_bouquet = {}
+    for bouquet in catalog.active_bouquets():
+        row = next((row for row in data['bouquets'] if row['bouquet'] == bouquet.pk), None)
+        count = row['count'] if row else 0
+        revenue_data.append({
+            'bouquet': bouquet,
+            'count': count,
+            'revenue': Decimal(row['revenue']) if row else Decimal('0'),
+        })
+        users_by_bouquet[bouquet.name] = count
+
+    return {
+        'total_users': data['total_users'],
+        'total_assets': data['total_assets'],
+        'pending_verifications': data['pending_verifications'],
+        'active_subscriptions': data['active_subscriptions'],
+        'total_revenue': sum(item['revenue'] for item in revenue_data),
+        'revenue_data': revenue_data,
+        'users_by_bouquet': users_by_bouquet,
+        'stats_computed_at': snapshot.computed_at,
+    }
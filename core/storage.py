@@ -0,0 +1,160 @@
+"""
+Content-addressed, deduplicated storage for uploaded documents.
+
+Files are stored once under blobs/<aa>/<bb>/<sha256><ext>, whatever model
+or upload_to path they were saved through. Every save of a blob adds a
+reference in StoredBlob and every delete drops one; the bytes are removed
+when the last reference goes. Names outside blobs/ (files uploaded before
+the store existed) are handled like plain FileSystemStorage files.
+"""
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.functional import LazyObject
+
+BLOB_DIR = 'blobs'
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+DIGEST_RE = re.compile(r'[0-9a-f]{64}')
+
+
+def blob_name(sha256, filename):
+    """Storage name for content with the given digest and original filename"""
+    extension = os.path.splitext(filename)[1].lower()
+    return f'{BLOB_DIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}'
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(f'{BLOB_DIR}/')
+
+
+def content_digest(content):
+    """
+    sha256 of a File, or the digest the uploader already computed over its
+    bytes. Only core.uploads sets one; anything that is not a well-formed
+    digest is ignored and the content hashed.
+    """
+    digest = getattr(content, 'sha256', None)
+    if isinstance(digest, str) and DIGEST_RE.fullmatch(digest):
+        return digest
+
+    hasher = hashlib.sha256()
+    for chunk in content.chunks(HASH_CHUNK_SIZE):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that stores identical bytes once, reference counted"""
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is derived from the content in _save()
+        return name
+
+    def _save(self, name, content):
+        from .models import StoredBlob
+
+        digest = content_digest(content)
+        name = blob_name(digest, name)
+
+        with transaction.atomic():
+            # Locking the row orders this save against a concurrent delete of
+            # the last reference
+            blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None or not super().exists(name):
+                self._write(name, content)
+
+            if blob is not None:
+                StoredBlob.objects.filter(name=name).update(refcount=F('refcount') + 1)
+            else:
+                try:
+                    with transaction.atomic():
+                        StoredBlob.objects.create(name=name, sha256=digest, size=content.size, refcount=1)
+                except IntegrityError:
+                    StoredBlob.objects.filter(name=name).update(refcount=F('refcount') + 1)
+
+        return name
+
+    def _write(self, name, content):
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+
+        if hasattr(content, 'temporary_file_path'):
+            file_move_safe(content.temporary_file_path(), full_path, allow_overwrite=True)
+        else:
+            # Write beside the target and rename, so a blob is never visible half written
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    for chunk in content.chunks():
+                        f.write(chunk)
+                os.replace(temp_path, full_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
+
+    def add_reference(self, name):
+        """
+        Point another record at an existing blob without writing anything.
+        Returns False if the blob is not in the store.
+        """
+        from .models import StoredBlob
+
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None or not super().exists(name):
+                return False
+            StoredBlob.objects.filter(name=name).update(refcount=F('refcount') + 1)
+        return True
+
+    def delete(self, name):
+        from .renditions import delete_renditions
+
+        if not is_blob(name):
+            super().delete(name)
+            delete_renditions(name)
+            return
+
+        from .models import StoredBlob
+
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None:
+                return
+            if blob.refcount > 1:
+                StoredBlob.objects.filter(name=name).update(refcount=F('refcount') - 1)
+                return
+            blob.delete()
+
+            def remove_file():
+                # A save may have re-created the blob since the delete committed
+                if not StoredBlob.objects.filter(name=name).exists():
+                    super(ContentAddressedStorage, self).delete(name)
+                    delete_renditions(name)
+
+            transaction.on_commit(remove_file)
+
+
+class BlobStorage(LazyObject):
+    def _setup(self):
+        self._wrapped = ContentAddressedStorage()
+
+
+blob_storage = BlobStorage()
+
+
+def get_blob_storage():
+    """Storage callable for FileFields, kept out of migrations"""
+    return blob_storage
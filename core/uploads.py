@@ -0,0 +1,292 @@
+"""
+Chunked, resumable uploads for documents and asset documents.
+
+The protocol has three steps:
+
+1. init: POST the filename, total size and document fields; an
+   UploadSession is created and its id returned.
+2. append: PUT raw bytes to the session with an Upload-Offset header equal
+   to the bytes acknowledged so far. A mismatched offset is rejected with
+   409 and the current offset, so an interrupted client resumes from there.
+3. finalize: once every byte is acknowledged the staged file is moved into
+   place and the Document or AssetDocument is created.
+
+Chunks are appended to a staging file under MEDIA_ROOT and never held in
+memory as a whole. A client that sends the file's sha256 with init skips
+the transfer entirely when the user already has that content stored.
+"""
+import hashlib
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .models import StoredBlob, UploadSession
+from .storage import blob_name, blob_storage
+
+# Bytes read from the request body per write to the staging file
+READ_SIZE = 64 * 1024
+
+STAGING_DIR = 'upload_sessions'
+
+# Running sha256 of each session this process has seen every chunk of, keyed
+# by session id as (offset, hasher, last used). Sessions whose chunks were
+# spread over several processes are hashed from the staging file on finalize
+# instead.
+_hashers = {}
+
+
+class UploadError(Exception):
+    """Raised when a chunk or finalize request cannot be accepted"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class StagedFile(File):
+    """Staging file the storage backend can move into place rather than copy"""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def staging_path(session):
+    return default_storage.path(os.path.join(STAGING_DIR, f'{session.pk}.part'))
+
+
+def chunk_size():
+    return getattr(settings, 'UPLOAD_CHUNK_SIZE', 2 * 1024 * 1024)
+
+
+def max_upload_size():
+    return getattr(settings, 'UPLOAD_MAX_FILE_SIZE', 200 * 1024 * 1024)
+
+
+def start_upload(user, filename, size, title='', description='', asset=None):
+    """Create an upload session and its empty staging file"""
+    filename = os.path.basename(filename or '').strip()
+    if not filename:
+        raise UploadError('A filename is required.')
+    if size <= 0:
+        raise UploadError('The file is empty.')
+    if size > max_upload_size():
+        raise UploadError('The file is too large.', status=413)
+
+    session = UploadSession.objects.create(
+        user=user,
+        asset=asset,
+        filename=filename[:255],
+        title=title[:255],
+        description=description,
+        size=size,
+    )
+    path = staging_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    forget_idle_hashers()
+    _hashers[session.pk] = (0, hashlib.sha256(), time.monotonic())
+    return session
+
+
+def session_max_age():
+    return timedelta(seconds=getattr(settings, 'UPLOAD_SESSION_MAX_AGE', 24 * 60 * 60))
+
+
+def forget_idle_hashers():
+    """
+    Drop running hashes of sessions this process has not seen a chunk of
+    within the session max age. Abandoned sessions are discarded by
+    clear_upload_sessions in another process, which cannot reach this cache.
+    """
+    cutoff = time.monotonic() - session_max_age().total_seconds()
+    for pk, (_, _, last_used) in list(_hashers.items()):
+        if last_used < cutoff:
+            _hashers.pop(pk, None)
+
+
+def append_chunk(session, offset, stream, length):
+    """
+    Append length bytes read from stream at offset, returning the new offset.
+    The session row is locked so concurrent retries of the same chunk cannot
+    both be applied.
+    """
+    if length <= 0:
+        raise UploadError('The chunk is empty.')
+    if length > chunk_size():
+        raise UploadError('The chunk is too large.', status=413)
+
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if offset != session.offset:
+            raise UploadError('Offset does not match the uploaded data.', status=409)
+        if offset + length > session.size:
+            raise UploadError('The chunk extends past the declared file size.')
+
+        # Hash into a copy, so a chunk that stops part-way leaves the cached
+        # hash at the acknowledged offset for the retry
+        cached = _hashers.get(session.pk)
+        hasher = cached[1].copy() if cached and cached[0] == offset else None
+
+        with open(staging_path(session), 'r+b') as staged:
+            # Bytes past the acknowledged offset belong to a chunk that never
+            # completed; overwrite them
+            staged.seek(offset)
+            remaining = length
+            while remaining > 0:
+                data = stream.read(min(READ_SIZE, remaining))
+                if not data:
+                    raise UploadError('The chunk ended before Content-Length bytes were received.')
+                staged.write(data)
+                if hasher is not None:
+                    hasher.update(data)
+                remaining -= len(data)
+            staged.truncate()
+
+        session.offset = offset + length
+        session.save(update_fields=['offset', 'updated_at'])
+
+    if hasher is not None:
+        _hashers[session.pk] = (session.offset, hasher, time.monotonic())
+    else:
+        _hashers.pop(session.pk, None)
+    return session.offset
+
+
+def upload_digest(session):
+    """
+    Return the sha256 of the staged file. The running hash is reused only
+    when it took in every byte of the complete file; otherwise the staged
+    file is read and hashed.
+    """
+    path = staging_path(session)
+    cached = _hashers.pop(session.pk, None)
+    if cached and cached[0] == session.offset == session.size == os.path.getsize(path):
+        return cached[1].hexdigest()
+
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as staged:
+        for data in iter(lambda: staged.read(READ_SIZE), b''):
+            hasher.update(data)
+    return hasher.hexdigest()
+
+
+def build_document(user_id, asset_id, filename, title, description, size):
+    """Unsaved Document, or AssetDocument when asset_id is set, for an upload"""
+    from assets.models import AssetDocument
+    from documents.models import Document
+
+    extension = os.path.splitext(filename)[1].lstrip('.').lower()
+    title = title or os.path.splitext(filename)[0]
+
+    if asset_id:
+        return AssetDocument(
+            asset_id=asset_id,
+            title=title,
+            description=description,
+            file_type=extension[:10],
+            file_size=size,
+        )
+    return Document(
+        user_id=user_id,
+        title=title,
+        description=description,
+        file_type=extension if extension in dict(Document.FILE_TYPES) else 'other',
+        file_size=size,
+    )
+
+
+def reuse_known_blob(user, filename, sha256, title='', description='', asset=None):
+    """
+    Create the document straight from a stored blob the user already has,
+    without receiving or writing any bytes. Returns None when the content is
+    not known, in which case the client uploads it as usual.
+
+    Only the user's own files are matched: knowing a digest must not grant
+    access to another user's content.
+    """
+    from assets.models import AssetDocument
+    from documents.models import Document
+
+    sha256 = (sha256 or '').lower()
+    if len(sha256) != 64:
+        return None
+
+    name = blob_name(sha256, filename)
+    owned = (
+        Document.objects.filter(user=user, file=name).exists()
+        or AssetDocument.objects.filter(asset__user=user, file=name).exists()
+    )
+    if not owned:
+        return None
+
+    with transaction.atomic():
+        if not blob_storage.add_reference(name):
+            return None
+        size = StoredBlob.objects.filter(name=name).values_list('size', flat=True).first()
+        document = build_document(
+            user.pk, asset.pk if asset else None, filename, title, description, size
+        )
+        document.file.name = name
+        document.save()
+    return document
+
+
+def finish_upload(session, checksum=''):
+    """
+    Turn a complete session into a Document or AssetDocument. Returns the
+    created object and the sha256 of its contents.
+    """
+    if not session.is_complete:
+        raise UploadError('The upload is incomplete.', status=409)
+
+    digest = upload_digest(session)
+    if checksum and checksum.lower() != digest:
+        raise UploadError('Checksum mismatch; the file was corrupted in transit.', status=422)
+
+    path = staging_path(session)
+    with transaction.atomic(), StagedFile(open(path, 'rb'), name=session.filename) as staged:
+        # Computed over the staged bytes above; saves the blob store from
+        # hashing the file a second time
+        staged.sha256 = digest
+        document = build_document(
+            session.user_id, session.asset_id, session.filename,
+            session.title, session.description, session.size,
+        )
+        document.file.save(session.filename, staged, save=False)
+        document.save()
+        session.delete()
+
+    # Left behind when identical content was already stored
+    if os.path.exists(path):
+        os.remove(path)
+
+    return document, digest
+
+
+def discard_upload(session):
+    """Delete a session and its staging file"""
+    _hashers.pop(session.pk, None)
+    try:
+        os.remove(staging_path(session))
+    except FileNotFoundError:
+        pass
+    session.delete()
+
+
+def clear_stale_uploads(max_age=None):
+    """Discard sessions that have not received a chunk within max_age"""
+    if max_age is None:
+        max_age = session_max_age()
+    cutoff = timezone.now() - max_age
+    stale = UploadSession.objects.filter(updated_at__lt=cutoff)
+    count = 0
+    for session in stale.iterator():
+        discard_upload(session)
+        count += 1
+    return count
@@ -9,4 +9,10 @@ urlpatterns = [
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
     path('register/', views.register_view, name='register'),
+    path('api/net-worth/', views.net_worth_history, name='net_worth_history'),
+    path('search/', views.global_search, name='search'),
+    path('search/quick/', views.quick_search, name='quick_search'),
+    path('audit/', views.audit_log, name='audit_log'),
+    path('exports/<int:pk>/', views.export_job_detail, name='export_job_detail'),
+    path('exports/<int:pk>/download/', views.export_job_download, name='export_job_download'),
 ]
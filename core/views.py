@@ -1,4 +1,8 @@
-from django.shortcuts import render, redirect
+from datetime import date, timedelta
+from urllib.parse import urlencode
+
+from django.shortcuts import render, redirect, get_object_or_404
+from django.http import JsonResponse
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
@@ -7,47 +11,44 @@ from django.contrib.auth.models import User
 from assets.models import Asset
 from liabilities.models import Liability
 from documents.models import Document
-from accounts.models import UserProfile, Bouquet, UserRole
+from verification import queue as verification_queue
+from accounts.catalog import get_catalog
+from accounts.models import UserProfile
+from accounts.permissions import CAN_MAINTAIN_AUDIT_LOG, get_profile, has_perm
+from . import audit, export_cache, networth, search
+from .jobs import queue_export, report_filename
+from .metrics import day_bounds, growth_chart
+from .models import ExportJob
+from .pagination import keyset_page
+from .stats import admin_dashboard_stats
 
 def dashboard(request):
     """Main dashboard view - routes to role-specific dashboards"""
     if not request.user.is_authenticated:
         return redirect('accounts:login')
 
-    try:
-        profile = request.user.userprofile
-    except UserProfile.DoesNotExist:
+    catalog = get_catalog()
+    profile = get_profile(request.user)
+    if profile is None:
         # Handle profile creation for users who don't have one
         if request.user.is_superuser:
-            try:
-                # Assign superadmin role to superusers
-                admin_role = UserRole.objects.get(role_type='admin', sub_role='super_admin', is_active=True)
-                profile = UserProfile.objects.create(user=request.user, role=admin_role)
-            except UserRole.DoesNotExist:
-                profile = UserProfile.objects.create(user=request.user)
+            # Assign superadmin role to superusers
+            admin_role = catalog.role_of_type('admin', 'super_admin')
+            profile = UserProfile.objects.create(user=request.user, role=admin_role)
         else:
             # Create a default profile with standard role for users who don't have one
-            try:
-                # Try to get a basic standard role
-                standard_role = UserRole.objects.filter(role_type='standard', is_active=True).first()
-                blue_bouquet = Bouquet.objects.filter(name='blue', is_active=True).first()
-                profile = UserProfile.objects.create(
-                    user=request.user,
-                    role=standard_role,
-                    bouquet=blue_bouquet
-                )
-            except Exception:
-                # Fallback: create profile without role/bouquet if defaults don't exist
-                profile = UserProfile.objects.create(user=request.user)
+            profile = UserProfile.objects.create(
+                user=request.user,
+                role=catalog.default_role(),
+                bouquet=catalog.default_bouquet()
+            )
 
     # Ensure superusers have admin role
     if request.user.is_superuser and not profile.is_admin:
-        try:
-            admin_role = UserRole.objects.get(role_type='admin', sub_role='super_admin', is_active=True)
+        admin_role = catalog.role_of_type('admin', 'super_admin')
+        if admin_role:
             profile.role = admin_role
             profile.save()
-        except UserRole.DoesNotExist:
-            pass
 
     # Route to appropriate dashboard based on role
     if profile.is_admin:
@@ -100,6 +101,7 @@ def standard_user_dashboard(request):
         "net_worth": net_worth,
         "total_documents": total_documents,
         "recent_assets": recent_assets,
+        "net_worth_ranges": networth.RANGE_CHOICES,
         "user": user,
         "profile": profile,
         "dashboard_type": "standard",
@@ -110,47 +112,18 @@ def admin_dashboard(request):
     """Admin dashboard with system-wide statistics"""
     profile = request.user.userprofile
     
-    # System-wide statistics
-    total_users = User.objects.filter(is_active=True).count()
-    total_assets = Asset.objects.filter(is_active=True).count()
-    pending_verifications = UserProfile.objects.filter(verification_status='pending').count()
-    active_subscriptions = UserProfile.objects.filter(subscription_active=True).count()
-    
-    # Revenue calculation (simplified)
-    revenue_data = []
-    for bouquet in Bouquet.objects.filter(is_active=True):
-        count = UserProfile.objects.filter(bouquet=bouquet, subscription_active=True).count()
-        revenue = count * bouquet.price
-        revenue_data.append({
-            'bouquet': bouquet,
-            'count': count,
-            'revenue': revenue
-        })
-    
-    total_revenue = sum(item['revenue'] for item in revenue_data)
-    
     # Recent user registrations
     recent_users = User.objects.filter(is_active=True).order_by('-date_joined')[:10]
     
-    # Users by bouquet
-    users_by_bouquet = {}
-    for bouquet in Bouquet.objects.filter(is_active=True):
-        users_by_bouquet[bouquet.name] = UserProfile.objects.filter(
-            bouquet=bouquet, subscription_active=True
-        ).count()
-    
     # Recent assets across all users
     recent_assets = Asset.objects.filter(is_active=True).order_by('-created_at')[:10]
 
     context = {
-        'total_users': total_users,
-        'total_assets': total_assets,
-        'pending_verifications': pending_verifications,
-        'active_subscriptions': active_subscriptions,
-        'total_revenue': total_revenue,
-        'revenue_data': revenue_data,
+        # System-wide statistics, from the periodically refreshed snapshot
+        **admin_dashboard_stats(),
+        # History from the daily rollup table
+        'growth_chart': growth_chart(),
         'recent_users': recent_users,
-        'users_by_bouquet': users_by_bouquet,
         'recent_assets': recent_assets,
         'user': request.user,
         'profile': profile,
@@ -170,14 +143,18 @@ def verifier_dashboard(request):
     # Recent pending verifications
     recent_pending = UserProfile.objects.filter(
         verification_status='pending'
-    ).order_by('-created_at')[:10]
+    ).select_related('user', 'bouquet').order_by('-created_at')[:10]
     
     # Recent verification history
     recent_verifications = UserProfile.objects.filter(
         verification_status__in=['approved', 'rejected']
-    ).order_by('-updated_at')[:10]
+    ).select_related('user').order_by('-updated_at')[:10]
 
     context = {
+        # Document review queue
+        'queue_claimed': verification_queue.claimed(request.user).count(),
+        'queue_available': verification_queue.waiting(request.user),
+        'queue_cap': verification_queue.WAITING_CAP,
         'pending_verifications': pending_verifications,
         'approved_verifications': approved_verifications,
         'rejected_verifications': rejected_verifications,
@@ -225,3 +202,93 @@ def register_view(request):
         return redirect('accounts:login')
 
     return render(request, 'accounts/register.html')
+
+@login_required
+def net_worth_history(request):
+    """Net-worth series for the dashboard chart, as JSON"""
+    range_key = request.GET.get('range', '1y')
+    if range_key not in networth.RANGES:
+        range_key = '1y'
+    return JsonResponse({'range': range_key, 'points': networth.series(request.user, range_key)})
+
+@login_required
+def export_job_detail(request, pk):
+    """Status page for a queued report export"""
+    job = get_object_or_404(ExportJob, pk=pk, user=request.user)
+
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        return JsonResponse({'status': job.status, 'finished': job.is_finished})
+
+    return render(request, 'core/export_job_detail.html', {'job': job})
+
+@login_required
+def export_job_download(request, pk):
+    """Download the file produced by a finished export job"""
+    job = get_object_or_404(ExportJob, pk=pk, user=request.user, status='done')
+    response = export_cache.cached_response(
+        request, job.report_type, job.revision, report_filename(job.report_type, request.user)
+    )
+    if response is None:
+        # The cached file was evicted; render it again
+        return queue_export(request, job.report_type)
+    audit.record('exportjob.downloaded', job, report_type=job.report_type)
+    return response
+
+@login_required
+def audit_log(request):
+    """Audit events, filtered by actor, subject and time range"""
+    if not has_perm(request.user, CAN_MAINTAIN_AUDIT_LOG):
+        messages.error(request, 'Access denied')
+        return redirect('core:dashboard')
+
+    filters = {key: request.GET.get(key, '').strip() for key in ('actor', 'subject', 'subject_id', 'action', 'since', 'until')}
+    actor = None
+    if filters['actor']:
+        actor = User.objects.filter(username=filters['actor']).first()
+        if actor is None:
+            messages.error(request, f"No user named {filters['actor']}.")
+
+    def day_start(value, days=0):
+        try:
+            return day_bounds(date.fromisoformat(value) + timedelta(days=days))[0]
+        except ValueError:
+            return None
+
+    events = audit.events(
+        actor=actor,
+        subject=filters['subject'] or None,
+        subject_id=filters['subject_id'] or None,
+        since=day_start(filters['since']),
+        until=day_start(filters['until'], days=1),
+        action=filters['action'],
+    )
+    if filters['actor'] and actor is None:
+        events = events.none()
+
+    page = keyset_page(events, request.GET, per_page=50)
+    query = urlencode({key: value for key, value in filters.items() if value})
+    return render(request, 'core/audit_log.html', {'page': page, 'filters': filters, 'query': query})
+
+@login_required
+def global_search(request):
+    """The user's best matches in every module, grouped by type"""
+    query = request.GET.get('q', '').strip()
+    groups = search.grouped(request.user, query) if query else []
+    return render(request, 'core/search.html', {'query': query, 'groups': groups})
+
+@login_required
+def quick_search(request):
+    """Top few matches of each type for the header search box, as JSON"""
+    query = request.GET.get('q', '').strip()
+    groups = search.grouped(request.user, query, per_group=3) if query else []
+    return JsonResponse({
+        'query': query,
+        'groups': [
+            {
+                'kind': searchable.kind,
+                'label': searchable.label,
+                'hits': [{'title': hit.title, 'snippet': hit.snippet, 'url': hit.url} for hit in hits],
+            }
+            for searchable, hits in groups
+        ],
+    })
@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
+from core.renditions import can_render
+from core.storage import get_blob_storage
 
 class Document(models.Model):
     """Document management model"""
@@ -19,7 +21,7 @@ class Document(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
-    file = models.FileField(upload_to='documents/')
+    file = models.FileField(upload_to='documents/', storage=get_blob_storage)
     file_type = models.CharField(max_length=10, choices=FILE_TYPES)
     file_size = models.IntegerField()  # in bytes
     is_public = models.BooleanField(default=False)
@@ -28,6 +30,13 @@ class Document(models.Model):
 
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [
+            models.Index(fields=['user', '-uploaded_at'], name='document_user_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.title}"
+
+    @property
+    def has_preview(self):
+        return can_render(self.file.name)
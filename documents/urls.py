@@ -8,6 +8,10 @@ urlpatterns = [
     path('upload/', views.document_upload, name='document_upload'),
     path('<int:pk>/', views.document_detail, name='document_detail'),
     path('<int:pk>/download/', views.document_download, name='document_download'),
+    path('<int:pk>/preview/<str:kind>/', views.document_preview, name='document_preview'),
     path('<int:pk>/delete/', views.document_delete, name='document_delete'),
     path('bulk-download/', views.bulk_download, name='bulk_download'),
+    path('uploads/', views.upload_init, name='upload_init'),
+    path('uploads/<uuid:pk>/', views.upload_chunk, name='upload_chunk'),
+    path('uploads/<uuid:pk>/finalize/', views.upload_finalize, name='upload_finalize'),
 ]
@@ -1,8 +1,21 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponse, Http404
+from django.http import HttpResponse, Http404, JsonResponse, StreamingHttpResponse
 from django.conf import settings
+from django.db.models import Count, Sum
+from django.urls import reverse
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods, require_POST
+import os
+
+from assets.models import Asset, AssetDocument
+from core import uploads
+from core import audit
+from core.downloads import download_name, serve_file, stream_zip
+from core.search import rank
+from core.models import UploadSession
+from core.renditions import serve_rendition
 
 from .models import Document
 
@@ -10,15 +23,34 @@ from .models import Document
 def document_list(request):
     """List all documents for the current user"""
     documents = Document.objects.filter(user=request.user)
-    return render(request, 'documents/document_list.html', {'documents': documents})
+    search = request.GET.get('search')
+    if search:
+        documents = rank(documents, request.user, search)
+    return render(request, 'documents/document_list.html', {'documents': documents, 'search': search})
 
 @login_required
 def document_upload(request):
     """Upload a new document"""
     if request.method == 'POST':
-        messages.success(request, 'Document uploaded successfully!')
-        return redirect('documents:document_list')
-    return render(request, 'documents/document_upload.html')
+        # Fallback for browsers without JavaScript; larger files go through
+        # the chunked upload endpoints below
+        uploaded = request.FILES.get('file')
+        if uploaded:
+            extension = os.path.splitext(uploaded.name)[1].lstrip('.').lower()
+            Document.objects.create(
+                user=request.user,
+                title=request.POST.get('title') or os.path.splitext(uploaded.name)[0],
+                description=request.POST.get('description', ''),
+                file=uploaded,
+                file_type=extension if extension in dict(Document.FILE_TYPES) else 'other',
+                file_size=uploaded.size,
+            )
+            messages.success(request, 'Document uploaded successfully!')
+            return redirect('documents:document_list')
+        messages.error(request, 'Please choose a file to upload.')
+    return render(request, 'documents/document_upload.html', {
+        'chunk_size': uploads.chunk_size(),
+    })
 
 @login_required
 def document_detail(request, pk):
@@ -30,12 +62,14 @@ def document_detail(request, pk):
 def document_download(request, pk):
     """Download document"""
     document = get_object_or_404(Document, pk=pk, user=request.user)
-    try:
-        response = HttpResponse(document.file, content_type='application/octet-stream')
-        response['Content-Disposition'] = f'attachment; filename="{document.file.name}"'
-        return response
-    except FileNotFoundError:
-        raise Http404("Document not found")
+    audit.record('document.downloaded', document)
+    return serve_file(request, document.file, download_name(document.title, document.file.name))
+
+@login_required
+def document_preview(request, pk, kind):
+    """Thumbnail or preview image of a document"""
+    document = get_object_or_404(Document, pk=pk, user=request.user)
+    return serve_rendition(request, document.file, document.title, kind)
 
 @login_required
 def document_delete(request, pk):
@@ -45,7 +79,142 @@ def document_delete(request, pk):
     messages.success(request, 'Document deleted successfully!')
     return redirect('documents:document_list')
 
+def archive_entries(user):
+    """Yield (arcname, file, modified) for every document the user owns"""
+    documents = Document.objects.filter(user=user).only('title', 'file', 'uploaded_at').order_by('pk')
+    for document in documents.iterator(chunk_size=500):
+        yield (
+            f'documents/{download_name(document.title, document.file.name)}',
+            document.file,
+            timezone.localtime(document.uploaded_at),
+        )
+
+    asset_documents = (
+        AssetDocument.objects.filter(asset__user=user)
+        .select_related('asset')
+        .only('title', 'file', 'upload_date', 'asset__name')
+        .order_by('asset__name', 'pk')
+    )
+    for document in asset_documents.iterator(chunk_size=500):
+        folder = document.asset.name.replace('/', '-')
+        yield (
+            f'assets/{folder}/{download_name(document.title, document.file.name)}',
+            document.file,
+            timezone.localtime(document.upload_date),
+        )
+
 @login_required
 def bulk_download(request):
     """Bulk download documents"""
-    return render(request, 'documents/bulk_download.html')
+    if request.GET.get('download'):
+        filename = f'benesafe_documents_{timezone.localdate():%Y%m%d}.zip'
+        audit.record('document.bulk_downloaded', Document)
+        response = StreamingHttpResponse(stream_zip(archive_entries(request.user)), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    documents = Document.objects.filter(user=request.user).aggregate(count=Count('pk'), size=Sum('file_size'))
+    asset_documents = AssetDocument.objects.filter(asset__user=request.user).aggregate(
+        count=Count('pk'), size=Sum('file_size')
+    )
+    context = {
+        'document_count': documents['count'],
+        'asset_document_count': asset_documents['count'],
+        'total_size': (documents['size'] or 0) + (asset_documents['size'] or 0),
+    }
+    return render(request, 'documents/bulk_download.html', context)
+
+def upload_state(session):
+    return {
+        'id': str(session.pk),
+        'offset': session.offset,
+        'size': session.size,
+        'chunk_size': uploads.chunk_size(),
+        'upload_url': reverse('documents:upload_chunk', args=[session.pk]),
+        'finalize_url': reverse('documents:upload_finalize', args=[session.pk]),
+    }
+
+def finished_upload(document):
+    if isinstance(document, AssetDocument):
+        redirect_url = reverse('assets:asset_documents', args=[document.asset_id])
+    else:
+        redirect_url = reverse('documents:document_detail', args=[document.pk])
+    return {'id': document.pk, 'redirect': redirect_url}
+
+@login_required
+@require_POST
+def upload_init(request):
+    """Start a chunked upload"""
+    asset = None
+    if request.POST.get('asset'):
+        asset = get_object_or_404(Asset, pk=request.POST['asset'], user=request.user)
+
+    try:
+        size = int(request.POST.get('size', ''))
+    except ValueError:
+        return JsonResponse({'error': 'A file size is required.'}, status=400)
+
+    document = uploads.reuse_known_blob(
+        request.user,
+        os.path.basename(request.POST.get('filename', '')),
+        request.POST.get('sha256'),
+        title=request.POST.get('title', ''),
+        description=request.POST.get('description', ''),
+        asset=asset,
+    )
+    if document is not None:
+        messages.success(request, 'Document uploaded successfully!')
+        return JsonResponse({'complete': True, **finished_upload(document)}, status=201)
+
+    try:
+        session = uploads.start_upload(
+            request.user,
+            request.POST.get('filename'),
+            size,
+            title=request.POST.get('title', ''),
+            description=request.POST.get('description', ''),
+            asset=asset,
+        )
+    except uploads.UploadError as e:
+        return JsonResponse({'error': str(e)}, status=e.status)
+
+    return JsonResponse(upload_state(session), status=201)
+
+@login_required
+@require_http_methods(['GET', 'PUT', 'DELETE'])
+def upload_chunk(request, pk):
+    """Report progress of, append a chunk to, or cancel a chunked upload"""
+    session = get_object_or_404(UploadSession, pk=pk, user=request.user)
+
+    if request.method == 'DELETE':
+        uploads.discard_upload(session)
+        return JsonResponse({'deleted': True})
+
+    if request.method == 'PUT':
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.headers.get('Content-Length', ''))
+        except ValueError:
+            return JsonResponse({'error': 'Upload-Offset and Content-Length headers are required.'}, status=400)
+
+        try:
+            session.offset = uploads.append_chunk(session, offset, request, length)
+        except uploads.UploadError as e:
+            session.refresh_from_db(fields=['offset'])
+            return JsonResponse({'error': str(e), **upload_state(session)}, status=e.status)
+
+    return JsonResponse(upload_state(session))
+
+@login_required
+@require_POST
+def upload_finalize(request, pk):
+    """Create the document once every chunk has been received"""
+    session = get_object_or_404(UploadSession, pk=pk, user=request.user)
+
+    try:
+        document, digest = uploads.finish_upload(session, request.POST.get('sha256', ''))
+    except uploads.UploadError as e:
+        return JsonResponse({'error': str(e), **upload_state(session)}, status=e.status)
+
+    messages.success(request, 'Document uploaded successfully!')
+    return JsonResponse({'sha256': digest, **finished_upload(document)})
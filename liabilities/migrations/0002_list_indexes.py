@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('liabilities', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='liability',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', '-created_at'], name='liability_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='liability',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', 'liability_type', '-created_at'], name='liability_user_type_idx'),
+        ),
+    ]
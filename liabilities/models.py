@@ -26,6 +26,10 @@ class Liability(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='liability_user_idx', condition=models.Q(is_active=True)),
+            models.Index(fields=['user', 'liability_type', '-created_at'], name='liability_user_type_idx', condition=models.Q(is_active=True)),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.name}"
@@ -0,0 +1,53 @@
+"""
+Report renderers for the liabilities app
+"""
+from core.exports import build_pdf_report, build_xlsx_report, export_rows, format_date, to_date
+
+from .models import Liability
+
+
+def render_liabilities_pdf(user, stream):
+    """Render the liability report for a user as PDF"""
+    liabilities = Liability.objects.filter(user=user, is_active=True)
+    type_labels = dict(Liability.LIABILITY_TYPES)
+
+    rows = (
+        [name, type_labels.get(liability_type, liability_type), f"${amount:.2f}", source or '',
+         format_date(due_date), format_date(created_at)]
+        for name, liability_type, amount, source, due_date, created_at in export_rows(
+            liabilities, ['name', 'liability_type', 'amount', 'source', 'due_date', 'created_at']
+        )
+    )
+
+    build_pdf_report(
+        stream,
+        "BeneSafe - Liability Report",
+        user,
+        ['Liability Name', 'Type', 'Amount', 'Source', 'Due Date', 'Created Date'],
+        rows,
+        "No liabilities found.",
+    )
+
+
+def render_liabilities_xlsx(user, stream):
+    """Render the liability workbook for a user"""
+    liabilities = Liability.objects.filter(user=user, is_active=True)
+    type_labels = dict(Liability.LIABILITY_TYPES)
+
+    rows = (
+        [name, type_labels.get(liability_type, liability_type), description, amount, source,
+         reference_number, contact_person, contact_phone, due_date, to_date(created_at)]
+        for (name, liability_type, description, amount, source, reference_number,
+             contact_person, contact_phone, due_date, created_at) in export_rows(
+            liabilities,
+            ['name', 'liability_type', 'description', 'amount', 'source', 'reference_number',
+             'contact_person', 'contact_phone', 'due_date', 'created_at']
+        )
+    )
+
+    build_xlsx_report(stream, [(
+        'Liabilities',
+        ['Name', 'Type', 'Description', 'Amount', 'Source', 'Reference Number',
+         'Contact Person', 'Contact Phone', 'Due Date', 'Created Date'],
+        rows,
+    )])
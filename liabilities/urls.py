@@ -11,4 +11,5 @@ urlpatterns = [
     path('<int:pk>/delete/', views.liability_delete, name='liability_delete'),
     path('export/pdf/', views.export_liabilities_pdf, name='export_liabilities_pdf'),
     path('export/csv/', views.export_liabilities_csv, name='export_liabilities_csv'),
+    path('export/xlsx/', views.export_liabilities_xlsx, name='export_liabilities_xlsx'),
 ]
@@ -0,0 +1,27 @@
+"""
+Report renderers for the professionals app
+"""
+from core.exports import build_xlsx_report, export_rows, to_date
+
+from .models import Professional
+
+
+def render_professionals_xlsx(user, stream):
+    """Render the professional contacts workbook for a user"""
+    professionals = Professional.objects.filter(user=user, is_active=True)
+    profession_labels = dict(Professional.PROFESSION_TYPES)
+
+    rows = (
+        [name, profession_labels.get(profession, profession), phone, email, company, address,
+         notes, to_date(created_at)]
+        for name, profession, phone, email, company, address, notes, created_at in export_rows(
+            professionals,
+            ['name', 'profession', 'phone', 'email', 'company', 'address', 'notes', 'created_at']
+        )
+    )
+
+    build_xlsx_report(stream, [(
+        'Professionals',
+        ['Name', 'Profession', 'Phone', 'Email', 'Company', 'Address', 'Notes', 'Created Date'],
+        rows,
+    )])
@@ -9,4 +9,5 @@ urlpatterns = [
     path('<int:pk>/', views.professional_detail, name='professional_detail'),
     path('<int:pk>/edit/', views.professional_update, name='professional_update'),
     path('<int:pk>/delete/', views.professional_delete, name='professional_delete'),
+    path('export/xlsx/', views.export_professionals_xlsx, name='export_professionals_xlsx'),
 ]
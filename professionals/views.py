@@ -2,6 +2,8 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 
+from core.jobs import queue_export
+
 from .models import Professional
 
 @login_required
@@ -41,3 +43,8 @@ def professional_delete(request, pk):
     professional.save()
     messages.success(request, 'Professional deleted successfully!')
     return redirect('professionals:professional_list')
+
+@login_required
+def export_professionals_xlsx(request):
+    """Export all professionals as an Excel workbook"""
+    return queue_export(request, 'professionals_xlsx')
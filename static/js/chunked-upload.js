@@ -0,0 +1,201 @@
+// BeneSafe chunked, resumable uploads
+//
+// Forms marked with data-chunked-upload send their file in chunks to the
+// documents upload endpoints. Progress is remembered per file, so after a
+// dropped connection or a page reload the same file resumes from the last
+// acknowledged offset.
+
+(function () {
+    var MAX_RETRIES = 8;
+
+    // Files up to this size are hashed in the browser so content the user
+    // has already stored is attached without being sent again
+    var MAX_HASH_SIZE = 32 * 1024 * 1024;
+
+    function csrfToken(form) {
+        var input = form.querySelector('[name=csrfmiddlewaretoken]');
+        return input ? input.value : '';
+    }
+
+    function storageKey(form, file) {
+        var asset = form.querySelector('[name=asset]');
+        return 'benesafe-upload:' + [asset ? asset.value : '', file.name, file.size, file.lastModified].join(':');
+    }
+
+    function sleep(ms) {
+        return new Promise(function (resolve) { setTimeout(resolve, ms); });
+    }
+
+    function digest(file) {
+        if (file.size > MAX_HASH_SIZE || !window.crypto || !window.crypto.subtle) {
+            return Promise.resolve('');
+        }
+        return file.arrayBuffer().then(function (buffer) {
+            return crypto.subtle.digest('SHA-256', buffer);
+        }).then(function (hash) {
+            return Array.from(new Uint8Array(hash)).map(function (b) {
+                return b.toString(16).padStart(2, '0');
+            }).join('');
+        }).catch(function () { return ''; });
+    }
+
+    function request(url, options) {
+        return fetch(url, Object.assign({ credentials: 'same-origin' }, options)).then(function (response) {
+            return response.json().catch(function () { return {}; }).then(function (data) {
+                return { status: response.status, ok: response.ok, data: data };
+            });
+        });
+    }
+
+    function startSession(form, file) {
+        var saved = localStorage.getItem(storageKey(form, file));
+        var token = csrfToken(form);
+
+        var resume = saved
+            ? request(JSON.parse(saved).upload_url, { headers: { 'X-CSRFToken': token } })
+            : Promise.resolve({ ok: false });
+
+        return resume.then(function (result) {
+            if (result.ok) {
+                return result.data;
+            }
+
+            return digest(file).then(function (sha256) {
+                var body = new FormData();
+                body.append('filename', file.name);
+                body.append('size', file.size);
+                body.append('sha256', sha256);
+                ['title', 'description', 'asset'].forEach(function (name) {
+                    var field = form.querySelector('[name=' + name + ']');
+                    if (field && field.value) {
+                        body.append(name, field.value);
+                    }
+                });
+
+                return request(form.dataset.initUrl, {
+                    method: 'POST',
+                    headers: { 'X-CSRFToken': token },
+                    body: body
+                });
+            }).then(function (created) {
+                if (!created.ok) {
+                    throw new Error(created.data.error || 'Could not start the upload.');
+                }
+                if (!created.data.complete) {
+                    localStorage.setItem(storageKey(form, file), JSON.stringify(created.data));
+                }
+                return created.data;
+            });
+        });
+    }
+
+    function sendChunks(form, file, session, onProgress) {
+        var token = csrfToken(form);
+        var retries = 0;
+
+        function next(offset) {
+            onProgress(offset, file.size);
+            if (offset >= file.size) {
+                return Promise.resolve(session);
+            }
+
+            var chunk = file.slice(offset, Math.min(offset + session.chunk_size, file.size));
+            return request(session.upload_url, {
+                method: 'PUT',
+                headers: {
+                    'X-CSRFToken': token,
+                    'Upload-Offset': String(offset),
+                    'Content-Type': 'application/octet-stream'
+                },
+                body: chunk
+            }).then(function (result) {
+                if (result.ok || result.status === 409) {
+                    // 409: the server holds a different offset; continue from it
+                    retries = 0;
+                    return next(result.data.offset);
+                }
+                throw new Error(result.data.error || 'Upload failed.');
+            }, function () {
+                // Network error: back off and ask the server where to resume
+                if (++retries > MAX_RETRIES) {
+                    throw new Error('Connection lost. Choose the same file again to resume.');
+                }
+                return sleep(Math.min(1000 * Math.pow(2, retries), 30000)).then(function () {
+                    return request(session.upload_url, { headers: { 'X-CSRFToken': token } });
+                }).then(function (status) {
+                    return next(status.ok ? status.data.offset : offset);
+                }, function () {
+                    return next(offset);
+                });
+            });
+        }
+
+        return next(session.offset);
+    }
+
+    function finalize(form, file, session) {
+        return request(session.finalize_url, {
+            method: 'POST',
+            headers: { 'X-CSRFToken': csrfToken(form) }
+        }).then(function (result) {
+            if (!result.ok) {
+                throw new Error(result.data.error || 'Could not complete the upload.');
+            }
+            localStorage.removeItem(storageKey(form, file));
+            return result.data;
+        });
+    }
+
+    function setupChunkedUpload(form) {
+        var input = form.querySelector('input[type=file]');
+        var progress = form.querySelector('[data-upload-progress]');
+        var bar = progress ? progress.querySelector('.progress-bar') : null;
+        var error = form.querySelector('[data-upload-error]');
+        var submit = form.querySelector('[type=submit]');
+
+        function showProgress(sent, total) {
+            if (!bar) {
+                return;
+            }
+            var percent = total ? Math.floor(sent * 100 / total) : 0;
+            progress.classList.remove('d-none');
+            bar.style.width = percent + '%';
+            bar.textContent = percent + '%';
+        }
+
+        form.addEventListener('submit', function (event) {
+            var file = input && input.files[0];
+            if (!file || !window.fetch) {
+                return;  // Plain form POST
+            }
+            event.preventDefault();
+
+            submit.disabled = true;
+            if (error) {
+                error.classList.add('d-none');
+            }
+
+            startSession(form, file)
+                .then(function (session) {
+                    if (session.complete) {
+                        return session;  // Content already stored; nothing to send
+                    }
+                    return sendChunks(form, file, session, showProgress).then(function () {
+                        return finalize(form, file, session);
+                    });
+                })
+                .then(function (result) { window.location = result.redirect; })
+                .catch(function (err) {
+                    submit.disabled = false;
+                    if (error) {
+                        error.textContent = err.message;
+                        error.classList.remove('d-none');
+                    }
+                });
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('form[data-chunked-upload]').forEach(setupChunkedUpload);
+    });
+})();
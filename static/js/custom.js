@@ -33,6 +33,9 @@ document.addEventListener('DOMContentLoaded', function () {
     // Form validation enhancements
     setupFormValidation();
 
+    // Bulk decision forms send their selection as one field
+    setupBulkSelect();
+
     // Dashboard chart initialization
     initializeCharts();
 });
@@ -131,6 +134,37 @@ function setupFormValidation() {
     });
 }
 
+// Bulk Selection
+// Forms marked data-bulk-select="<field>" post the checked <field> boxes as
+// one comma-separated ids field: thousands of repeated fields exceed the
+// server's form field limit.
+function setupBulkSelect() {
+    var forms = document.querySelectorAll('form[data-bulk-select]');
+
+    forms.forEach(function (form) {
+        form.addEventListener('submit', function () {
+            var field = form.dataset.bulkSelect;
+            var boxes = Array.from(form.elements).filter(function (element) {
+                return element.name === field && element.type === 'checkbox';
+            });
+            form.elements.ids.value = boxes.filter(function (box) {
+                return box.checked;
+            }).map(function (box) {
+                return box.value;
+            }).join(',');
+            // Left out of this submission only; named again for the next
+            boxes.forEach(function (box) {
+                box.removeAttribute('name');
+            });
+            setTimeout(function () {
+                boxes.forEach(function (box) {
+                    box.name = field;
+                });
+            }, 0);
+        });
+    });
+}
+
 // Chart Initialization
 function initializeCharts() {
     // Asset distribution chart
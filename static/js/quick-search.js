@@ -0,0 +1,86 @@
+// BeneSafe header quick search
+//
+// As the user types in a form marked with data-quick-search, the best few
+// matches of each record type are fetched from the URL it names and shown
+// under the box. Enter still submits to the full search page.
+
+(function () {
+    var DELAY = 150;
+    var MIN_LENGTH = 2;
+
+    function escapeText(text) {
+        var div = document.createElement('div');
+        div.textContent = text;
+        return div.innerHTML;
+    }
+
+    // Titles and snippets arrive escaped, with matches in <mark>
+    function render(results, data) {
+        if (!data.groups.length) {
+            results.innerHTML = '<p class="px-4 py-3 text-sm text-slate-500">Nothing matches "' + escapeText(data.query) + '"</p>';
+            return;
+        }
+        results.innerHTML = data.groups.map(function (group) {
+            return '<div class="px-4 pt-3 pb-1 text-[10px] font-bold text-slate-400 uppercase tracking-widest">' +
+                escapeText(group.label) + '</div>' +
+                group.hits.map(function (hit) {
+                    return '<a href="' + escapeText(hit.url) + '" class="block px-4 py-2 hover:bg-slate-50 dark:hover:bg-slate-700/50">' +
+                        '<p class="text-sm font-bold text-slate-900 dark:text-white">' + hit.title + '</p>' +
+                        (hit.snippet ? '<p class="text-xs text-slate-500 dark:text-slate-400 truncate">' + hit.snippet + '</p>' : '') +
+                        '</a>';
+                }).join('');
+        }).join('');
+    }
+
+    function attach(form) {
+        var input = form.querySelector('[name=q]');
+        var results = form.querySelector('[data-quick-search-results]');
+        var timer = null;
+        var controller = null;
+
+        function hide() {
+            results.classList.add('hidden');
+        }
+
+        function lookup() {
+            var query = input.value.trim();
+            if (query.length < MIN_LENGTH) {
+                hide();
+                return;
+            }
+            // Only the latest keystroke's answer is shown
+            if (controller) {
+                controller.abort();
+            }
+            controller = new AbortController();
+            fetch(form.dataset.quickSearch + '?q=' + encodeURIComponent(query), {
+                credentials: 'same-origin',
+                signal: controller.signal
+            }).then(function (response) {
+                return response.json();
+            }).then(function (data) {
+                render(results, data);
+                results.classList.remove('hidden');
+            }).catch(function () {});
+        }
+
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(lookup, DELAY);
+        });
+        input.addEventListener('keydown', function (event) {
+            if (event.key === 'Escape') {
+                hide();
+            }
+        });
+        document.addEventListener('click', function (event) {
+            if (!form.contains(event.target)) {
+                hide();
+            }
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('form[data-quick-search]').forEach(attach);
+    });
+})();
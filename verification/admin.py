@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Verification
+from .models import Verification, VerificationDecision
 
 @admin.register(Verification)
 class VerificationAdmin(admin.ModelAdmin):
@@ -7,3 +7,10 @@ class VerificationAdmin(admin.ModelAdmin):
     list_filter = ('status', 'created_at')
     search_fields = ('user__username', 'asset__name', 'verifier__username')
     readonly_fields = ('created_at', 'updated_at')
+
+@admin.register(VerificationDecision)
+class VerificationDecisionAdmin(admin.ModelAdmin):
+    list_display = ('verification', 'status', 'verifier', 'decided_at')
+    list_filter = ('status', 'decided_at')
+    search_fields = ('verifier__username',)
+    list_select_related = ('verifier',)
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '__first__'),
+        ('verification', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='verification',
+            name='claim_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='verification',
+            name='claim_token',
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='verification',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='claimed_verifications', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='verification',
+            name='route',
+            field=models.CharField(blank=True, choices=[('corporate', 'Corporate'), ('legal', 'Legal')], max_length=20),
+        ),
+        # Route existing items by asset type, as verification.queue.ASSET_ROUTES
+        migrations.RunSQL(
+            """
+            UPDATE verification_verification SET route = CASE
+                WHEN asset_id IN (
+                    SELECT id FROM assets_asset WHERE asset_type IN
+                    ('bank_account', 'insurance', 'village_banking', 'treasury_bond', 'project')
+                ) THEN 'corporate'
+                ELSE 'legal'
+            END
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='verification',
+            index=models.Index(fields=['status', 'route', 'created_at'], name='verification_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '__first__'),
+        ('verification', '0003_verification_decisions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='verification',
+            index=models.Index(fields=['status', 'created_at'], name='verification_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='verification',
+            index=models.Index(fields=['created_at', 'id'], name='verification_created_idx'),
+        ),
+    ]
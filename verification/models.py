@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 class Verification(models.Model):
     """Document verification model"""
@@ -9,11 +10,21 @@ class Verification(models.Model):
         ('rejected', 'Rejected'),
     ]
 
+    ROUTE_CHOICES = [
+        ('corporate', 'Corporate'),
+        ('legal', 'Legal'),
+    ]
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     asset = models.ForeignKey('assets.Asset', on_delete=models.CASCADE)
     document = models.ForeignKey('assets.AssetDocument', on_delete=models.CASCADE)
     verifier = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='verifications')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    # Queue routing and claim lease; see verification.queue
+    route = models.CharField(max_length=20, choices=ROUTE_CHOICES, blank=True)
+    claimed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='claimed_verifications')
+    claim_token = models.UUIDField(null=True, blank=True)
+    claim_expires_at = models.DateTimeField(null=True, blank=True)
     comments = models.TextField(blank=True)
     verified_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -21,6 +32,41 @@ class Verification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'route', 'created_at'], name='verification_queue_idx'),
+            models.Index(fields=['status', 'created_at'], name='verification_status_idx'),
+            models.Index(fields=['created_at', 'id'], name='verification_created_idx'),
+            models.Index(fields=['user', '-created_at'], name='verification_user_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.asset.name} - {self.status}"
+
+    def save(self, *args, **kwargs):
+        if not self.route and self.asset_id:
+            from .queue import route_for
+            self.route = route_for(self.asset.asset_type)
+        super().save(*args, **kwargs)
+
+    @property
+    def has_live_claim(self):
+        """Whether a verifier currently holds this item"""
+        return (
+            self.claimed_by_id is not None
+            and self.claim_expires_at is not None
+            and self.claim_expires_at > timezone.now()
+        )
+
+class VerificationDecision(models.Model):
+    """Audit record of one approve/reject decision on a verification"""
+    verification = models.ForeignKey(Verification, on_delete=models.CASCADE, related_name='decisions')
+    verifier = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='verification_decisions')
+    status = models.CharField(max_length=20, choices=Verification.STATUS_CHOICES)
+    comments = models.TextField(blank=True)
+    decided_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-decided_at']
+
+    def __str__(self):
+        return f"{self.verification_id} - {self.status}"
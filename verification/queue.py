@@ -0,0 +1,213 @@
+"""
+Verifier work queue.
+
+Verifiers do not pick items from the full pending list. They claim the next
+batch in their route, and each claimed item is leased to one verifier until
+claim_expires_at. Items are routed by asset type: corporate verifiers take
+financial holdings, legal verifiers take titles, registrations and rights.
+
+A claim is taken atomically. On PostgreSQL the batch is locked with
+SELECT ... FOR UPDATE SKIP LOCKED, so concurrent verifiers claim disjoint
+batches without waiting on each other. SQLite serialises writers, so a
+single UPDATE whose WHERE clause re-checks that each row is still free gives
+the same guarantee. An expired lease makes its item claimable again, and a
+decision is only accepted from the verifier holding a live lease.
+"""
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.decisions import log_decisions
+from accounts.permissions import CAN_MANAGE_VERIFICATION, get_profile, has_perm
+from core import audit
+
+from .models import Verification, VerificationDecision
+
+CORPORATE = 'corporate'
+LEGAL = 'legal'
+
+# Asset type -> route
+ASSET_ROUTES = {
+    'bank_account': CORPORATE,
+    'insurance': CORPORATE,
+    'village_banking': CORPORATE,
+    'treasury_bond': CORPORATE,
+    'project': CORPORATE,
+    'house_land': LEGAL,
+    'motor_vehicle': LEGAL,
+    'ip_rights': LEGAL,
+    'general_asset': LEGAL,
+}
+
+# Verifier sub-role -> routes it works
+SUB_ROLE_ROUTES = {
+    'corporate_verifier': [CORPORATE],
+    'legal_verifier': [LEGAL],
+}
+
+ALL_ROUTES = [CORPORATE, LEGAL]
+
+# Queue sizes are counted up to this many items and shown as "N+" beyond it
+WAITING_CAP = 1000
+
+
+def lease_duration():
+    return timedelta(seconds=getattr(settings, 'VERIFICATION_CLAIM_LEASE', 15 * 60))
+
+
+def batch_size():
+    return getattr(settings, 'VERIFICATION_CLAIM_BATCH', 10)
+
+
+def route_for(asset_type):
+    return ASSET_ROUTES.get(asset_type, LEGAL)
+
+
+def routes_for(user):
+    """Routes a user works; managers and verifiers without a sub-role get all"""
+    if has_perm(user, CAN_MANAGE_VERIFICATION):
+        return ALL_ROUTES
+    profile = get_profile(user)
+    sub_role = profile.role.sub_role if profile and profile.role else ''
+    return SUB_ROLE_ROUTES.get(sub_role, ALL_ROUTES)
+
+
+def free(now=None):
+    """Condition for a pending item nobody holds a live lease on"""
+    now = now or timezone.now()
+    return Q(status='pending') & (Q(claimed_by__isnull=True) | Q(claim_expires_at__lte=now))
+
+
+def held_by(user, now=None):
+    """Condition for items the user holds a live lease on"""
+    now = now or timezone.now()
+    return Q(status='pending', claimed_by=user, claim_expires_at__gt=now)
+
+
+def available(user):
+    """Unclaimed items in the user's routes, oldest first"""
+    return (
+        Verification.objects.filter(free(), route__in=routes_for(user))
+        .exclude(user=user)
+        .order_by('created_at', 'id')
+    )
+
+
+def waiting(user, cap=WAITING_CAP):
+    """Number of items available to the user, counted no further than cap"""
+    return available(user)[:cap].count()
+
+
+def claimed(user):
+    """Items the user currently holds, oldest first"""
+    return Verification.objects.filter(held_by(user)).order_by('created_at', 'id')
+
+
+def claim_batch(user, size=None):
+    """
+    Claim up to size items, topping up what the user already holds.
+    Returns the number newly claimed.
+    """
+    size = size or batch_size()
+    now = timezone.now()
+    wanted = size - claimed(user).count()
+    if wanted <= 0:
+        return 0
+
+    lease = {
+        'claimed_by': user,
+        'claim_token': uuid.uuid4(),
+        'claim_expires_at': now + lease_duration(),
+    }
+    candidates = available(user).filter(free(now))
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(candidates.select_for_update(skip_locked=True).values_list('pk', flat=True)[:wanted])
+            return Verification.objects.filter(pk__in=ids).update(**lease)
+
+    # One statement: rows claimed by someone else since the subquery was
+    # planned fail the repeated free() check and are skipped
+    ids = candidates.values('pk')[:wanted]
+    return Verification.objects.filter(free(now), pk__in=ids).update(**lease)
+
+
+def renew(user, verification):
+    """Extend the user's lease on an item; False if they do not hold it"""
+    return bool(
+        Verification.objects.filter(held_by(user), pk=verification.pk)
+        .update(claim_expires_at=timezone.now() + lease_duration())
+    )
+
+
+def release(user, verification=None):
+    """Return the user's claim on one item, or on everything they hold"""
+    claims = Verification.objects.filter(status='pending', claimed_by=user)
+    if verification is not None:
+        claims = claims.filter(pk=verification.pk)
+    return claims.update(claimed_by=None, claim_token=None, claim_expires_at=None)
+
+
+def _record(user, eligible, ids, status, comments=''):
+    """
+    Decide every eligible item among ids and log an audit row for each. The
+    eligible items are locked and read first, so the UPDATE and the audit
+    insert cover exactly the same rows.
+    """
+    now = timezone.now()
+    fields = {
+        'status': status,
+        'verifier': user,
+        'verified_at': now,
+        'claimed_by': None,
+        'claim_token': None,
+        'claim_expires_at': None,
+        'updated_at': now,
+    }
+    if comments:
+        fields['comments'] = comments
+
+    with transaction.atomic():
+        changed = list(
+            Verification.objects.select_for_update().filter(eligible, pk__in=ids).values_list('pk', flat=True)
+        )
+        if changed:
+            Verification.objects.filter(pk__in=changed).update(**fields)
+            log_decisions(VerificationDecision, Verification, changed, {
+                'verification': 'id',
+                'verifier': 'verifier',
+                'status': 'status',
+                'decided_at': 'verified_at',
+            }, values={'comments': comments})
+    return len(changed)
+
+
+def decide(user, verification, status, comments=''):
+    """
+    Record a decision on an item the user holds a live lease on. Returns
+    False if the lease was lost, e.g. it expired and another verifier took
+    the item.
+    """
+    decided = bool(_record(user, held_by(user), [verification.pk], status, comments))
+    if decided:
+        audit.record(f'verification.{status}', verification, actor=user)
+    return decided
+
+
+def decide_many(user, ids, status, comments=''):
+    """
+    Record one decision on many items; returns the number decided. Verifiers
+    decide items they hold; managers may also decide unclaimed items, but
+    never one another verifier holds a live lease on.
+    """
+    eligible = held_by(user)
+    if has_perm(user, CAN_MANAGE_VERIFICATION):
+        eligible |= free() & ~Q(user=user)
+    decided = _record(user, eligible, ids, status, comments)
+    if decided:
+        audit.record(f'verification.{status}', Verification, actor=user, count=decided, selected=[int(pk) for pk in ids])
+    return decided
@@ -6,7 +6,10 @@ app_name = 'verification'
 urlpatterns = [
     path('', views.verification_dashboard, name='verification_dashboard'),
     path('pending/', views.pending_verifications, name='pending_verifications'),
+    path('claim/', views.claim_verifications, name='claim_verifications'),
+    path('decide/', views.bulk_decision, name='bulk_decision'),
     path('<int:pk>/', views.verification_detail, name='verification_detail'),
     path('<int:pk>/approve/', views.approve_verification, name='approve_verification'),
     path('<int:pk>/reject/', views.reject_verification, name='reject_verification'),
+    path('<int:pk>/release/', views.release_verification, name='release_verification'),
 ]
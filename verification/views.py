@@ -1,63 +1,142 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.utils.http import url_has_allowed_host_and_scheme
+
+from accounts.decisions import DECISIONS, MAX_SELECTED, selected_ids
+from accounts.permissions import CAN_MANAGE_VERIFICATION, VERIFICATION_ACCESS, VERIFICATION_DECISION, has_perm
+
+from . import queue
+from core.pagination import keyset_page
 
 from .models import Verification
 
+STATUSES = dict(Verification.STATUS_CHOICES)
+
 @login_required
 def verification_dashboard(request):
     """Verification dashboard"""
-    if request.user.userprofile.role not in ['verifier', 'admin']:
+    if not has_perm(request.user, VERIFICATION_ACCESS):
         messages.error(request, 'Access denied')
         return redirect('core:dashboard')
 
-    verifications = Verification.objects.all()
-    return render(request, 'verification/dashboard.html', {'verifications': verifications})
+    status = request.GET.get('status', '')
+    verifications = Verification.objects.select_related('user', 'asset', 'document', 'verifier')
+    if status in STATUSES:
+        verifications = verifications.filter(status=status)
+    else:
+        status = ''
+
+    page = keyset_page(verifications, request.GET)
+    return render(request, 'verification/dashboard.html', {
+        'verifications': page,
+        'page': page,
+        'status': status,
+        'status_choices': Verification.STATUS_CHOICES,
+        # Managers can decide unclaimed items straight from the full list
+        'can_bulk_decide': has_perm(request.user, CAN_MANAGE_VERIFICATION) and has_perm(request.user, VERIFICATION_DECISION),
+    })
 
 @login_required
 def pending_verifications(request):
-    """List pending verifications"""
-    if request.user.userprofile.role not in ['verifier', 'admin']:
+    """The verifier's claimed work and the size of their queue"""
+    if not has_perm(request.user, VERIFICATION_ACCESS):
+        messages.error(request, 'Access denied')
+        return redirect('core:dashboard')
+
+    verifications = queue.claimed(request.user).select_related('user', 'asset', 'document')
+    context = {
+        'verifications': verifications,
+        'available_count': queue.waiting(request.user),
+        'waiting_cap': queue.WAITING_CAP,
+        'routes': queue.routes_for(request.user),
+        'batch_size': queue.batch_size(),
+    }
+    return render(request, 'verification/pending.html', context)
+
+@login_required
+def claim_verifications(request):
+    """Claim the next batch of items from the verifier's queue"""
+    if not has_perm(request.user, VERIFICATION_DECISION):
         messages.error(request, 'Access denied')
         return redirect('core:dashboard')
 
-    verifications = Verification.objects.filter(status='pending')
-    return render(request, 'verification/pending.html', {'verifications': verifications})
+    if request.method == 'POST':
+        claimed = queue.claim_batch(request.user)
+        if claimed:
+            messages.success(request, f'Claimed {claimed} item(s) for review.')
+        else:
+            messages.info(request, 'No further items to claim.')
+    return redirect('verification:pending_verifications')
+
+@login_required
+def release_verification(request, pk):
+    """Return a claimed item to the queue"""
+    verification = get_object_or_404(Verification, pk=pk)
+    if request.method == 'POST' and queue.release(request.user, verification):
+        messages.success(request, 'Item returned to the queue.')
+    return redirect('verification:pending_verifications')
 
 @login_required
 def verification_detail(request, pk):
     """View verification details"""
-    verification = get_object_or_404(Verification, pk=pk)
-    if request.user.userprofile.role not in ['verifier', 'admin'] and request.user != verification.user:
+    verification = get_object_or_404(Verification.objects.select_related('user', 'asset', 'document'), pk=pk)
+    if not has_perm(request.user, VERIFICATION_ACCESS) and request.user != verification.user:
         messages.error(request, 'Access denied')
         return redirect('core:dashboard')
 
-    return render(request, 'verification/detail.html', {'verification': verification})
+    # Reviewing an item keeps the lease alive
+    holds_claim = queue.renew(request.user, verification)
+    return render(request, 'verification/detail.html', {
+        'verification': verification,
+        'holds_claim': holds_claim,
+    })
 
-@login_required
-def approve_verification(request, pk):
-    """Approve verification"""
+def record_decision(request, pk, status):
     verification = get_object_or_404(Verification, pk=pk)
-    if request.user.userprofile.role not in ['verifier', 'admin']:
+    if not has_perm(request.user, VERIFICATION_DECISION):
         messages.error(request, 'Access denied')
         return redirect('core:dashboard')
 
-    verification.status = 'approved'
-    verification.verifier = request.user
-    verification.save()
-    messages.success(request, 'Verification approved successfully!')
+    if request.method == 'POST':
+        comments = request.POST.get('comments', '').strip()
+        if queue.decide(request.user, verification, status, comments):
+            messages.success(request, f'Verification {status} successfully!')
+        else:
+            messages.error(request, 'This item is not claimed by you. Claim it from your queue before deciding.')
     return redirect('verification:verification_detail', pk=pk)
 
 @login_required
-def reject_verification(request, pk):
-    """Reject verification"""
-    verification = get_object_or_404(Verification, pk=pk)
-    if request.user.userprofile.role not in ['verifier', 'admin']:
+def bulk_decision(request):
+    """Approve or reject the selected items in one step"""
+    if not has_perm(request.user, VERIFICATION_DECISION):
         messages.error(request, 'Access denied')
         return redirect('core:dashboard')
 
-    verification.status = 'rejected'
-    verification.verifier = request.user
-    verification.save()
-    messages.success(request, 'Verification rejected')
-    return redirect('verification:verification_detail', pk=pk)
+    if request.method == 'POST':
+        status = DECISIONS.get(request.POST.get('action'))
+        ids = selected_ids(request.POST, 'verifications')
+        if len(ids) > MAX_SELECTED:
+            messages.error(request, f'Select at most {MAX_SELECTED} items at a time.')
+        elif status and ids:
+            comments = request.POST.get('comments', '').strip()
+            decided = queue.decide_many(request.user, ids, status, comments)
+            messages.success(request, f'{decided} verification(s) {status}.')
+            if decided < len(ids):
+                messages.warning(request, f'{len(ids) - decided} item(s) were skipped: already decided or held by another verifier.')
+        else:
+            messages.error(request, 'Select at least one item and an action.')
+    next_url = request.POST.get('next')
+    if next_url and url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        return redirect(next_url)
+    return redirect('verification:pending_verifications')
+
+@login_required
+def approve_verification(request, pk):
+    """Approve verification"""
+    return record_decision(request, pk, 'approved')
+
+@login_required
+def reject_verification(request, pk):
+    """Reject verification"""
+    return record_decision(request, pk, 'rejected')